@@ -80,8 +80,7 @@ if os.getenv('FLASK_ENV') == 'production': # Original logic
 else:
     app.config['SESSION_COOKIE_SECURE'] = False # User suggestion, good for dev
     logger.info("Session cookie configured for development (Secure=False).")
-app.config['SESSION_TYPE'] = 'filesystem' # Original, fine for now
-# User suggested Redis for production, which is a good future enhancement.
+# Server-side sessions live in backend/session_store.py (SESSION_BACKEND=sqlite|redis)
 
 
 # --- Extensions Initialization (from backend.extensions) ---
@@ -116,10 +115,10 @@ try:
 
     @login_manager.user_loader
     def load_user(user_id):
-        from backend.models import User # Import here
+        from backend.identity_cache import identity_cache # Import here
         try:
-            user = User.query.get(int(user_id))
-            return user
+            # Slim cached identity; the users table is only read on a miss or after the short TTL
+            return identity_cache.load(int(user_id))
         except Exception as e:
             logger.error(f"Error in user_loader for user_id {user_id}: {e}", exc_info=True)
             return None
@@ -139,10 +138,10 @@ except Exception as e:
 csrf = CSRFProtect(app)
 logger.info("CSRF protection enabled.")
 
-# Flask Session
-from flask_session import Session # Ensure import is here
-Session(app)
-logger.info("Flask-Session initialized with type 'filesystem'.")
+# Server-side sessions (written only when they change)
+from backend.session_store import init_session, SESSION_BACKEND
+init_session(app)
+logger.info(f"Server-side sessions initialized with backend '{SESSION_BACKEND}'.")
 
 
 # --- Blueprints Registration ---
@@ -163,6 +162,14 @@ except ImportError as e:
 except Exception as e:
     logger.error(f"An error occurred during blueprint registration: {e}", exc_info=True)
 
+# Buffered FeatureUsageLog writer (flushed on exit)
+from backend.usage_log import usage_log
+usage_log.init_app(app)
+
+# --- CLI Commands ---
+from backend.commands import register_commands
+register_commands(app)
+
 
 # --- Models Import ---
 # Models are now in backend.models and imported by blueprints or when needed (e.g. user_loader)
@@ -0,0 +1,70 @@
+"""Compare the per-token similarity loop in score_answer with the vectorized NumPy path.
+
+Run from the project root:
+    python -m backend.benchmarks.answer_similarity
+
+Uses the configured spaCy model when it has word vectors; otherwise a blank English
+pipeline with random 300-d vectors, which is enough to time the similarity step.
+"""
+import time
+import random
+import statistics
+
+import numpy as np
+
+from backend.nlp_provider import get_nlp
+from backend.mock_interview_app.utils.interview_analyzer import _max_token_similarity, SIMILARITY_THRESHOLD
+
+WORDS = ("i led the migration of our data platform to kafka and reduced processing latency by forty "
+         "percent while mentoring two junior engineers on streaming design testing and deployment "
+         "practices across several product teams in a fast growing company").split()
+ANSWER_WORDS = 250
+SKILL = "distributed systems"
+
+
+def _pipeline():
+    nlp = get_nlp()
+    if getattr(nlp, 'vocab', None) is not None and nlp.vocab.vectors.shape[0]:
+        return nlp, 'configured model'
+    import spacy
+    nlp = spacy.blank('en')
+    rng = np.random.default_rng(0)
+    for word in set(WORDS) | set(SKILL.split()):
+        nlp.vocab.set_vector(word, rng.standard_normal(300).astype(np.float32))
+    return nlp, 'blank en + random 300-d vectors'
+
+
+def loop_path(answer_doc, skill_doc):
+    # The original relevance check (no early exit when nothing crosses the threshold)
+    return any(token.similarity(skill_doc) > SIMILARITY_THRESHOLD for token in answer_doc if token.has_vector and skill_doc.has_vector)
+
+
+def vectorized_path(answer_doc, skill_doc):
+    return _max_token_similarity(answer_doc, skill_doc) > SIMILARITY_THRESHOLD
+
+
+def time_it(fn, args, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(repeat=200):
+    nlp, source = _pipeline()
+    random.seed(0)
+    answer_doc = nlp(" ".join(random.choice(WORDS) for _ in range(ANSWER_WORDS)))
+    skill_doc = nlp(SKILL)
+    assert loop_path(answer_doc, skill_doc) == vectorized_path(answer_doc, skill_doc)
+
+    loop = time_it(loop_path, (answer_doc, skill_doc), repeat)
+    vectorized = time_it(vectorized_path, (answer_doc, skill_doc), repeat)
+    print(f"pipeline: {source}, answer of {len(answer_doc)} tokens")
+    print(f"loop        median {loop * 1e6:,.1f} us")
+    print(f"vectorized  median {vectorized * 1e6:,.1f} us  ({loop / vectorized:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Compare the local language detector with the Mistral round trip on accuracy and latency.
+
+Run from the project root:
+    python -m backend.benchmarks.language_detection
+
+The Mistral path is only measured when MISTRAL_API_KEY is set (it makes one
+real API call per sample).
+"""
+import time
+import statistics
+
+from backend import llm_client
+from backend.resume_builder.utils import language_detector
+from backend.resume_builder.utils.translation import _detect_language_llm
+
+# Short resume-style snippets, labelled with their language
+SAMPLES = [
+    ('en', "Experienced software engineer with a passion for building scalable systems."),
+    ('en', "Managed a team of five developers and delivered the project on time."),
+    ('en', "Strong communication and leadership skills"),
+    ('en', "Bachelor of Science in Computer Science"),
+    ('es', "Ingeniero de software con experiencia en el desarrollo de sistemas escalables."),
+    ('es', "Gestioné un equipo de cinco desarrolladores y entregué el proyecto a tiempo."),
+    ('es', "Habilidades de comunicación y liderazgo"),
+    ('es', "Licenciatura en Ciencias de la Computación"),
+    ('fr', "Ingénieur logiciel expérimenté, passionné par la création de systèmes évolutifs."),
+    ('fr', "J'ai dirigé une équipe de cinq développeurs et livré le projet dans les délais."),
+    ('fr', "Compétences en communication et en leadership"),
+    ('fr', "Licence en informatique"),
+    ('de', "Erfahrener Softwareentwickler mit Leidenschaft für skalierbare Systeme."),
+    ('de', "Ich habe ein Team von fünf Entwicklern geleitet und das Projekt pünktlich abgeschlossen."),
+    ('de', "Ausgeprägte Kommunikations- und Führungsfähigkeiten"),
+    ('de', "Bachelor in Informatik an der Technischen Universität"),
+    ('pt', "Engenheiro de software experiente, apaixonado por construir sistemas escaláveis."),
+    ('pt', "Gerenciei uma equipe de cinco desenvolvedores e entreguei o projeto no prazo."),
+    ('pt', "Habilidades de comunicação e liderança"),
+    ('pt', "Bacharelado em Ciência da Computação"),
+    ('zh', "经验丰富的软件工程师，热衷于构建可扩展的系统。"),
+    ('zh', "管理五名开发人员的团队并按时交付项目。"),
+    ('ja', "スケーラブルなシステムの構築に情熱を持つ経験豊富なソフトウェアエンジニアです。"),
+    ('ja', "5人の開発者チームを管理し、プロジェクトを期限内に納品しました。"),
+    ('ru', "Опытный инженер-программист, увлеченный созданием масштабируемых систем."),
+    ('ru', "Руководил командой из пяти разработчиков и сдал проект вовремя."),
+    ('ar', "مهندس برمجيات ذو خبرة وشغف ببناء أنظمة قابلة للتطوير."),
+    ('ar', "أدرت فريقًا من خمسة مطورين وسلمت المشروع في الوقت المحدد."),
+    ('hi', "स्केलेबल सिस्टम बनाने के जुनून के साथ अनुभवी सॉफ्टवेयर इंजीनियर।"),
+    ('hi', "पांच डेवलपर्स की टीम का प्रबंधन किया और परियोजना समय पर पूरी की।"),
+]
+
+
+def run(name, detect_fn, repeat=1):
+    latencies = []
+    correct = 0
+    for expected, text in SAMPLES:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = detect_fn(text)
+        latencies.append((time.perf_counter() - start) / repeat)
+        correct += result == expected
+    print(f"{name:<8} accuracy {correct}/{len(SAMPLES)} ({correct / len(SAMPLES):.0%})  "
+          f"mean {statistics.mean(latencies) * 1e6:,.1f} us  max {max(latencies) * 1e6:,.1f} us")
+
+
+def main():
+    run('local', lambda text: language_detector.detect(text)[0], repeat=200)
+    if llm_client.MISTRAL_API_KEY:
+        run('mistral', _detect_language_llm)
+    else:
+        print("mistral  skipped (MISTRAL_API_KEY not set)")
+
+
+if __name__ == '__main__':
+    main()
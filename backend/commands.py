@@ -0,0 +1,51 @@
+from datetime import datetime
+import click
+from flask.cli import with_appcontext
+from .utils import reset_starter_credits, CREDIT_RESET_CHUNK_SIZE
+from .resume_revisions import compact_all_revisions
+from .job_queue import reap_stale_jobs, JOB_MAX_AGE
+
+
+@click.command('reset-credits')
+@click.option('--month', help='Month to reset for, as YYYY-MM. Defaults to the current UTC month.')
+@click.option('--chunk-size', default=CREDIT_RESET_CHUNK_SIZE, show_default=True, help='Users per transaction.')
+@with_appcontext
+def reset_credits_command(month, chunk_size):
+    """Reset all Starter-tier monthly credits. Safe to re-run; run it from cron on the 1st."""
+    try:
+        month_start = datetime.strptime(month, '%Y-%m') if month else None
+    except ValueError:
+        raise click.BadParameter('expected YYYY-MM', param_hint='--month')
+
+    def report(users_done, users_total, rows_reset):
+        click.echo(f"{users_done}/{users_total} users processed, {rows_reset} balances reset")
+
+    rows_reset = reset_starter_credits(month_start, chunk_size=chunk_size, progress=report)
+    click.echo(f"Done: {rows_reset} balances reset.")
+
+
+@click.command('compact-revisions')
+@with_appcontext
+def compact_revisions_command():
+    """Apply the revision retention policy and re-encode every resume's history. Run it from cron nightly."""
+    def report(resumes_done, resumes_total, totals):
+        if resumes_done % 100 == 0 or resumes_done == resumes_total:
+            click.echo(f"{resumes_done}/{resumes_total} resumes compacted, {totals['removed']} revisions removed")
+
+    totals = compact_all_revisions(progress=report)
+    click.echo(f"Done: {totals['resumes']} resumes, {totals['kept']} revisions kept, {totals['removed']} removed, "
+               f"{totals['bytes_before']} -> {totals['bytes_after']} payload bytes.")
+
+
+@click.command('reap-jobs')
+@click.option('--max-age', default=JOB_MAX_AGE, show_default=True, help='Seconds without an update before a job is presumed lost.')
+@with_appcontext
+def reap_jobs_command(max_age):
+    """Fail background jobs whose worker died and refund their credits. Run it from cron every few minutes."""
+    click.echo(f"Done: {reap_stale_jobs(max_age)} stale jobs failed.")
+
+
+def register_commands(app):
+    app.cli.add_command(reset_credits_command)
+    app.cli.add_command(compact_revisions_command)
+    app.cli.add_command(reap_jobs_command)
@@ -2,14 +2,17 @@ import os
 import logging
 import tempfile
 from werkzeug.utils import secure_filename
-from flask import render_template, redirect, url_for, flash, request, current_app
+from flask import render_template, redirect, url_for, flash, request, current_app, jsonify, abort
 from flask_login import login_required, current_user
-from backend.models import CoverLetter, Credit
+from backend.models import CoverLetter, BackgroundJob
 from backend.extensions import db
+from backend.job_queue import job_queue, new_job_id, reservation_key, reap_stale_jobs
+from backend import credit_service
+from backend.request_context import user_snapshot
 from . import cover_letter_bp
 from .forms import AICoverLetterForm, SimpleCoverLetterForm
-from .utils.prompt_engine import build_cover_letter_prompt
-from .utils.file_utils import extract_text_from_file
+from .utils.generation_job import JOB_TYPE, run_cover_letter_job
+from .utils.file_utils import save_upload
 from .utils.security import rate_limited, validate_input_length
 
 logger = logging.getLogger(__name__)
@@ -23,7 +26,7 @@ def get_upload_folder():
 @login_required
 def index():
     '''Displays a list of the user's cover letters.'''
-    cover_letters = CoverLetter.query.filter_by(user_id=current_user.id, is_archived=False).order_by(CoverLetter.updated_at.desc()).all()
+    cover_letters = CoverLetter.list_query(current_user.id).order_by(CoverLetter.updated_at.desc()).all()
     return render_template('cover_letter/index.html', cover_letters=cover_letters)
 
 @cover_letter_bp.route('/generate', methods=['GET', 'POST'])
@@ -36,7 +39,7 @@ def generate_ai_cover_letter():
     os.makedirs(upload_folder, exist_ok=True)
 
     generation_credit_type = 'legacy'
-    user_credit = Credit.query.filter_by(user_id=current_user.id, credit_type=generation_credit_type).first()
+    user_credit = user_snapshot().credit(generation_credit_type)
 
     if request.method == 'GET' and (not user_credit or user_credit.amount <= 0):
         # Flash message for GET if no credits, but still show the form
@@ -48,74 +51,68 @@ def generate_ai_cover_letter():
             return redirect(url_for('cover_letter.index')) # Or back to generate form with message
 
         if form.validate_on_submit():
-            user_credit_on_submit = Credit.query.filter_by(user_id=current_user.id, credit_type=generation_credit_type).first()
-            if not user_credit_on_submit or user_credit_on_submit.amount <= 0: # Final check
-                flash('Credit check failed upon submission. Insufficient credits.', 'warning')
-                return redirect(url_for('cover_letter.index'))
-
-            resume_text_from_file = ""
-            temp_file_path = None
+            # The credit is reserved when the job is queued and refunded if the job fails
+            upload_path = None
+            upload_digest = None
             if form.resume_file.data:
                 resume_file_storage = form.resume_file.data
                 filename = secure_filename(resume_file_storage.filename)
                 try:
+                    # Only the save happens in the request; the job extracts the text and removes the file
                     with tempfile.NamedTemporaryFile(delete=False, mode='wb', suffix="_" + filename, dir=upload_folder) as tmp_file:
-                        resume_file_storage.save(tmp_file)
-                        temp_file_path = tmp_file.name
-
-                    logger.info(f"Resume file saved temporarily to {temp_file_path}")
-                    resume_text_from_file = extract_text_from_file(temp_file_path)
-
-                    if not resume_text_from_file and filename:
-                        flash('Could not extract text from the uploaded resume. Check file or paste text.', 'warning')
+                        upload_digest = save_upload(resume_file_storage, tmp_file)
+                        upload_path = tmp_file.name
+                    logger.info(f"Resume file saved to {upload_path} (sha256 {upload_digest[:12]}) for background extraction")
                 except Exception as e:
-                    logger.error(f"Error processing resume file upload '{filename}': {e}", exc_info=True)
+                    logger.error(f"Error saving resume file upload '{filename}': {e}", exc_info=True)
                     flash('An error occurred while processing your resume file.', 'danger')
-                finally:
-                    if temp_file_path and os.path.exists(temp_file_path):
-                        try:
-                            os.remove(temp_file_path)
-                            logger.info(f"Temporary file {temp_file_path} removed.")
-                        except Exception as e_remove:
-                            logger.error(f"Error removing temp file {temp_file_path}: {e_remove}", exc_info=True)
-
-            final_resume_text = form.resume_text.data or resume_text_from_file
 
             form_data_dict = {
                 'your_name': form.your_name.data, 'your_email': form.your_email.data,
                 'job_title': form.job_title.data, 'company_name': form.company_name.data,
-                'job_description': form.job_description.data, 'resume_text': final_resume_text,
+                'job_description': form.job_description.data, 'resume_text': form.resume_text.data or "",
                 'refinement_type': form.refinement_type.data,
                 'existing_cover_text': form.existing_cover_letter_text.data,
                 'key_points': form.key_points.data, 'tone': form.tone.data,
             }
 
+            # Reject oversized pasted input right away; text from an upload is checked again by the job
             validation_error = validate_input_length(
                 form_data_dict['job_description'],
                 form_data_dict['resume_text'],
                 form_data_dict['existing_cover_text']
             )
             if validation_error:
+                if upload_path and os.path.exists(upload_path):
+                    os.remove(upload_path)
                 flash(validation_error, 'danger')
                 return render_template('cover_letter/generate.html', form=form, title="Generate AI Cover Letter")
 
-            try:
-                ai_prompt = build_cover_letter_prompt(form_data_dict, form_data_dict['existing_cover_text'])
-                logger.info(f"AI Prompt for user {current_user.id} (first 500 chars): {ai_prompt[:500]}...") # Ensuring clean f-string
-                generated_content = f"--- PROMPT FOR AI ---\n{ai_prompt}\n\n--- END (Actual AI content here) ---" # Placeholder
+            # Reserve the credit before any extraction or model call, so one credit can't start several jobs
+            job_id = new_job_id()
+            if not credit_service.consume(current_user.id, generation_credit_type, reason=JOB_TYPE,
+                                          idempotency_key=reservation_key(job_id)):
+                db.session.rollback()
+                if upload_path and os.path.exists(upload_path):
+                    os.remove(upload_path)
+                flash(f'You do not have enough "{generation_credit_type}" credits to generate a cover letter.', 'warning')
+                return redirect(url_for('cover_letter.index'))
 
-                user_credit_on_submit.amount -= 1
-                db.session.add(user_credit_on_submit)
+            try:
                 cover_letter_title = form.title.data or f"AI Gen: {form.job_title.data}"[:100]
-                new_cover_letter = CoverLetter(user_id=current_user.id, title=cover_letter_title, content=generated_content)
-                db.session.add(new_cover_letter)
-                db.session.commit()
-                flash('AI Cover Letter generation initiated (mock)!', 'success')
-                return redirect(url_for('cover_letter.index'))
+                # Commits the job row together with the credit reservation
+                job_id = job_queue.enqueue(current_user.id, JOB_TYPE, run_cover_letter_job,
+                                           current_user.id, form_data_dict, upload_path, upload_digest,
+                                           cover_letter_title, generation_credit_type, job_id=job_id)
             except Exception as e:
                 db.session.rollback()
-                logger.error(f"Error in AI cover letter generation: {e}", exc_info=True)
+                logger.error(f"Error enqueuing AI cover letter generation: {e}", exc_info=True)
                 flash(f'An error during generation: {str(e)}', 'danger')
+            else:
+                if request.accept_mimetypes.best == 'application/json':
+                    return jsonify({"success": True, "job_id": job_id,
+                                    "status_url": url_for('cover_letter.job_status', job_id=job_id)}), 202
+                return redirect(url_for('cover_letter.job_page', job_id=job_id))
         # else: # Form validation failed
             # WTForms will add errors to form.errors, which can be displayed in the template
             # flash('Please correct the errors in the form.', 'warning')
@@ -123,13 +120,38 @@ def generate_ai_cover_letter():
 
     return render_template('cover_letter/generate.html', form=form, title="Generate AI Cover Letter")
 
+def _get_own_job(job_id):
+    job = db.session.get(BackgroundJob, job_id)
+    if job is None or job.user_id != current_user.id:
+        abort(404)
+    return job
+
+@cover_letter_bp.route('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    '''Polling endpoint for a background generation job.'''
+    job = _get_own_job(job_id)
+    if job.status in ('queued', 'running') and reap_stale_jobs(job_id=job.id):
+        db.session.refresh(job)  # Its worker is gone; report it failed rather than polling forever
+    payload = job.to_dict()
+    if job.status == 'succeeded':
+        payload['redirect_url'] = url_for('cover_letter.index')
+    return jsonify({"success": True, "job": payload})
+
+@cover_letter_bp.route('/jobs/<job_id>/progress')
+@login_required
+def job_page(job_id):
+    '''Progress page that polls job_status until the letter is ready.'''
+    job = _get_own_job(job_id)
+    return render_template('cover_letter/job.html', job=job, title="Generating Cover Letter")
+
 @cover_letter_bp.route('/create_manual', methods=['GET', 'POST'])
 @login_required
 def create_manual_cover_letter():
     '''Handles manual creation of a cover letter.'''
     form = SimpleCoverLetterForm()
     manual_credit_type = 'legacy'
-    user_credit = Credit.query.filter_by(user_id=current_user.id, credit_type=manual_credit_type).first()
+    user_credit = user_snapshot().credit(manual_credit_type)
 
     if request.method == 'POST':
         if not user_credit or user_credit.amount <= 0:
@@ -137,9 +159,11 @@ def create_manual_cover_letter():
             return redirect(url_for('cover_letter.index'))
 
         if form.validate_on_submit():
+            if not credit_service.consume(current_user.id, manual_credit_type, reason='cover_letter_manual'):
+                flash(f'You do not have enough "{manual_credit_type}" credits.', 'warning')
+                return redirect(url_for('cover_letter.index'))
             new_cl = CoverLetter(user_id=current_user.id, title=form.title.data, content=form.content.data)
-            user_credit.amount -= 1
-            db.session.add_all([new_cl, user_credit])
+            db.session.add(new_cl)
             try:
                 db.session.commit()
                 flash('Cover Letter created successfully!', 'success')
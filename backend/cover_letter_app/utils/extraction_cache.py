@@ -0,0 +1,144 @@
+import os
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, 'instance', 'extraction_cache.db')
+
+# Set EXTRACTION_CACHE_PATH to an empty string to disable the cache
+EXTRACTION_CACHE_PATH = os.getenv('EXTRACTION_CACHE_PATH', DEFAULT_CACHE_PATH)
+EXTRACTION_CACHE_TTL = int(os.getenv('EXTRACTION_CACHE_TTL', 7 * 24 * 3600))  # Seconds an entry stays valid
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', 50 * 1024 * 1024))  # Total cached text
+
+STAT_NAMES = ('hits', 'misses', 'expired', 'stores', 'evictions')
+
+
+class ExtractionCache:
+    """Extracted resume text keyed by the SHA-256 of the uploaded file's bytes.
+
+    Kept in a SQLite table so every web worker and job thread shares the entries
+    and the hit/miss counters. Entries expire after `ttl` seconds, and the least
+    recently used ones are evicted once the total text exceeds `max_bytes`.
+    """
+
+    def __init__(self, path=EXTRACTION_CACHE_PATH, ttl=EXTRACTION_CACHE_TTL, max_bytes=EXTRACTION_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def _db(self):
+        if not self.path:
+            return None
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:  # Never reuse a connection across fork()
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                self._conn.execute('PRAGMA journal_mode=WAL')
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS extraction_cache ('
+                    ' digest TEXT PRIMARY KEY, text TEXT NOT NULL, size INTEGER NOT NULL,'
+                    ' created_at REAL NOT NULL, last_used REAL NOT NULL)'
+                )
+                self._conn.execute('CREATE INDEX IF NOT EXISTS ix_extraction_cache_last_used ON extraction_cache (last_used)')
+                self._conn.execute('CREATE TABLE IF NOT EXISTS extraction_cache_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+                self._conn.executemany('INSERT OR IGNORE INTO extraction_cache_stats (name, value) VALUES (?, 0)',
+                                       [(name,) for name in STAT_NAMES])
+                self._conn.commit()
+                self._conn_pid = pid
+            except sqlite3.Error as e:
+                logger.error(f"Extraction cache disabled, cannot open {self.path}: {e}")
+                self.path = None
+                self._conn = None
+                return None
+        return self._conn
+
+    @staticmethod
+    def _count(conn, name, n=1):
+        conn.execute('UPDATE extraction_cache_stats SET value = value + ? WHERE name = ?', (n, name))
+
+    def get(self, digest):
+        """Return the cached text for digest, or None on a miss or an expired entry."""
+        with self._lock:
+            conn = self._db()
+            if conn is None:
+                return None
+            try:
+                now = time.time()
+                row = conn.execute('SELECT text, created_at FROM extraction_cache WHERE digest = ?', (digest,)).fetchone()
+                if row and now - row[1] < self.ttl:
+                    conn.execute('UPDATE extraction_cache SET last_used = ? WHERE digest = ?', (now, digest))
+                    self._count(conn, 'hits')
+                    conn.commit()
+                    return row[0]
+                if row:
+                    conn.execute('DELETE FROM extraction_cache WHERE digest = ?', (digest,))
+                    self._count(conn, 'expired')
+                self._count(conn, 'misses')
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Extraction cache read error: {e}")
+            return None
+
+    def put(self, digest, text):
+        size = len(text.encode('utf-8'))
+        if not text or size > self.max_bytes:
+            return  # Empty results may be transient parse failures; oversized ones would evict everything
+        with self._lock:
+            conn = self._db()
+            if conn is None:
+                return
+            try:
+                now = time.time()
+                conn.execute(
+                    'INSERT OR REPLACE INTO extraction_cache (digest, text, size, created_at, last_used) VALUES (?, ?, ?, ?, ?)',
+                    (digest, text, size, now, now)
+                )
+                self._count(conn, 'stores')
+                self._prune(conn, now)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Extraction cache write error: {e}")
+
+    def _prune(self, conn, now):
+        expired = conn.execute('DELETE FROM extraction_cache WHERE created_at <= ?', (now - self.ttl,)).rowcount
+        # Keep the most recently used entries whose running total fits in max_bytes
+        evicted = conn.execute(
+            'DELETE FROM extraction_cache WHERE digest IN ('
+            ' SELECT digest FROM (SELECT digest, SUM(size) OVER (ORDER BY last_used DESC, digest) AS running'
+            ' FROM extraction_cache) WHERE running > ?)', (self.max_bytes,)
+        ).rowcount
+        if expired:
+            self._count(conn, 'expired', expired)
+        if evicted:
+            self._count(conn, 'evictions', evicted)
+
+    def clear(self):
+        with self._lock:
+            conn = self._db()
+            if conn is not None:
+                conn.execute('DELETE FROM extraction_cache')
+                conn.execute('UPDATE extraction_cache_stats SET value = 0')
+                conn.commit()
+
+    def get_stats(self):
+        """Counters shared by all processes, plus the current entry count, size and hit rate."""
+        with self._lock:
+            conn = self._db()
+            if conn is None:
+                return {}
+            stats = dict(conn.execute('SELECT name, value FROM extraction_cache_stats').fetchall())
+            entries, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extraction_cache').fetchone()
+        lookups = stats['hits'] + stats['misses']
+        return dict(stats, entries=entries, bytes=total,
+                    hit_rate=round(stats['hits'] / lookups, 3) if lookups else 0.0)
+
+
+extraction_cache = ExtractionCache()
@@ -1,45 +1,152 @@
 import os
+import time
+import hashlib
 import tempfile
 import logging
 from PyPDF2 import PdfReader
 from docx import Document
 import textract
+from .extraction_cache import extraction_cache
+from .parser_pool import parser_pool, ParserPoolError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def extract_text_from_file(file_path):
-    """Extract text from uploaded files with enhanced error handling"""
+UPLOAD_CHUNK_SIZE = 64 * 1024
+EXTRACT_MAX_PAGES = int(os.getenv('EXTRACT_MAX_PAGES', 20))  # Resumes are a few pages; anything longer is cut off
+EXTRACT_TIME_LIMIT = float(os.getenv('EXTRACT_TIME_LIMIT', 10))  # Seconds per file, checked between pages
+
+def iter_text_from_file(file_path, max_pages=EXTRACT_MAX_PAGES, time_limit=EXTRACT_TIME_LIMIT):
+    """Yield the text of a file piece by piece: one PDF page, DOCX paragraph or TXT chunk at a time.
+
+    Stops after `max_pages` PDF pages or once `time_limit` seconds have passed, checked
+    between pieces; the generator then returns 'page_limit' or 'time_limit' (the
+    StopIteration value) instead of None. Closing the generator early (e.g. once a
+    caller has enough text) skips the remaining pages entirely.
+    """
+    started = time.monotonic()
+
+    def out_of_time():
+        if time.monotonic() - started > time_limit:
+            logger.warning(f"Extraction time limit ({time_limit}s) reached for {file_path}, stopping early")
+            return True
+        return False
+
+    if file_path.endswith('.pdf'):
+        logger.info(f"Processing PDF file: {file_path}")
+        with open(file_path, 'rb') as f:
+            reader = PdfReader(f)
+            page_count = len(reader.pages)
+            if page_count > max_pages:
+                logger.warning(f"{file_path} has {page_count} pages, extracting only the first {max_pages}")
+            for i in range(min(page_count, max_pages)):
+                yield reader.pages[i].extract_text() or ""
+                if out_of_time():
+                    return 'time_limit'
+            if page_count > max_pages:
+                return 'page_limit'
+
+    elif file_path.endswith('.docx'):
+        logger.info(f"Processing DOCX file: {file_path}")
+        for para in Document(file_path).paragraphs:
+            yield para.text
+            if out_of_time():
+                return 'time_limit'
+
+    elif file_path.endswith('.doc'):
+        logger.info(f"Processing DOC file: {file_path}")
+        yield textract.process(file_path).decode('utf-8')
+
+    elif file_path.endswith('.txt'):
+        logger.info(f"Processing TXT file: {file_path}")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            while True:
+                chunk = f.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    else:
+        logger.warning(f"Unsupported file type: {file_path}")
+
+def extract_text_from_file(file_path, max_chars=None, max_pages=EXTRACT_MAX_PAGES, time_limit=EXTRACT_TIME_LIMIT):
+    """Extract text from uploaded files with enhanced error handling.
+
+    With `max_chars`, extraction stops as soon as that many characters are collected
+    and the result is truncated to it, so callers only pay for the text they use.
+    Parsing runs in the parser pool; a file that hangs or crashes its parser yields "".
+    """
+    return _extract(file_path, max_chars, max_pages, time_limit)[0]
+
+def _extract(file_path, max_chars=None, max_pages=EXTRACT_MAX_PAGES, time_limit=EXTRACT_TIME_LIMIT):
+    """(text, complete) for a file; complete is False when the page or time limit or an error cut the text short."""
     if not os.path.exists(file_path):
         logger.error(f"File not found: {file_path}")
-        return ""
-    
+        return "", False
+    try:
+        return parser_pool.run(_extract_text_local, file_path, max_chars, max_pages, time_limit)
+    except ParserPoolError as e:
+        logger.error(f"Error extracting text from {file_path}: {e}")
+        return "", False
+
+def _extract_text_local(file_path, max_chars, max_pages, time_limit):
+    """Body of _extract, run inside a parser pool worker; returns (text, complete)."""
+    # TXT chunks are raw slices of the file; every other format is joined with blank lines as before
+    separator = "" if file_path.endswith('.txt') else "\n\n"
+    parts = []
+    collected = 0
+    stopped_by = None
+    pieces = iter_text_from_file(file_path, max_pages=max_pages, time_limit=time_limit)
     try:
-        if file_path.endswith('.pdf'):
-            logger.info(f"Processing PDF file: {file_path}")
-            with open(file_path, 'rb') as f:
-                reader = PdfReader(f)
-                return '\n\n'.join([page.extract_text() for page in reader.pages])
-                
-        elif file_path.endswith('.docx'):
-            logger.info(f"Processing DOCX file: {file_path}")
-            doc = Document(file_path)
-            return '\n\n'.join([para.text for para in doc.paragraphs])
-            
-        elif file_path.endswith('.doc'):
-            logger.info(f"Processing DOC file: {file_path}")
-            return textract.process(file_path).decode('utf-8')
-            
-        elif file_path.endswith('.txt'):
-            logger.info(f"Processing TXT file: {file_path}")
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-                
-        else:
-            logger.warning(f"Unsupported file type: {file_path}")
-            return ""
-            
+        while True:
+            try:
+                piece = next(pieces)
+            except StopIteration as stop:
+                stopped_by = stop.value
+                break
+            parts.append(piece)
+            collected += len(piece) + len(separator)
+            if max_chars is not None and collected >= max_chars:
+                break
     except Exception as e:
         logger.error(f"Error extracting text from {file_path}: {str(e)}")
-        return ""
+        return "", False
+    finally:
+        pieces.close()
+    text = separator.join(parts)
+    return (text[:max_chars] if max_chars is not None else text), stopped_by is None
+
+def save_upload(file_storage, dest_file):
+    """Stream an uploaded FileStorage into an open binary file; returns the SHA-256 hex digest of its bytes.
+
+    The digest is computed on the same pass as the write, so keying the extraction cache
+    costs no extra read of the file.
+    """
+    digest = hashlib.sha256()
+    stream = file_storage.stream
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+        dest_file.write(chunk)
+    return digest.hexdigest()
+
+def extract_text_cached(file_path, digest, max_chars=None):
+    """extract_text_from_file behind the content-hash extraction cache; repeat uploads skip the parsers.
+
+    Only complete extractions are cached: text cut short by the time or page limit
+    (or lost to a parser error) would otherwise be served for that file until it expires.
+    """
+    # Truncated extractions are cached separately from full ones
+    key = f"{digest}:{max_chars}" if digest and max_chars is not None else digest
+    if key:
+        cached = extraction_cache.get(key)
+        if cached is not None:
+            logger.info(f"Extraction cache hit for {file_path} ({digest[:12]})")
+            return cached
+    text, complete = _extract(file_path, max_chars=max_chars)
+    if key and complete:
+        extraction_cache.put(key, text)
+    return text
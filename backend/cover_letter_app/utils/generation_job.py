@@ -0,0 +1,60 @@
+import os
+import logging
+from backend.models import CoverLetter
+from backend.extensions import db
+from backend import credit_service
+from backend.job_queue import JobFailed, report_progress, reservation_key, STALE_JOB_ERROR
+from .prompt_engine import build_cover_letter_prompt, generate_cover_letter_text, PROMPT_FIELD_CHARS
+from .file_utils import extract_text_cached
+from .security import validate_input_length
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = 'cover_letter_generate'
+
+
+def run_cover_letter_job(job_id, user_id, form_data, upload_path, upload_digest, title, credit_type):
+    """Background half of generate_ai_cover_letter: extract the uploaded resume, build the prompt,
+    call the model, then save the letter, charging the credit unless it was reserved at enqueue.
+    Returns {'cover_letter_id', 'warnings'}.
+
+    upload_digest is the SHA-256 of the upload computed while it was saved; it keys the extraction cache."""
+    warnings = []
+    if upload_path:
+        report_progress(job_id, 10, 'Extracting text from your resume')
+        try:
+            # The prompt only uses the first PROMPT_FIELD_CHARS of the resume, so stop parsing there
+            extracted = extract_text_cached(upload_path, upload_digest, max_chars=PROMPT_FIELD_CHARS)
+        finally:
+            try:
+                os.remove(upload_path)
+                logger.info(f"Uploaded file {upload_path} removed.")
+            except OSError as e_remove:
+                logger.error(f"Error removing uploaded file {upload_path}: {e_remove}", exc_info=True)
+        if not extracted:
+            warnings.append('Could not extract text from the uploaded resume. Check file or paste text.')
+        form_data['resume_text'] = form_data['resume_text'] or extracted
+
+    validation_error = validate_input_length(
+        form_data['job_description'],
+        form_data['resume_text'],
+        form_data['existing_cover_text']
+    )
+    if validation_error:
+        raise JobFailed(validation_error)
+
+    report_progress(job_id, 40, 'Generating your cover letter')
+    ai_prompt = build_cover_letter_prompt(form_data, form_data['existing_cover_text'])
+    logger.info(f"AI Prompt for user {user_id} (first 500 chars): {ai_prompt[:500]}...")
+    generated_content = generate_cover_letter_text(ai_prompt)
+
+    report_progress(job_id, 90, 'Saving your cover letter')
+    if credit_service.already_applied(f"{reservation_key(job_id)}:refund"):
+        raise JobFailed(STALE_JOB_ERROR)  # Reaped as lost while the model ran; its credit is already back
+    # A no-op when the route reserved the credit at enqueue (same key); otherwise it charges here, with the save
+    if not credit_service.consume(user_id, credit_type, reason=JOB_TYPE, idempotency_key=reservation_key(job_id)):
+        raise JobFailed(f'You do not have enough "{credit_type}" credits to generate a cover letter.')
+    new_cover_letter = CoverLetter(user_id=user_id, title=title, content=generated_content)
+    db.session.add(new_cover_letter)
+    db.session.commit()
+    return {'cover_letter_id': new_cover_letter.id, 'warnings': warnings}
@@ -0,0 +1,140 @@
+import os
+import queue
+import logging
+import threading
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+# Parser processes per web process; 0 runs parsers inline in the calling thread
+PARSER_POOL_SIZE = int(os.getenv('PARSER_POOL_SIZE', 2))
+# Hard limit for one parse; the worker is killed and replaced when it is exceeded
+PARSER_POOL_TIMEOUT = float(os.getenv('PARSER_POOL_TIMEOUT', 20))
+PARSER_POOL_STARTUP_TIMEOUT = float(os.getenv('PARSER_POOL_STARTUP_TIMEOUT', 60))
+# 'spawn' keeps workers from inheriting the web process's threads, locks and loaded models
+PARSER_POOL_START_METHOD = os.getenv('PARSER_POOL_START_METHOD', 'spawn')
+
+
+class ParserPoolError(Exception):
+    """A parse timed out, crashed its worker or raised inside it."""
+
+
+def _worker_main(conn):
+    """Worker loop: import the parsers once, then run (func, args, kwargs) jobs until the pipe closes."""
+    from . import file_utils  # noqa: F401  Pre-warm PyPDF2, python-docx and textract before the first job
+    conn.send(('ready', None))
+    while True:
+        try:
+            func, args, kwargs = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            conn.send(('ok', func(*args, **kwargs)))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True, name='parser-worker')
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self, timeout):
+        try:
+            if not self.ready and self.conn.poll(timeout):
+                self.ready = self.conn.recv()[0] == 'ready'
+        except (EOFError, OSError):  # Died while importing the parsers
+            self.ready = False
+        return self.ready
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class ParserPool:
+    """Pre-warmed worker processes for CPU-bound document parsing.
+
+    Each job runs in its own worker, so parsing uses every core instead of contending
+    for one web process's GIL. A job that exceeds `timeout` or kills its worker only
+    loses that worker, which is replaced right away; the caller gets ParserPoolError.
+    """
+
+    def __init__(self, size=PARSER_POOL_SIZE, timeout=PARSER_POOL_TIMEOUT, start_method=PARSER_POOL_START_METHOD):
+        self.size = size
+        self.timeout = timeout
+        self.start_method = start_method
+        self._idle = None
+        self._pid = None
+        self._workers = []
+        self._lock = threading.Lock()
+        self.stats = {'jobs': 0, 'timeouts': 0, 'crashes': 0, 'errors': 0}
+
+    def start(self):
+        """Spawn the workers now (called from gunicorn post_fork); otherwise they start on first use."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Worker handles inherited across fork belong to the parent, never use them
+            self._ctx = multiprocessing.get_context(self.start_method)
+            self._workers = [_Worker(self._ctx) for _ in range(self.size)]
+            self._idle = queue.Queue()
+            for worker in self._workers:
+                self._idle.put(worker)
+            self._pid = os.getpid()
+        logger.info(f"Parser pool started with {self.size} workers (pid {os.getpid()})")
+
+    def _replace(self, worker):
+        worker.kill()
+        replacement = _Worker(self._ctx)
+        with self._lock:
+            self._workers = [replacement if w is worker else w for w in self._workers]
+        return replacement
+
+    def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) in a worker and return its result. func must be a module-level function."""
+        if self.size <= 0:
+            return func(*args, **kwargs)
+        self.start()
+        worker = self._idle.get()  # Blocks while every worker is busy
+        try:
+            if not worker.wait_ready(PARSER_POOL_STARTUP_TIMEOUT):
+                worker = self._replace(worker)
+                raise ParserPoolError('Parser worker failed to start')
+            if not worker.process.is_alive():
+                # Killed while idle (OOM killer, operator); never hand it another job
+                self.stats['crashes'] += 1
+                worker = self._replace(worker)
+                raise ParserPoolError('Parser worker died while idle')
+            self.stats['jobs'] += 1
+            try:
+                worker.conn.send((func, args, kwargs))
+                if not worker.conn.poll(self.timeout):
+                    self.stats['timeouts'] += 1
+                    worker = self._replace(worker)
+                    raise ParserPoolError(f'Parsing exceeded {self.timeout}s and was stopped')
+                status, value = worker.conn.recv()
+            except (BrokenPipeError, EOFError, OSError):  # BrokenPipeError is an OSError; named for the reader
+                self.stats['crashes'] += 1
+                worker = self._replace(worker)
+                raise ParserPoolError('Parser worker crashed')
+            if status == 'error':
+                self.stats['errors'] += 1
+                raise ParserPoolError(value)
+            return value
+        finally:
+            self._idle.put(worker)
+
+    def shutdown(self):
+        with self._lock:
+            for worker in self._workers:
+                worker.kill()
+            self._workers = []
+            self._pid = None
+
+
+parser_pool = ParserPool()
@@ -1,3 +1,10 @@
+import logging
+from backend import llm_client
+
+logger = logging.getLogger(__name__)
+
+PROMPT_FIELD_CHARS = 1800  # Each free-text field is cut to this many characters in the prompt
+
 def build_cover_letter_prompt(form_data, existing_cover_text):
     """Construct optimized prompt for Mistral API"""
     # Base prompt
@@ -10,10 +17,10 @@ def build_cover_letter_prompt(form_data, existing_cover_text):
     - Email: {form_data['your_email']}
     
     JOB REQUIREMENTS:
-    {form_data['job_description'][:1800]}
+    {form_data['job_description'][:PROMPT_FIELD_CHARS]}
     
     APPLICANT'S RESUME CONTENT:
-    {form_data['resume_text'][:1800] if form_data['resume_text'] else 'Not provided'}
+    {form_data['resume_text'][:PROMPT_FIELD_CHARS] if form_data['resume_text'] else 'Not provided'}
     """
     
     # Refinement strategies
@@ -22,7 +29,7 @@ def build_cover_letter_prompt(form_data, existing_cover_text):
         prompt += f"""
         ---
         REFINEMENT INSTRUCTIONS:
-        - Refine this existing cover letter: {existing_cover_text[:1800]}
+        - Refine this existing cover letter: {existing_cover_text[:PROMPT_FIELD_CHARS]}
         - Focus on these key improvements: {form_data['key_points'] or 'Enhance professionalism and job relevance'}
         - Maintain the original structure while improving content
         - Strengthen connections to job requirements
@@ -31,7 +38,7 @@ def build_cover_letter_prompt(form_data, existing_cover_text):
         prompt += f"""
         ---
         ENHANCEMENT INSTRUCTIONS:
-        - Enhance this cover letter with resume content: {existing_cover_text[:1800]}
+        - Enhance this cover letter with resume content: {existing_cover_text[:PROMPT_FIELD_CHARS]}
         - Incorporate these key resume points: {form_data['key_points'] or 'Highlight relevant skills and experiences'}
         - Add 1-2 concrete examples from resume
         - Strengthen quantitative achievements
@@ -70,3 +77,15 @@ def build_cover_letter_prompt(form_data, existing_cover_text):
     """
     
     return prompt
+
+def generate_cover_letter_text(prompt):
+    """Send the built prompt through the shared LLM client; falls back to the prompt placeholder"""
+    placeholder = f"--- PROMPT FOR AI ---\n{prompt}\n\n--- END (Actual AI content here) ---"
+    if not llm_client.is_configured():
+        logger.warning("Mistral API key not configured. Returning prompt placeholder for cover letter.")
+        return placeholder
+    try:
+        return llm_client.chat_completion(prompt, temperature=0.7, max_tokens=1200, timeout=60)
+    except llm_client.LLMClientError as e:
+        logger.error(f"Cover letter generation error: {str(e)}")
+        return placeholder
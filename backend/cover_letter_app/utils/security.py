@@ -1,31 +1,11 @@
-from flask import request, jsonify
-from functools import wraps
-import time
-from collections import defaultdict
+from backend.rate_limiter import rate_limit
 
-# Simple in-memory rate limiter
-request_log = defaultdict(list)
 MAX_REQUESTS = 5  # Max requests per minute
 TIME_WINDOW = 60  # 60 seconds
 
 def rate_limited(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        ip = request.remote_addr
-        current_time = time.time()
-        
-        # Remove old requests
-        request_log[ip] = [t for t in request_log[ip] if current_time - t < TIME_WINDOW]
-        
-        if len(request_log[ip]) >= MAX_REQUESTS:
-            return jsonify({
-                "error": "Too many requests",
-                "message": f"Limit is {MAX_REQUESTS} requests per minute"
-            }), 429
-            
-        request_log[ip].append(current_time)
-        return f(*args, **kwargs)
-    return decorated_function
+    """Limit a view to MAX_REQUESTS per TIME_WINDOW per client IP, shared by all workers (see backend/rate_limiter.py)."""
+    return rate_limit(MAX_REQUESTS, TIME_WINDOW)(f)
 
 def validate_input_length(job_desc, resume_text, cover_text):
     """Validate input sizes to prevent abuse"""
@@ -0,0 +1,226 @@
+import logging
+from datetime import datetime
+from sqlalchemy import update, insert, select, func, case, cast, literal, null, or_, String, DateTime
+from sqlalchemy.dialects import postgresql, sqlite
+from .extensions import db
+from .models import User, Credit, CreditLedger, FeatureUsageLog
+
+logger = logging.getLogger(__name__)
+
+CREDIT_TYPE_LEGACY = 'legacy'  # The general-purpose credit spent by resume, cover letter and interview creation
+
+# Ledger reasons; consume() callers may pass a more specific one such as the feature name
+REASON_CONSUME = 'consume'
+REASON_GRANT = 'grant'
+REASON_OPENING = 'opening_balance'
+REASON_MONTHLY_RESET = 'monthly_reset'
+REASON_REFUND = 'refund'
+
+
+def already_applied(idempotency_key):
+    """True if a ledger entry with this key exists (or is pending in this session)."""
+    if not idempotency_key:
+        return False
+    return db.session.query(CreditLedger.query.filter_by(idempotency_key=idempotency_key).exists()).scalar()
+
+
+def _current_amount(user_id, credit_type):
+    return db.session.query(Credit.amount).filter_by(user_id=user_id, credit_type=credit_type).scalar()
+
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+_UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def _append(user_id, credit_type, delta, balance_after, reason, idempotency_key):
+    """Record a ledger entry; returns False if another transaction already holds its idempotency_key.
+
+    A keyed entry is inserted with ON CONFLICT DO NOTHING, so two requests racing
+    past already_applied() are told apart here instead of by an IntegrityError at commit.
+    """
+    values = dict(user_id=user_id, credit_type=credit_type, delta=delta, balance_after=balance_after,
+                  reason=reason, idempotency_key=idempotency_key)
+    upsert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if not idempotency_key or upsert is None:
+        db.session.add(CreditLedger(**values))
+        return True
+    db.session.flush()
+    result = db.session.execute(
+        upsert(CreditLedger).values(**values).on_conflict_do_nothing(index_elements=['idempotency_key'])
+    )
+    return result.rowcount == 1
+
+
+def _adjust(user_id, credit_type, amount):
+    db.session.execute(
+        update(Credit)
+        .where(Credit.user_id == user_id, Credit.credit_type == credit_type)
+        .values(amount=Credit.amount + amount)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def consume(user_id, credit_type, amount=1, reason=REASON_CONSUME, idempotency_key=None):
+    """Atomically take `amount` credits of `credit_type` from a user; returns True if they were taken.
+
+    A single conditional UPDATE does the check and the decrement, so concurrent
+    requests can never spend the same credit twice, and the matching ledger entry
+    is added in the same transaction. It does not commit: the caller commits it
+    together with whatever the credit paid for (or rolls both back).
+    A repeated idempotency_key returns True without spending again, including when
+    the repeat runs concurrently: the losing call gives its decrement back.
+    Credit objects already loaded in the session keep their old amount until refreshed.
+    """
+    if already_applied(idempotency_key):
+        logger.info(f"Credit spend '{idempotency_key}' already applied for user {user_id}")
+        return True
+    result = db.session.execute(
+        update(Credit)
+        .where(Credit.user_id == user_id, Credit.credit_type == credit_type, Credit.amount >= amount)
+        .values(amount=Credit.amount - amount)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        logger.warning(f"Insufficient '{credit_type}' credits for user {user_id} (needs {amount})")
+        return False
+    if not _append(user_id, credit_type, -amount, _current_amount(user_id, credit_type), reason, idempotency_key):
+        _adjust(user_id, credit_type, amount)
+        logger.info(f"Credit spend '{idempotency_key}' applied concurrently for user {user_id}")
+    return True
+
+
+def grant(user_id, credit_type, amount, reason=REASON_GRANT, idempotency_key=None):
+    """Add `amount` credits (creating the balance row if needed) and record it. Does not commit."""
+    if already_applied(idempotency_key):
+        return False
+    result = db.session.execute(
+        update(Credit)
+        .where(Credit.user_id == user_id, Credit.credit_type == credit_type)
+        .values(amount=Credit.amount + amount)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.session.add(Credit(user_id=user_id, credit_type=credit_type, amount=amount))
+        db.session.flush()
+    if not _append(user_id, credit_type, amount, _current_amount(user_id, credit_type), reason, idempotency_key):
+        _adjust(user_id, credit_type, -amount)
+        return False
+    return True
+
+
+def refund(idempotency_key, reason=REASON_REFUND):
+    """Give back what a consume() recorded under idempotency_key, e.g. a credit reserved for a job that failed.
+
+    Safe to call more than once and for keys that spent nothing; returns True only
+    when credits were returned. Does not commit.
+    """
+    entry = CreditLedger.query.filter_by(idempotency_key=idempotency_key).first()
+    if entry is None or entry.delta >= 0:
+        return False
+    return grant(entry.user_id, entry.credit_type, -entry.delta, reason=reason, idempotency_key=f"{idempotency_key}:refund")
+
+
+def set_balance(user_id, credit_type, amount, reason=REASON_MONTHLY_RESET, idempotency_key=None):
+    """Set the balance to `amount` (e.g. a monthly reset), recording the difference as one signed entry.
+
+    Returns the Credit row, or None if the key was already applied. Does not commit.
+    """
+    if already_applied(idempotency_key):
+        return None
+    credit = Credit.query.filter_by(user_id=user_id, credit_type=credit_type).with_for_update().first()
+    if credit is None:
+        credit = Credit(user_id=user_id, credit_type=credit_type, amount=0)
+        db.session.add(credit)
+    delta = amount - (credit.amount or 0)
+    if not _append(user_id, credit_type, delta, amount, reason, idempotency_key):
+        return None
+    credit.amount = amount
+    return credit
+
+
+def reset_monthly_balances(quotas, month_start, user_ids, now=None):
+    """Reset the `quotas` ({credit_type: amount}) of `user_ids` for the month starting at month_start.
+
+    Set-based: a few INSERT ... SELECT / UPDATE statements for the whole batch. Only
+    balances last reset before month_start are touched, so re-running for the same
+    month is a no-op. Each reset is recorded as a signed ledger entry keyed
+    monthly_reset:<user>:<type>:<YYYY-MM>. Does not commit; returns the rows reset.
+    """
+    now = now or datetime.utcnow()
+    month = f"{month_start:%Y-%m}"
+    # Users without a balance row get one at 0 (never reset), so the reset below opens it through the ledger
+    for credit_type in quotas:
+        has_row = select(Credit.user_id).where(Credit.credit_type == credit_type, Credit.user_id.in_(user_ids))
+        db.session.execute(
+            insert(Credit).from_select(
+                ['user_id', 'credit_type', 'amount', 'last_reset'],
+                select(User.id, literal(credit_type), literal(0), null()).where(User.id.in_(user_ids), User.id.not_in(has_row)),
+                include_defaults=False
+            )
+        )
+    due = (
+        Credit.user_id.in_(user_ids),
+        Credit.credit_type.in_(list(quotas)),
+        or_(Credit.last_reset.is_(None), Credit.last_reset < month_start),
+    )
+    quota = case(quotas, value=Credit.credit_type)
+    db.session.execute(select(Credit.id).where(*due).with_for_update())  # Row locks on servers that support them
+    db.session.execute(
+        insert(CreditLedger).from_select(
+            ['user_id', 'credit_type', 'delta', 'balance_after', 'reason', 'idempotency_key', 'created_at'],
+            select(
+                Credit.user_id, Credit.credit_type, quota - Credit.amount, quota, literal(REASON_MONTHLY_RESET),
+                literal(f'{REASON_MONTHLY_RESET}:') + cast(Credit.user_id, String) + ':' + Credit.credit_type + f':{month}',
+                literal(now, DateTime)
+            ).where(*due)
+        )
+    )
+    result = db.session.execute(
+        update(Credit).where(*due).values(amount=quota, last_reset=now).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def has_credits(user_id, credit_type, amount=1):
+    """Cheap pre-check for showing warnings before a form is submitted; consume() is the real check."""
+    return db.session.query(
+        Credit.query.filter(Credit.user_id == user_id, Credit.credit_type == credit_type, Credit.amount >= amount).exists()
+    ).scalar()
+
+
+def ledger_balance(user_id, credit_type):
+    """Balance recomputed from the ledger; equals Credit.amount unless something bypassed this module."""
+    return db.session.query(func.coalesce(func.sum(CreditLedger.delta), 0)).filter(
+        CreditLedger.user_id == user_id, CreditLedger.credit_type == credit_type
+    ).scalar()
+
+
+def find_drift(user_id=None):
+    """Return (user_id, credit_type, amount, ledger_sum) for balances that disagree with their ledger."""
+    ledger = db.session.query(
+        CreditLedger.user_id, CreditLedger.credit_type, func.sum(CreditLedger.delta).label('total')
+    ).group_by(CreditLedger.user_id, CreditLedger.credit_type)
+    if user_id is not None:
+        ledger = ledger.filter(CreditLedger.user_id == user_id)
+    ledger = ledger.subquery()
+    query = db.session.query(Credit.user_id, Credit.credit_type, Credit.amount, func.coalesce(ledger.c.total, 0)).outerjoin(
+        ledger, (ledger.c.user_id == Credit.user_id) & (ledger.c.credit_type == Credit.credit_type)
+    ).filter(Credit.amount != func.coalesce(ledger.c.total, 0))
+    if user_id is not None:
+        query = query.filter(Credit.user_id == user_id)
+    return [tuple(row) for row in query.all()]
+
+
+def reconcile_usage(user_id, start, end):
+    """Credits spent per the ledger vs. credits_used logged in FeatureUsageLog for [start, end).
+
+    Both sides are range scans on (user_id, timestamp) indexes rather than full table scans.
+    """
+    spent = db.session.query(func.coalesce(-func.sum(CreditLedger.delta), 0)).filter(
+        CreditLedger.user_id == user_id, CreditLedger.created_at >= start, CreditLedger.created_at < end,
+        CreditLedger.delta < 0
+    ).scalar()
+    logged = db.session.query(func.coalesce(func.sum(FeatureUsageLog.credits_used), 0)).filter(
+        FeatureUsageLog.user_id == user_id, FeatureUsageLog.timestamp >= start, FeatureUsageLog.timestamp < end
+    ).scalar()
+    return {'ledger_spent': spent, 'usage_logged': logged, 'difference': spent - logged}
@@ -0,0 +1,95 @@
+import base64
+import logging
+from datetime import datetime
+from sqlalchemy import select, func, and_, or_
+from .extensions import db
+from .models import Resume, CoverLetter, MockInterview
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+
+
+def _title_column(model):
+    """The short label shown in lists; interviews have no title, so use the start of the job description."""
+    if model is MockInterview:
+        return func.substr(MockInterview.job_description, 1, 25).label('title')
+    return model.title.label('title')
+
+
+DOCUMENT_KINDS = {
+    'resumes': Resume,
+    'cover_letters': CoverLetter,
+    'interviews': MockInterview,
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(updated_at, doc_id):
+    raw = f"{updated_at.isoformat()}|{doc_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        stamp, doc_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(stamp), int(doc_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def _through(model, after):
+    """Rows listed up to and including the cursor's row (newer, or as new with an id at least as high)."""
+    stamp, last_id = decode_cursor(after)
+    return or_(model.updated_at > stamp, and_(model.updated_at == stamp, model.id >= last_id))
+
+
+def list_documents(kind, user_id, limit=DASHBOARD_PAGE_SIZE, after=None, cap=None):
+    """One page of a user's non-archived documents, newest first.
+
+    Selects only id, title and updated_at with a LIMIT, and pages by keyset
+    (updated_at, id) rather than OFFSET. The (user_id, is_archived, updated_at)
+    index returns the rows already in that order, so every page is an index
+    range read of limit + 1 rows however many documents the user has.
+    cap limits how far paging goes (a tier's document limit): pages stop after the
+    first `cap` documents. Returns {'items': [...], 'next_cursor': str|None}.
+    """
+    model = DOCUMENT_KINDS[kind]
+    shown = 0
+    if cap is not None:
+        if after:
+            # An index range count of the rows already listed
+            shown = db.session.execute(
+                select(func.count()).where(model.user_id == user_id, model.is_archived.is_(False), _through(model, after))
+            ).scalar()
+        limit = min(limit, cap - shown)
+    if limit <= 0:
+        return {'items': [], 'next_cursor': None}
+    query = (
+        select(model.id, _title_column(model), model.updated_at)
+        .where(model.user_id == user_id, model.is_archived.is_(False))
+        .order_by(model.updated_at.desc(), model.id.desc())
+        .limit(limit + 1)  # One extra row tells us whether there is a next page
+    )
+    if after:
+        stamp, last_id = decode_cursor(after)
+        query = query.where(or_(model.updated_at < stamp, and_(model.updated_at == stamp, model.id < last_id)))
+    rows = db.session.execute(query).all()
+    items = rows[:limit]
+    has_more = len(rows) > limit and (cap is None or shown + limit < cap)
+    next_cursor = encode_cursor(items[-1].updated_at, items[-1].id) if has_more else None
+    return {'items': items, 'next_cursor': next_cursor}
+
+
+def document_totals(user_id):
+    """COUNT(*) of each kind of non-archived document, in a single query."""
+    counts = [
+        select(func.count()).where(model.user_id == user_id, model.is_archived.is_(False)).scalar_subquery().label(kind)
+        for kind, model in DOCUMENT_KINDS.items()
+    ]
+    row = db.session.execute(select(*counts)).one()
+    return dict(row._mapping)
@@ -0,0 +1,137 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from .extensions import db
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached identity is trusted; tier changes made by another process show up within this. 0 disables
+IDENTITY_CACHE_TTL = float(os.getenv('IDENTITY_CACHE_TTL', 30))
+IDENTITY_CACHE_SIZE = int(os.getenv('IDENTITY_CACHE_SIZE', 4096))
+
+CACHED_FIELDS = ('id', 'email', 'tier', 'username')
+
+
+class CachedUser(UserMixin):
+    """Immutable slim view of a User (id, email, tier, username) used as current_user.
+
+    Any other attribute (e.g. contact_phone in the profile page) loads the full
+    User row on first use; the session's identity map keeps that to one query per request.
+    """
+
+    def __init__(self, user):
+        for field in CACHED_FIELDS:
+            object.__setattr__(self, field, getattr(user, field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CachedUser is read-only; load the User model to change '{name}'")
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def load(self):
+        """The full User model for this identity."""
+        return db.session.get(User, self.id)
+
+    def __repr__(self):
+        return f'<CachedUser {self.email} (Tier: {self.tier})>'
+
+
+class IdentityCache:
+    """Per-process LRU of CachedUser objects with a short TTL, consulted by the Flask-Login user_loader."""
+
+    def __init__(self, ttl=IDENTITY_CACHE_TTL, max_size=IDENTITY_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def put(self, cached_user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[cached_user.id] = (time.monotonic() + self.ttl, cached_user)
+            self._entries.move_to_end(cached_user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def load(self, user_id):
+        """Return the CachedUser for user_id, reading the users table only on a miss; None if no such user."""
+        cached = self.get(user_id)
+        if cached is not None:
+            return cached
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        cached = CachedUser(user)
+        self.put(cached)
+        return cached
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+identity_cache = IdentityCache()
+
+
+def _on_user_field_set(target, value, oldvalue, initiator):
+    if target.id is None or value == oldvalue:
+        return
+    identity_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        # Drop it again once committed, in case a concurrent request re-cached the old value meanwhile
+        session.info.setdefault('identity_cache_invalidate', set()).add(target.id)
+
+
+# Attribute events cover ORM changes; bulk query.update() calls must invalidate explicitly
+for _field in ('tier', 'email', 'username'):
+    event.listen(getattr(User, _field), 'set', _on_user_field_set)
+
+
+@event.listens_for(User, 'after_delete')
+def _on_user_deleted(mapper, connection, target):
+    identity_cache.invalidate(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    for user_id in session.info.pop('identity_cache_invalidate', ()):
+        identity_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop('identity_cache_invalidate', None)
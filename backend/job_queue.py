@@ -0,0 +1,157 @@
+import os
+import json
+import uuid
+import logging
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import current_app
+from .extensions import db
+from .models import BackgroundJob
+from . import credit_service
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per web process. Jobs are I/O- or subprocess-bound (file parsing, LLM calls),
+# so threads keep the gunicorn worker free to answer requests while they run.
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+# Seconds a queued or running job may go without an update before it is presumed lost
+# (its worker restarted or was killed) and failed by reap_stale_jobs()
+JOB_MAX_AGE = int(os.getenv('JOB_MAX_AGE', '900'))
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+
+
+STALE_JOB_ERROR = 'This job was interrupted before it finished. Please try again.'
+
+
+class JobFailed(Exception):
+    """Raised by a job function to fail the job with a user-facing message."""
+
+
+def new_job_id():
+    return uuid.uuid4().hex
+
+
+def reservation_key(job_id):
+    """Idempotency key under which a job's credits are reserved; failed jobs are refunded through it."""
+    return f"job:{job_id}"
+
+
+class JobQueue:
+    """In-process worker pool for background jobs whose state lives in the background_jobs table.
+
+    State is in the database, so any web worker can answer the polling endpoint
+    no matter which process runs the job.
+    """
+
+    def __init__(self, max_workers=JOB_WORKERS):
+        self.max_workers = max_workers
+        self._executor = None
+        self._pid = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Threads do not survive fork, so each gunicorn worker builds its own pool
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+                self._pid = os.getpid()
+                self._futures = {}
+            return self._executor
+
+    def enqueue(self, user_id, job_type, fn, *args, job_id=None):
+        """Record a queued job and run fn(job_id, *args) in the pool; returns the job id.
+
+        fn runs inside an app context. Its return value (JSON-serialisable) becomes
+        the job result; raising JobFailed or any other exception marks the job failed.
+        Pass a job_id from new_job_id() to reserve credits under reservation_key(job_id)
+        first: the job row and the reservation commit together, and a failed job is refunded.
+        """
+        job = BackgroundJob(id=job_id or new_job_id(), user_id=user_id, job_type=job_type, status=STATUS_QUEUED)
+        db.session.add(job)
+        db.session.commit()
+        app = current_app._get_current_object()
+        future = self._get_executor().submit(self._run, app, job.id, fn, args)
+        with self._lock:
+            self._futures[job.id] = future
+        future.add_done_callback(lambda _f, job_id=job.id: self._futures.pop(job_id, None))
+        logger.info(f"Enqueued {job_type} job {job.id} for user {user_id}")
+        return job.id
+
+    def _run(self, app, job_id, fn, args):
+        with app.app_context():
+            update_job(job_id, status=STATUS_RUNNING)
+            try:
+                result = fn(job_id, *args)
+            except JobFailed as e:
+                db.session.rollback()
+                fail_job(job_id, str(e))
+                return
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Background job {job_id} failed: {e}", exc_info=True)
+                fail_job(job_id, 'An unexpected error occurred while processing this job.')
+                return
+            update_job(job_id, status=STATUS_SUCCEEDED, progress=100, result=json.dumps(result))
+
+    def join(self, timeout=None):
+        """Wait for every job submitted by this process to finish (used by tests and shutdown)."""
+        with self._lock:
+            futures = list(self._futures.values())
+        wait(futures, timeout=timeout)
+
+    def shutdown(self, wait_for_jobs=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait_for_jobs)
+                self._executor = None
+
+
+job_queue = JobQueue()
+
+
+def update_job(job_id, **fields):
+    """Set fields on a job row and commit; used by job functions to report progress."""
+    job = db.session.get(BackgroundJob, job_id)
+    if job is None:
+        logger.warning(f"Background job {job_id} vanished before update {fields}")
+        return
+    for name, value in fields.items():
+        setattr(job, name, value)
+    db.session.commit()
+
+
+def report_progress(job_id, progress, message=None):
+    update_job(job_id, progress=progress, message=message)
+
+
+def fail_job(job_id, error):
+    """Mark a job failed and refund any credits reserved for it, in one commit."""
+    credit_service.refund(reservation_key(job_id))
+    update_job(job_id, status=STATUS_FAILED, error=error)
+
+
+def reap_stale_jobs(max_age=JOB_MAX_AGE, job_id=None, now=None):
+    """Fail queued or running jobs not updated for max_age seconds; returns how many were failed.
+
+    Jobs only run in the process that queued them, so one whose worker restarted or
+    was killed would otherwise stay queued/running forever. Called by the polling
+    endpoint for the polled job and by the `reap-jobs` CLI command for all of them.
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(seconds=max_age)
+    query = BackgroundJob.query.filter(
+        BackgroundJob.status.in_((STATUS_QUEUED, STATUS_RUNNING)),
+        db.func.coalesce(BackgroundJob.updated_at, BackgroundJob.created_at) < cutoff,
+    )
+    if job_id is not None:
+        query = query.filter(BackgroundJob.id == job_id)
+    stale_ids = [job.id for job in query.all()]
+    for stale_id in stale_ids:
+        logger.warning(f"Background job {stale_id} presumed lost; marking it failed")
+        fail_job(stale_id, STALE_JOB_ERROR)
+    return len(stale_ids)
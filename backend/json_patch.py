@@ -0,0 +1,162 @@
+import copy
+
+
+class JsonPatchError(ValueError):
+    pass
+
+
+def _unescape(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _split_pointer(pointer):
+    """RFC 6901 pointer -> list of reference tokens."""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith('/')):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [_unescape(token) for token in pointer.split('/')[1:]] if pointer else []
+
+
+def _array_index(container, token, allow_end=False):
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != '0' and token.startswith('0')):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(doc, tokens):
+    for token in tokens:
+        if isinstance(doc, dict):
+            if token not in doc:
+                raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+            doc = doc[token]
+        elif isinstance(doc, list):
+            doc = doc[_array_index(doc, token)]
+        else:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return doc
+
+
+def _add(doc, tokens, value):
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_array_index(parent, key, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a scalar at /{'/'.join(tokens)}")
+    return doc
+
+
+def _remove(doc, tokens):
+    if not tokens:
+        raise JsonPatchError("Cannot remove the whole document")
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return parent.pop(key)
+    if isinstance(parent, list):
+        return parent.pop(_array_index(parent, key))
+    raise JsonPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def apply_json_patch(doc, operations):
+    """Apply an RFC 6902 JSON Patch and return the patched document; `doc` is left untouched.
+
+    Operations are all-or-nothing: the first failing one (including a failed
+    'test') raises JsonPatchError and nothing is applied.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("A JSON Patch must be a list of operations")
+    doc = copy.deepcopy(doc)
+    for operation in operations:
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            raise JsonPatchError(f"Invalid patch operation: {operation!r}")
+        op = operation['op']
+        tokens = _split_pointer(operation['path'])
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise JsonPatchError(f"'{op}' requires a value")
+        if op == 'add':
+            doc = _add(doc, tokens, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            _remove(doc, tokens)
+        elif op == 'replace':
+            value = copy.deepcopy(operation['value'])
+            if not tokens:
+                doc = value
+                continue
+            _resolve(doc, tokens)  # Target must exist
+            parent = _resolve(doc, tokens[:-1])
+            # Assign in place so object keys keep their order
+            parent[tokens[-1] if isinstance(parent, dict) else _array_index(parent, tokens[-1])] = value
+        elif op in ('move', 'copy'):
+            source = _split_pointer(operation.get('from'))
+            if op == 'move' and tokens[:len(source)] == source and tokens != source:
+                raise JsonPatchError("Cannot move a value into one of its own children")
+            value = copy.deepcopy(_resolve(doc, source))
+            if op == 'move':
+                _remove(doc, source)
+            doc = _add(doc, tokens, value)
+        elif op == 'test':
+            if _resolve(doc, tokens) != operation['value']:
+                raise JsonPatchError(f"Test failed at {operation['path']}")
+        else:
+            raise JsonPatchError(f"Unknown patch operation: {op!r}")
+    return doc
+
+
+def apply_merge_patch(target, patch):
+    """Apply an RFC 7396 JSON Merge Patch: objects merge recursively, null deletes, anything else replaces."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = copy.deepcopy(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def _escape(token):
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _same(a, b):
+    return type(a) is type(b) and a == b
+
+
+def make_json_patch(source, target, path=''):
+    """A JSON Patch that turns `source` into `target`, for storing compact deltas.
+
+    Objects are diffed key by key and lists element-wise (with appends and
+    truncations at the end as single adds/removes); anything else that
+    differs is replaced whole.
+    """
+    if _same(source, target):
+        return []
+    if isinstance(source, dict) and isinstance(target, dict):
+        ops = [{'op': 'remove', 'path': f'{path}/{_escape(key)}'} for key in source if key not in target]
+        for key, value in target.items():
+            if key in source:
+                ops.extend(make_json_patch(source[key], value, f'{path}/{_escape(key)}'))
+            else:
+                ops.append({'op': 'add', 'path': f'{path}/{_escape(key)}', 'value': value})
+        return ops
+    if isinstance(source, list) and isinstance(target, list):
+        common = min(len(source), len(target))
+        ops = []
+        for index in range(common):
+            ops.extend(make_json_patch(source[index], target[index], f'{path}/{index}'))
+        ops.extend({'op': 'add', 'path': f'{path}/-', 'value': value} for value in target[common:])
+        ops.extend({'op': 'remove', 'path': f'{path}/{index}'} for index in range(len(source) - 1, common - 1, -1))
+        return ops
+    return [{'op': 'replace', 'path': path, 'value': target}]
@@ -0,0 +1,161 @@
+import os
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Constants (single source for every Mistral consumer in the app)
+MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
+MISTRAL_API_URL = os.getenv("MISTRAL_API_URL", "https://api.mistral.ai/v1/chat/completions")
+MISTRAL_MODEL = os.getenv("MISTRAL_MODEL", "mistral-large-latest")
+
+# Connection pool settings. One pool is kept per worker process.
+LLM_POOL_CONNECTIONS = int(os.getenv("LLM_POOL_CONNECTIONS", 4))  # Number of distinct hosts to keep pools for
+LLM_POOL_MAXSIZE = int(os.getenv("LLM_POOL_MAXSIZE", 10))  # Max keep-alive connections per host
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "1") == "1"  # Set to 0 to close the connection after each call
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 0))
+
+# Stub mode: when set, all calls go to a local stub server instead of Mistral (used by tests)
+LLM_STUB_MODE = os.getenv("LLM_STUB_MODE", "0") == "1"
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+_stub_server = None
+_stub_url = None
+
+
+class LLMClientError(Exception):
+    """Raised when the LLM API cannot be reached or returns an unusable response."""
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=LLM_POOL_CONNECTIONS,
+                          pool_maxsize=LLM_POOL_MAXSIZE,
+                          max_retries=LLM_MAX_RETRIES)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Content-Type": "application/json",
+        "Connection": "keep-alive" if LLM_KEEP_ALIVE else "close",
+    })
+    return session
+
+
+def get_session():
+    """Return the pooled session for this worker process, creating it on first use."""
+    global _session, _session_pid
+    pid = os.getpid()
+    # A session inherited across fork() shares sockets with the parent, so rebuild it per process.
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+                logger.info(f"LLM client session created for pid {pid} (pool_maxsize={LLM_POOL_MAXSIZE}, keep_alive={LLM_KEEP_ALIVE})")
+    return _session
+
+
+def close_session():
+    """Close the pooled session (e.g. on worker shutdown or between tests)."""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def is_configured():
+    """True if calls will reach either Mistral (API key set) or the local stub."""
+    return bool(MISTRAL_API_KEY) or LLM_STUB_MODE or _stub_url is not None
+
+
+def _api_url():
+    if _stub_url is not None:
+        return _stub_url
+    return MISTRAL_API_URL
+
+
+def chat_completion(prompt, temperature=0.4, max_tokens=2000, timeout=30, model=None):
+    """Send a single-message chat completion and return the stripped reply text.
+
+    Raises LLMClientError on network, HTTP or response-format errors so callers
+    can keep their own fallbacks.
+    """
+    headers = {}
+    if MISTRAL_API_KEY:
+        headers["Authorization"] = f"Bearer {MISTRAL_API_KEY}"
+    payload = {
+        "model": model or MISTRAL_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    try:
+        response = get_session().post(_api_url(), headers=headers, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"].strip()
+    except (requests.RequestException, KeyError, IndexError, TypeError, ValueError) as e:
+        raise LLMClientError(str(e)) from e
+
+
+# --- Local stub server (for tests and offline development) ---
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Needed for keep-alive between the client and the stub
+    responder = None
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        reply = self.responder(prompt) if self.responder else f"STUB: {prompt}"
+        body = json.dumps({"choices": [{"message": {"role": "assistant", "content": reply}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("LLM stub: " + format % args)
+
+
+def start_stub_server(responder=None, host="127.0.0.1", port=0):
+    """Start a local chat-completions stub and route all client calls to it.
+
+    `responder` maps the prompt string to the reply text; by default the prompt
+    is echoed back prefixed with 'STUB: '. Returns the stub URL.
+    """
+    global _stub_server, _stub_url
+    stop_stub_server()
+    handler = type("StubHandler", (_StubHandler,), {"responder": staticmethod(responder) if responder else None})
+    _stub_server = ThreadingHTTPServer((host, port), handler)
+    _stub_server.daemon_threads = True
+    threading.Thread(target=_stub_server.serve_forever, daemon=True).start()
+    _stub_url = f"http://{host}:{_stub_server.server_address[1]}/v1/chat/completions"
+    logger.info(f"LLM stub server listening on {_stub_url}")
+    return _stub_url
+
+
+def stop_stub_server():
+    """Stop the stub server and route calls back to MISTRAL_API_URL."""
+    global _stub_server, _stub_url
+    if _stub_server is not None:
+        _stub_server.shutdown()
+        _stub_server.server_close()
+    _stub_server = None
+    _stub_url = None
+    close_session()
+
+
+if LLM_STUB_MODE:
+    start_stub_server()
@@ -18,8 +18,7 @@ if project_root not in sys.path:
 # Explicitly import all models and the db instance for Alembic's awareness.
 try:
     from backend.extensions import db # Import the SQLAlchemy instance
-    from backend.models import User, Resume, CoverLetter, FeatureUsageLog, Credit
-    from backend.mock_interview_app.models import MockInterview
+    from backend.models import User, Resume, CoverLetter, FeatureUsageLog, Credit, MockInterview
     # If you had a common Base = declarative_base(), it would be:
     # from backend.models import Base
     # target_metadata = Base.metadata
@@ -0,0 +1,44 @@
+"""create_credit_ledger_table
+
+Revision ID: '0006'
+Revises: '0005'
+Create Date: '2026-10-18 14:00:00.000000'
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'credit_ledger',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('credit_type', sa.String(length=50), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.Column('balance_after', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(length=100), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=128), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index('ix_credit_ledger_user_type_created', 'credit_ledger', ['user_id', 'credit_type', 'created_at'])
+    op.create_index('ix_credit_ledger_user_created', 'credit_ledger', ['user_id', 'created_at'])
+    # Existing balances become opening entries so every balance equals the sum of its ledger
+    op.execute(
+        "INSERT INTO credit_ledger (user_id, credit_type, delta, balance_after, reason, created_at) "
+        "SELECT user_id, credit_type, amount, amount, 'opening_balance', CURRENT_TIMESTAMP FROM credits"
+    )
+
+def downgrade():
+    op.drop_index('ix_credit_ledger_user_created', table_name='credit_ledger')
+    op.drop_index('ix_credit_ledger_user_type_created', table_name='credit_ledger')
+    op.drop_table('credit_ledger')
@@ -0,0 +1,29 @@
+"""add_mock_interview_archive_columns
+
+Revision ID: '0007'
+Revises: '0006'
+Create Date: '2026-10-18 15:30:00.000000'
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 0003 created mock_interview before the model gained these columns; the listing index in 0008 needs is_archived
+    with op.batch_alter_table('mock_interview') as batch_op:
+        batch_op.add_column(sa.Column('is_archived', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column('language', sa.String(length=50), nullable=False, server_default='English'))
+        batch_op.add_column(sa.Column('pronunciation_feedback', sa.Text(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table('mock_interview') as batch_op:
+        batch_op.drop_column('pronunciation_feedback')
+        batch_op.drop_column('language')
+        batch_op.drop_column('is_archived')
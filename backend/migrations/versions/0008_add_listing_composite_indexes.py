@@ -0,0 +1,34 @@
+"""add_listing_composite_indexes
+
+Revision ID: '0008'
+Revises: '0007'
+Create Date: '2026-10-18 16:00:00.000000'
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Listings filter on (user_id, is_archived) and order by a timestamp; usage analytics
+# filter on (user_id, feature_name) over a time range. Credit lookups by
+# (user_id, credit_type) are already served by the uq_user_credit_type index.
+INDEXES = [
+    ('ix_resumes_user_archived_updated', 'resumes', ['user_id', 'is_archived', 'updated_at']),
+    ('ix_cover_letters_user_archived_updated', 'cover_letters', ['user_id', 'is_archived', 'updated_at']),
+    ('ix_mock_interview_user_archived_created', 'mock_interview', ['user_id', 'is_archived', 'created_at']),
+    ('ix_feature_usage_logs_user_feature_ts', 'feature_usage_logs', ['user_id', 'feature_name', 'timestamp']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
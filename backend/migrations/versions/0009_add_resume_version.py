@@ -0,0 +1,24 @@
+"""add_resume_version
+
+Revision ID: '0009'
+Revises: '0008'
+Create Date: '2026-10-18 17:00:00.000000'
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Optimistic-concurrency counter for incremental saves (see backend/resume_autosave.py)
+    op.add_column('resumes', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+def downgrade():
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_column('version')
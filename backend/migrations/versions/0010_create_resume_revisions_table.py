@@ -0,0 +1,34 @@
+"""create_resume_revisions_table
+
+Revision ID: '0010'
+Revises: '0009'
+Create Date: '2026-10-18 18:00:00.000000'
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'resume_revisions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('resume_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('content_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('resume_id', 'version', name='uq_resume_revision_version')
+    )
+
+def downgrade():
+    op.drop_table('resume_revisions')
@@ -0,0 +1,25 @@
+"""add_resume_revision_content_hash
+
+Revision ID: '0011'
+Revises: '0010'
+Create Date: '2026-10-19 10:00:00.000000'
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Deltas are only chained onto a revision whose content hash matches the save's previous content.
+    # Existing rows have none, so the next save of each resume stores a snapshot.
+    op.add_column('resume_revisions', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table('resume_revisions') as batch_op:
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,39 @@
+"""make_document_updated_at_not_null
+
+Revision ID: '0012'
+Revises: '0011'
+Create Date: '2026-10-19 12:00:00.000000'
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+# The dashboard pages each list by (updated_at, id) straight from these indexes,
+# which only works when updated_at is never NULL
+TABLES = ['resumes', 'cover_letters', 'mock_interview']
+
+
+def upgrade():
+    # 0003 created mock_interview without updated_at; start it at created_at like the others
+    with op.batch_alter_table('mock_interview', recreate='always') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.current_timestamp()))
+    op.execute("UPDATE mock_interview SET updated_at = created_at")
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_mock_interview_user_archived_updated', 'mock_interview', ['user_id', 'is_archived', 'updated_at'])
+
+def downgrade():
+    op.drop_index('ix_mock_interview_user_archived_updated', table_name='mock_interview')
+    with op.batch_alter_table('mock_interview') as batch_op:
+        batch_op.drop_column('updated_at')
+    for table in reversed(TABLES[:-1]):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=True)
@@ -1,8 +1,11 @@
 import logging # Added for logging
 from flask import render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
-from backend.models import MockInterview, Credit # Ensure Credit model is correctly named
+from backend.models import MockInterview
 from backend.extensions import db
+from backend.rate_limiter import rate_limit
+from backend import credit_service
+from backend.request_context import user_snapshot
 from . import mock_interview_bp # Import the blueprint defined in __init__.py
 from .forms import MockInterviewStartForm # Added for Flask-WTF form
 import json # For storing sample questions as JSON
@@ -14,25 +17,26 @@ logger = logging.getLogger(__name__) # Added for logging
 @login_required
 def index():
     """Displays a list of the user's mock interviews."""
-    interviews = MockInterview.query.filter_by(user_id=current_user.id, is_archived=False).order_by(MockInterview.created_at.desc()).all()
+    interviews = MockInterview.list_query(current_user.id).order_by(MockInterview.created_at.desc()).all()
     return render_template('mock_interview/index.html', interviews=interviews)
 
 @mock_interview_bp.route('/start', methods=['GET', 'POST'])
 @login_required
+@rate_limit(5, 60, per_user=True, methods=('POST',))
 def start():
     """Handles starting a new mock interview, with credit checking and Flask-WTF form."""
     form = MockInterviewStartForm()
 
     # Credit Checking for 'legacy' credits
-    user_credit = Credit.query.filter_by(user_id=current_user.id, credit_type='legacy').first()
+    user_credit = user_snapshot().credit('legacy')
 
     if not user_credit or user_credit.amount <= 0:
         flash('You do not have enough credits to start a new mock interview. Please purchase more credits.', 'warning')
         return redirect(url_for('mock_interview.index')) # Redirect if no credits
 
     if form.validate_on_submit():
-        # Re-check credits on submission
-        if not user_credit or user_credit.amount <= 0:
+        # Re-check and spend the credit in one UPDATE; committed below with the new interview
+        if not credit_service.consume(current_user.id, credit_service.CREDIT_TYPE_LEGACY, reason='mock_interview_start'):
             flash('Credit check failed upon submission. Please ensure you have enough credits.', 'warning')
             return redirect(url_for('mock_interview.index'))
 
@@ -56,10 +60,7 @@ def start():
             # e.g., answers=json.dumps([]), scores=json.dumps([]), feedback=json.dumps([]), overall_score=None
         )
 
-        user_credit.amount -= 1
-
         db.session.add(new_interview)
-        db.session.add(user_credit)
 
         try:
             db.session.commit()
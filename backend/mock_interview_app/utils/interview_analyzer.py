@@ -1,56 +1,87 @@
 import logging # Added
 import random # Added
+import numpy as np
+from spacy.attrs import ORTH
 from textblob import TextBlob
-import spacy
+from backend.nlp_provider import process, process_many, NER_ONLY, NO_NER
+from backend.mock_interview_app.utils.resume_cache import get_resume_artifacts
 
 logger = logging.getLogger(__name__) # Added
 
-try:
-    nlp = spacy.load('en_core_web_sm')
-except OSError:
-    logger.error("Spacy model 'en_core_web_sm' not found. This model should be downloaded at application startup.")
-    # Fallback to a dummy nlp to prevent crash, analysis will be significantly impacted.
-    class DummySpacyNLP:
-        def __call__(self, text):
-            class Doc:
-                def __init__(self, text): self.text = text; self.ents = []; self.noun_chunks = []
-                def similarity(self, other_doc): return 0.0 # Default similarity
-            return Doc(text)
-    nlp = DummySpacyNLP()
 
-
-def extract_skill_from_question(question_text):
-    # Simple keyword extraction, can be improved with NLP
-    # Looks for phrases like "experience with X", "used X", "proficiency in X"
-    question_doc = nlp(question_text.lower())
+def _skill_span(question_doc):
+    """Return the token or noun chunk of a parsed question that names the skill being asked about"""
     keywords = ["with", "using", "used", "proficiency in", "experience in", "knowledge of", "about"]
-    skill = None
     for token in question_doc:
         if token.text in keywords:
             # Next non-stopword noun/propn could be the skill
             for child in token.rights:
                 if child.pos_ in ["NOUN", "PROPN"] and not child.is_stop:
-                    skill = child.text
-                    break
-            if skill: break
-    if not skill and len(question_doc.noun_chunks) > 0: # Fallback to last noun chunk
-        skill = question_doc.noun_chunks[-1].text
-    return skill
+                    return child
+    noun_chunks = list(question_doc.noun_chunks) # noun_chunks is a generator on real spaCy docs
+    if noun_chunks: # Fallback to last noun chunk
+        return noun_chunks[-1]
+    return None
 
-def score_answer(question, answer_text, resume_text=""):
-    answer_doc = nlp(answer_text)
+def extract_skill_from_question(question_text):
+    # Simple keyword extraction, can be improved with NLP
+    # Looks for phrases like "experience with X", "used X", "proficiency in X"
+    skill = _skill_span(process(question_text.lower(), disable=NO_NER))
+    return skill.text if skill is not None else None
+
+def _resume_artifacts(resume_text):
+    """Entity-derived keyword sets of a resume, used for specificity scoring and feedback"""
+    artifacts = get_resume_artifacts(resume_text)  # Parsed once per resume content, then served from cache
+    return {'keywords': artifacts['keywords'], 'entities': artifacts['entity_labels']}
+
+SIMILARITY_THRESHOLD = 0.6
+
+def _token_vectors(doc):
+    """Matrix of the vectors of the tokens in doc that have one (the tokens `token.has_vector` accepts)."""
+    vocab = getattr(doc, 'vocab', None)
+    if vocab is not None:
+        vectors = vocab.vectors
+        if vectors.size == 0:
+            # No static vectors: spaCy falls back to the contextual tensor, one row per token
+            return doc.tensor if doc.tensor.size else None
+        if vectors.mode == 'default':
+            # Look all token rows up in one call instead of a Python loop over tokens
+            rows = vectors.find(keys=doc.to_array(ORTH))
+            rows = rows[rows >= 0]
+            return vectors.data[rows] if rows.size else None
+    stacked = [token.vector for token in doc if token.has_vector]
+    return np.asarray(stacked, dtype=np.float32) if stacked else None
+
+def _max_token_similarity(answer_doc, skill_doc):
+    """Highest cosine similarity between any answer token and the skill, computed in one matrix product.
+
+    Matches `max(token.similarity(skill_doc) for token in answer_doc if token.has_vector)`;
+    returns 0.0 when the skill or every answer token lacks a vector.
+    """
+    if not skill_doc.has_vector:
+        return 0.0
+    matrix = _token_vectors(answer_doc)
+    if matrix is None or not len(matrix):
+        return 0.0
+    skill_vector = np.asarray(skill_doc.vector, dtype=matrix.dtype)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(skill_vector)
+    dots = matrix @ skill_vector
+    # Zero-norm vectors have similarity 0, as in spaCy
+    similarities = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+    return float(similarities.max())
+
+def _score_docs(answer_text, answer_doc, skill_in_question, get_skill_doc, resume):
+    """Score one answer from already parsed docs. `resume` is the _resume_artifacts dict or None."""
     answer_blob = TextBlob(answer_text)
 
-    skill_in_question = extract_skill_from_question(question)
-
     # Relevance: Check if skill from question is in answer, or general relevance.
     relevance_score = 1
     if skill_in_question:
         if skill_in_question.lower() in answer_text.lower():
             relevance_score = 5
         else: # Check similarity
-            skill_doc = nlp(skill_in_question)
-            if any(token.similarity(skill_doc) > 0.6 for token in answer_doc if token.has_vector and skill_doc.has_vector):
+            skill_doc = get_skill_doc()
+            if _max_token_similarity(answer_doc, skill_doc) > SIMILARITY_THRESHOLD:
                 relevance_score = 3
     elif len(answer_text.split()) > 10: # General check if no specific skill
         relevance_score = 3 # Default for a reasonable answer
@@ -62,10 +93,8 @@ def score_answer(question, answer_text, resume_text=""):
         specificity_score = 5
     elif len(answer_doc.ents) > 1: # Any other entities like ORG, PERSON, PRODUCT
         specificity_score = 3
-    if specificity_score < 5 and resume_text: # Check if resume keywords are mentioned
-        resume_doc = nlp(resume_text)
-        resume_keywords = [ent.text.lower() for ent in resume_doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'GPE']]
-        if any(keyword in answer_text.lower() for keyword in resume_keywords):
+    if specificity_score < 5 and resume: # Check if resume keywords are mentioned
+        if any(keyword in answer_text.lower() for keyword in resume['keywords']):
             specificity_score = max(specificity_score, 4)
 
 
@@ -96,9 +125,15 @@ def score_answer(question, answer_text, resume_text=""):
         'overall': overall
     }
 
-def generate_feedback(scores, question, answer_text, resume_text=""):
-    feedback_points = []
+def score_answer(question, answer_text, resume_text=""):
     skill_in_question = extract_skill_from_question(question)
+    resume = _resume_artifacts(resume_text) if resume_text else None
+    return _score_docs(answer_text, process(answer_text), skill_in_question,
+                       lambda: process(skill_in_question), resume)
+
+def _feedback_docs(scores, skill_in_question, answer_doc, resume):
+    """Build feedback for one answer from already parsed docs. `resume` is the _resume_artifacts dict or None."""
+    feedback_points = []
 
     if scores['relevance'] < 3:
         if skill_in_question:
@@ -108,11 +143,9 @@ def generate_feedback(scores, question, answer_text, resume_text=""):
 
     if scores['specificity'] < 3:
         feedback_points.append("Make your answer more specific. Include concrete examples, numbers, or outcomes if possible.")
-    elif scores['specificity'] < 5 and resume_text:
-        resume_doc = nlp(resume_text)
-        resume_entities = {ent.text.lower(): ent.label_ for ent in resume_doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'GPE', 'EVENT']}
-        mentioned_entities = {ent.text.lower() for ent in nlp(answer_text).ents}
-        unmentioned_resume_entities = [k for k,v in resume_entities.items() if k not in mentioned_entities]
+    elif scores['specificity'] < 5 and resume:
+        mentioned_entities = {ent.text.lower() for ent in answer_doc.ents}
+        unmentioned_resume_entities = [k for k,v in resume['entities'].items() if k not in mentioned_entities]
         if unmentioned_resume_entities:
              feedback_points.append(f"You could strengthen your answer by mentioning relevant experiences from your resume, such as your work with {random.choice(unmentioned_resume_entities)}.")
 
@@ -129,3 +162,43 @@ def generate_feedback(scores, question, answer_text, resume_text=""):
             feedback_points.append("This is a decent answer. Consider if you can add more detail or examples to make it stronger.")
 
     return feedback_points
+
+def generate_feedback(scores, question, answer_text, resume_text=""):
+    skill_in_question = extract_skill_from_question(question)
+    resume = None
+    if scores['specificity'] < 5 and resume_text:
+        resume = _resume_artifacts(resume_text)
+    answer_doc = process(answer_text, disable=NER_ONLY)
+    return _feedback_docs(scores, skill_in_question, answer_doc, resume)
+
+def score_interview(questions, answers, resume_text=""):
+    """Score and give feedback for a whole mock interview session.
+
+    Questions and answers are parsed together in one nlp.pipe batch and the resume
+    artifacts come from the resume cache, then the docs are reused for scoring and feedback. Returns
+    {'results': [{'question', 'answer', 'scores', 'feedback'}, ...], 'overall_score'}
+    with results in question order; missing answers are scored as empty.
+    """
+    questions = list(questions)
+    answers = list(answers)[:len(questions)]
+    answers += [""] * (len(questions) - len(answers))
+
+    docs = process_many([question.lower() for question in questions] + answers)
+    question_docs, answer_docs = docs[:len(questions)], docs[len(questions):]
+    resume = _resume_artifacts(resume_text) if resume_text else None
+
+    results = []
+    for question, answer_text, question_doc, answer_doc in zip(questions, answers, question_docs, answer_docs):
+        skill = _skill_span(question_doc)
+        skill_in_question = skill.text if skill is not None else None
+        # The skill span already carries vectors from the question parse, no separate nlp() call
+        scores = _score_docs(answer_text, answer_doc, skill_in_question, lambda skill=skill: skill, resume)
+        results.append({
+            'question': question,
+            'answer': answer_text,
+            'scores': scores,
+            'feedback': _feedback_docs(scores, skill_in_question, answer_doc, resume),
+        })
+
+    overall_score = round(sum(r['scores']['overall'] for r in results) / len(results), 1) if results else None
+    return {'results': results, 'overall_score': overall_score}
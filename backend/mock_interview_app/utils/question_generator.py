@@ -1,27 +1,12 @@
 import random
-import spacy
 import logging # Added
+from backend.nlp_provider import process, NO_NER
+from backend.mock_interview_app.utils.resume_cache import get_resume_artifacts
 
 logger = logging.getLogger(__name__) # Added
 
-# Ensure model is loaded.
-try:
-    nlp = spacy.load('en_core_web_sm')
-except OSError:
-    logger.error("Spacy model 'en_core_web_sm' not found. This model should be downloaded at application startup. Question generation will be impaired.")
-    # Fallback or raise exception: For question generation, a dummy might be less useful.
-    # For now, let it proceed (Spacy might raise error later or work with blank nlp object if it allows)
-    # or define a simple dummy if Spacy calls will fail hard.
-    # To be safe, let's use a similar dummy as in analyzer to avoid crashes.
-    class DummySpacyNLP:
-        def __call__(self, text):
-            class Doc:
-                def __init__(self, text): self.text = text; self.ents = []; self.noun_chunks = []
-            return Doc(text)
-    nlp = DummySpacyNLP()
-
 def generate_questions(job_desc, resume_text="", num_skill_questions=3, num_behavioral_questions=2):
-    doc = nlp(job_desc)
+    doc = process(job_desc, disable=NO_NER)
 
     # Extract potential skills (noun chunks)
     skills = list(set([chunk.text.lower() for chunk in doc.noun_chunks if len(chunk.text.split()) <= 3 and chunk.root.pos_ == 'NOUN']))
@@ -40,10 +25,8 @@ def generate_questions(job_desc, resume_text="", num_skill_questions=3, num_beha
     skill_questions = [random.choice(skill_question_templates).format(skill) for skill in selected_skills]
 
     if resume_text:
-        resume_doc = nlp(resume_text)
-        # Extract entities that might be skills or technologies from resume
-        resume_keywords = [ent.text for ent in resume_doc.ents if ent.label_ in ['SKILL', 'PRODUCT', 'TECH', 'ORG', 'WORK_OF_ART']]
-        resume_keywords = list(set([k.lower() for k in resume_keywords]))
+        # Entities that might be skills or technologies, parsed once per resume content
+        resume_keywords = get_resume_artifacts(resume_text)['skill_keywords']
 
         # Add one question based on a resume keyword if not already covered
         if len(skill_questions) < num_skill_questions and resume_keywords:
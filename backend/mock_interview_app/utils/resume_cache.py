@@ -0,0 +1,94 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from backend.nlp_provider import process
+
+logger = logging.getLogger(__name__)
+
+RESUME_NLP_CACHE_SIZE = int(os.getenv('RESUME_NLP_CACHE_SIZE', '256'))
+
+# Entity labels each consumer cares about
+SPECIFICITY_LABELS = ('ORG', 'PRODUCT', 'GPE')  # interview_analyzer specificity scoring
+FEEDBACK_LABELS = ('ORG', 'PRODUCT', 'GPE', 'EVENT')  # interview_analyzer feedback suggestions
+SKILL_LABELS = ('SKILL', 'PRODUCT', 'TECH', 'ORG', 'WORK_OF_ART')  # question_generator resume questions
+
+
+def content_hash(resume_text):
+    return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+
+
+def build_artifacts(resume_text):
+    """Parse a resume once and return every NLP-derived artifact the interview modules use."""
+    doc = process(resume_text)
+    entities = [(ent.text, ent.label_) for ent in doc.ents]
+    try:
+        noun_chunks = [chunk.text for chunk in doc.noun_chunks]
+    except ValueError:  # Pipelines without a parser cannot produce noun chunks
+        noun_chunks = []
+    return {
+        'hash': content_hash(resume_text),
+        'entities': entities,
+        'noun_chunks': noun_chunks,
+        'keywords': [text.lower() for text, label in entities if label in SPECIFICITY_LABELS],
+        'entity_labels': {text.lower(): label for text, label in entities if label in FEEDBACK_LABELS},
+        'skill_keywords': sorted({text.lower() for text, label in entities if label in SKILL_LABELS}),
+    }
+
+
+class ResumeArtifactCache:
+    """In-memory LRU of parsed resume artifacts keyed by the SHA-256 of the resume text.
+
+    Cached dicts are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_size=RESUME_NLP_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key):
+        with self._lock:
+            artifacts = self._entries.get(key)
+            if artifacts is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return artifacts
+
+    def put(self, key, artifacts):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = artifacts
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(self.stats, size=len(self._entries),
+                        hit_rate=round(self.stats['hits'] / lookups, 3) if lookups else 0.0)
+
+
+resume_cache = ResumeArtifactCache()
+
+
+def get_resume_artifacts(resume_text):
+    """Return the artifacts for resume_text, parsing it only on the first call per content version."""
+    key = content_hash(resume_text)
+    artifacts = resume_cache.get(key)
+    if artifacts is None:
+        artifacts = build_artifacts(resume_text)
+        resume_cache.put(key, artifacts)
+    return artifacts
+
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from flask_login import UserMixin
 from .extensions import db
@@ -41,47 +42,88 @@ class User(db.Model, UserMixin):
     def __repr__(self):
         return f'<User {self.email} (Tier: {self.tier})>'
 
-class Resume(db.Model):
+# Large Text columns are deferred in named groups and only loaded when accessed or undeferred,
+# e.g. .options(db.undefer_group('body')) in detail/edit views. List pages use list_query(),
+# which loads the small columns plus a PREVIEW_CHARS-long 'preview' column computed in SQL.
+PREVIEW_CHARS = 200
+
+
+class ListProjectionMixin:
+    @classmethod
+    def list_query(cls, user_id):
+        """A user's non-archived rows with small columns and previews only, never the deferred bodies."""
+        return cls.query.options(db.undefer_group('preview')).filter_by(user_id=user_id, is_archived=False)
+
+
+class Resume(ListProjectionMixin, db.Model):
     __tablename__ = 'resumes'
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     title = db.Column(db.String(100), nullable=False, default='Untitled Resume')
-    content = db.Column(db.Text, nullable=False) # Should store JSON string
+    content = db.deferred(db.Column(db.Text, nullable=False), group='body') # Should store JSON string
+    content_preview = db.column_property(db.func.substr(content.columns[0], 1, PREVIEW_CHARS), deferred=True, group='preview')
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1') # Bumped on every content save; patches must name it
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     is_archived = db.Column(db.Boolean, default=False, nullable=False)
 
     user = db.relationship('User', backref=db.backref('resumes', lazy=True))
+    __table_args__ = (db.Index('ix_resumes_user_archived_updated', 'user_id', 'is_archived', 'updated_at'),)
+
+class ResumeRevision(db.Model):
+    """One saved version of a resume: a full snapshot, or a JSON Patch from the previous stored revision."""
+    __tablename__ = 'resume_revisions'
+    id = db.Column(db.Integer, primary_key=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False) # Resume.version this revision reconstructs
+    kind = db.Column(db.String(10), nullable=False) # 'snapshot' or 'delta'
+    payload = db.deferred(db.Column(db.LargeBinary, nullable=False)) # zlib-compressed content or JSON Patch
+    content_size = db.Column(db.Integer, nullable=False) # Length of the reconstructed content
+    content_hash = db.Column(db.String(64), nullable=True) # SHA-256 of the reconstructed content; the next delta must start from it
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    resume = db.relationship('Resume', backref=db.backref('revisions', lazy='dynamic', cascade='all, delete-orphan'))
+    __table_args__ = (db.UniqueConstraint('resume_id', 'version', name='uq_resume_revision_version'),)
+
+    def __repr__(self):
+        return f'<ResumeRevision resume_id={self.resume_id} version={self.version} kind={self.kind}>'
 
-class CoverLetter(db.Model):
+class CoverLetter(ListProjectionMixin, db.Model):
     __tablename__ = 'cover_letters'
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     title = db.Column(db.String(100), nullable=False, default='Untitled Cover Letter')
-    content = db.Column(db.Text, nullable=False)
+    content = db.deferred(db.Column(db.Text, nullable=False), group='body')
+    content_preview = db.column_property(db.func.substr(content.columns[0], 1, PREVIEW_CHARS), deferred=True, group='preview')
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     is_archived = db.Column(db.Boolean, default=False, nullable=False)
 
     user = db.relationship('User', backref=db.backref('cover_letters', lazy=True))
+    __table_args__ = (db.Index('ix_cover_letters_user_archived_updated', 'user_id', 'is_archived', 'updated_at'),)
 
-class MockInterview(db.Model):
+class MockInterview(ListProjectionMixin, db.Model):
     __tablename__ = 'mock_interview' # Changed from 'mock_interviews'
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    job_description = db.Column(db.Text, nullable=True)
-    questions = db.Column(db.Text, nullable=False)
-    answers = db.Column(db.Text, nullable=True)
-    scores = db.Column(db.Text, nullable=True)
-    feedback = db.Column(db.Text, nullable=True)
+    job_description = db.deferred(db.Column(db.Text, nullable=True), group='body')
+    questions = db.deferred(db.Column(db.Text, nullable=False), group='transcript')
+    answers = db.deferred(db.Column(db.Text, nullable=True), group='transcript')
+    scores = db.deferred(db.Column(db.Text, nullable=True), group='transcript')
+    feedback = db.deferred(db.Column(db.Text, nullable=True), group='transcript')
     overall_score = db.Column(db.Float, nullable=True)
     language = db.Column(db.String(50), nullable=False, default='English', server_default='English')
-    pronunciation_feedback = db.Column(db.Text, nullable=True)
+    pronunciation_feedback = db.deferred(db.Column(db.Text, nullable=True), group='transcript')
+    job_description_preview = db.column_property(db.func.substr(job_description.columns[0], 1, PREVIEW_CHARS), deferred=True, group='preview')
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     is_archived = db.Column(db.Boolean, default=False, nullable=False)
 
     user = db.relationship('User', backref=db.backref('mock_interviews', lazy=True))
+    __table_args__ = (
+        db.Index('ix_mock_interview_user_archived_created', 'user_id', 'is_archived', 'created_at'),
+        db.Index('ix_mock_interview_user_archived_updated', 'user_id', 'is_archived', 'updated_at'),  # Dashboard list
+    )
 
 # class Credit(db.Model):
 #     __tablename__ = 'credits'
@@ -102,6 +144,7 @@ class FeatureUsageLog(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
     user = db.relationship('User', backref=db.backref('feature_usage_logs', lazy=True))
+    __table_args__ = (db.Index('ix_feature_usage_logs_user_feature_ts', 'user_id', 'feature_name', 'timestamp'),)
 
     def __repr__(self):
         return f'<FeatureUsageLog user_id={self.user_id} feature={self.feature_name} time={self.timestamp}>'
@@ -116,6 +159,27 @@ class Credit(db.Model):
     user = db.relationship('User', backref=db.backref('credits', lazy=True))
     __table_args__ = (db.UniqueConstraint('user_id', 'credit_type', name='uq_user_credit_type'),)
 
+class CreditLedger(db.Model):
+    """Append-only history of credit changes; Credit.amount is the materialized sum of these deltas."""
+    __tablename__ = 'credit_ledger'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    credit_type = db.Column(db.String(50), nullable=False)
+    delta = db.Column(db.Integer, nullable=False) # Signed: negative when spent, positive when granted or reset
+    balance_after = db.Column(db.Integer, nullable=False) # Credit.amount once this entry was applied
+    reason = db.Column(db.String(100), nullable=False) # e.g., 'consume', 'grant', 'monthly_reset', 'opening_balance'
+    idempotency_key = db.Column(db.String(128), nullable=True, unique=True) # Retried operations reuse their key
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    user = db.relationship('User', backref=db.backref('credit_ledger_entries', lazy='dynamic'))
+    __table_args__ = (
+        db.Index('ix_credit_ledger_user_type_created', 'user_id', 'credit_type', 'created_at'),
+        db.Index('ix_credit_ledger_user_created', 'user_id', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f'<CreditLedger user_id={self.user_id} type={self.credit_type} delta={self.delta} reason={self.reason}>'
+
 # UserCredit model deleted as per instruction for baseline migration, will be defined by user-provided script
 
 # New Feature Models Start
@@ -138,7 +202,7 @@ class BrandingKit(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     linkedin_banner = db.Column(db.Text, nullable=True)  # Stores SVG or link
-    portfolio_template = db.Column(db.Text, nullable=True) # Stores HTML/CSS or link
+    portfolio_template = db.deferred(db.Column(db.Text, nullable=True), group='body') # Stores HTML/CSS or link
     elevator_pitch = db.Column(db.Text, nullable=False)
     bio = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -165,9 +229,35 @@ class SkillGap(db.Model):
     # setup_migrations.py will handle using sa.JSON() for PostgreSQL if that's configured.
     # So, defining as db.Text here is fine as a base.
     missing_skills = db.Column(db.Text, nullable=False)  # JSON stored as Text
-    resources = db.Column(db.Text, nullable=False)     # JSON stored as Text
+    resources = db.deferred(db.Column(db.Text, nullable=False), group='body')     # JSON stored as Text
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     user = db.relationship('User', backref=db.backref('skill_gaps', lazy=True))
 
 # New Feature Models End
+
+class BackgroundJob(db.Model):
+    __tablename__ = 'background_jobs'
+    id = db.Column(db.String(32), primary_key=True) # uuid4 hex, safe to expose in polling URLs
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    job_type = db.Column(db.String(50), nullable=False) # e.g., 'cover_letter_generate'
+    status = db.Column(db.String(20), nullable=False, default='queued') # queued, running, succeeded, failed
+    progress = db.Column(db.Integer, nullable=False, default=0) # 0-100
+    message = db.Column(db.String(255), nullable=True) # Human-readable progress or warning
+    result = db.Column(db.Text, nullable=True) # JSON stored as Text
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = db.relationship('User', backref=db.backref('background_jobs', lazy=True))
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+        }
@@ -0,0 +1,88 @@
+import os
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_sm')
+# Components no caller ever uses are excluded at load time to save memory in every worker
+SPACY_EXCLUDE = [c for c in os.getenv('SPACY_EXCLUDE', 'lemmatizer').split(',') if c]
+
+# Component sets callers can disable per call when they only need part of the pipeline
+NER_ONLY = ('parser', 'tagger', 'attribute_ruler', 'lemmatizer')  # doc.ents
+NO_NER = ('ner',)  # tokens, POS and noun_chunks
+
+_nlp = None
+_lock = threading.Lock()
+
+
+class DummySpacyNLP:
+    """Stand-in used when the spaCy model is missing, so analysis degrades instead of crashing."""
+    pipe_names = []
+
+    class Doc:
+        def __init__(self, text):
+            self.text = text
+            self.ents = []
+            self.noun_chunks = []
+            self.has_vector = False
+
+        def __iter__(self):
+            return iter([])
+
+        def similarity(self, other_doc):
+            return 0.0  # Default similarity
+
+    def __call__(self, text, disable=()):
+        return self.Doc(text)
+
+    def pipe(self, texts, disable=(), **kwargs):
+        return (self.Doc(text) for text in texts)
+
+
+def get_nlp():
+    """Return the process-wide spaCy pipeline, loading it on first use."""
+    global _nlp
+    if _nlp is None:
+        with _lock:
+            if _nlp is None:
+                try:
+                    import spacy
+                    _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+                    logger.info(f"Spacy model '{SPACY_MODEL}' loaded (pid {os.getpid()}, components: {_nlp.pipe_names}).")
+                except (ImportError, OSError):
+                    logger.error(f"Spacy model '{SPACY_MODEL}' not found. This model should be downloaded at application startup. NLP analysis will be impaired.")
+                    _nlp = DummySpacyNLP()
+    return _nlp
+
+
+def _active(nlp, disable):
+    return [name for name in disable if name in nlp.pipe_names]
+
+
+def process(text, disable=()):
+    """Run the shared pipeline on text, skipping the components in `disable`."""
+    nlp = get_nlp()
+    return nlp(text, disable=_active(nlp, disable))
+
+
+def process_many(texts, disable=(), batch_size=64):
+    """Run the shared pipeline over many texts with nlp.pipe; returns a list of docs in input order."""
+    nlp = get_nlp()
+    active = _active(nlp, disable)
+    if active:
+        with nlp.select_pipes(disable=active):
+            return list(nlp.pipe(texts, batch_size=batch_size))
+    return list(nlp.pipe(texts, batch_size=batch_size))
+
+
+def preload():
+    """Load the pipeline now. Called from the gunicorn master (see gunicorn.conf.py) so
+    forked workers share the model pages copy-on-write instead of each loading a copy."""
+    nlp = get_nlp()
+    try:
+        import gc
+        gc.freeze()  # Keep the GC from touching (and un-sharing) the model objects in workers
+    except AttributeError:
+        pass
+    return nlp
@@ -0,0 +1,174 @@
+import os
+import math
+import time
+import sqlite3
+import logging
+import threading
+from functools import wraps
+from flask import request, jsonify, current_app
+from flask_login import current_user
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_RATE_LIMIT_PATH = os.path.join(PROJECT_ROOT, 'instance', 'rate_limits.db')
+
+# Shared by every gunicorn worker on the host. Set RATE_LIMIT_PATH to an empty
+# string to keep counters in process memory instead (limits are then per worker).
+RATE_LIMIT_PATH = os.getenv('RATE_LIMIT_PATH', DEFAULT_RATE_LIMIT_PATH)
+RATE_LIMIT_PRUNE_EVERY = 500  # Expired rows are deleted once per this many writes
+
+
+def _sliding_count(state, now, window):
+    """Return (window_start, current_count, previous_count, estimate) for a sliding-window counter.
+
+    The estimate weights the previous fixed window by how much of it still overlaps
+    the sliding window, so only two integers per key are needed.
+    """
+    window_start = int(now // window) * window
+    current, previous = 0, 0
+    if state is not None:
+        stored_start, stored_count, stored_previous = state
+        if stored_start == window_start:
+            current, previous = stored_count, stored_previous
+        elif stored_start == window_start - window:
+            previous = stored_count
+    weight = 1 - (now - window_start) / window
+    return window_start, current, previous, previous * weight + current
+
+
+class SQLiteRateLimitStore:
+    """Sliding-window counters in a SQLite WAL table; one row per key, read and written in one transaction."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._conn_pid = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _db(self):
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:  # Never reuse a connection across fork()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')  # Losing the last counts on power loss is fine
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limits ('
+                ' key TEXT PRIMARY KEY, window_start INTEGER NOT NULL, count INTEGER NOT NULL,'
+                ' previous INTEGER NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS ix_rate_limits_expires_at ON rate_limits (expires_at)')
+            self._conn_pid = pid
+        return self._conn
+
+    def hit(self, key, limit, window, now):
+        with self._lock:
+            conn = self._db()
+            conn.execute('BEGIN IMMEDIATE')  # Serializes check-and-increment across processes
+            try:
+                state = conn.execute('SELECT window_start, count, previous FROM rate_limits WHERE key = ?', (key,)).fetchone()
+                window_start, current, previous, estimate = _sliding_count(state, now, window)
+                allowed = estimate < limit
+                if allowed:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO rate_limits (key, window_start, count, previous, expires_at) VALUES (?, ?, ?, ?, ?)',
+                        (key, window_start, current + 1, previous, window_start + 2 * window)
+                    )
+                    self._writes += 1
+                    if self._writes % RATE_LIMIT_PRUNE_EVERY == 0:
+                        conn.execute('DELETE FROM rate_limits WHERE expires_at < ?', (now,))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            return allowed, estimate
+
+    def clear(self):
+        with self._lock:
+            self._db().execute('DELETE FROM rate_limits')
+
+
+class MemoryRateLimitStore:
+    """Process-local fallback with the same semantics; expired keys are evicted as writes come in."""
+
+    def __init__(self):
+        self._state = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def hit(self, key, limit, window, now):
+        with self._lock:
+            entry = self._state.get(key)
+            window_start, current, previous, estimate = _sliding_count(entry[:3] if entry else None, now, window)
+            allowed = estimate < limit
+            if allowed:
+                self._state[key] = (window_start, current + 1, previous, window_start + 2 * window)
+                self._writes += 1
+                if self._writes % RATE_LIMIT_PRUNE_EVERY == 0:
+                    self._state = {k: v for k, v in self._state.items() if v[3] >= now}
+            return allowed, estimate
+
+    def clear(self):
+        with self._lock:
+            self._state.clear()
+
+
+class RateLimiter:
+    def __init__(self, path=RATE_LIMIT_PATH):
+        self.store = SQLiteRateLimitStore(path) if path else MemoryRateLimitStore()
+
+    def hit(self, key, limit, window):
+        """Count one request for key; returns (allowed, retry_after_seconds). Fails open on storage errors."""
+        now = time.time()
+        try:
+            allowed, _ = self.store.hit(key, limit, window, now)
+        except sqlite3.Error as e:
+            logger.error(f"Rate limiter storage error, allowing request: {e}")
+            return True, 0
+        retry_after = 0 if allowed else math.ceil(window - (now % window))
+        return allowed, retry_after
+
+
+limiter = RateLimiter()
+
+
+def _client_key():
+    return request.remote_addr or 'unknown'
+
+
+def _user_key():
+    if current_user.is_authenticated:
+        return f"user:{current_user.id}"
+    return _client_key()
+
+
+def rate_limit(limit, window=60, scope=None, per_user=False, methods=None):
+    """Decorator limiting a view to `limit` requests per `window` seconds per client IP (or per user).
+
+    `scope` names the counter (defaults to the view's name), so different views have
+    separate budgets. `methods` restricts counting to e.g. ('POST',). Disabled when
+    app.config['RATELIMIT_ENABLED'] is False, which is the default under TESTING.
+    """
+    def decorator(f):
+        counter = scope or f.__name__
+
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if methods and request.method not in methods:
+                return f(*args, **kwargs)
+            if not current_app.config.get('RATELIMIT_ENABLED', not current_app.testing):
+                return f(*args, **kwargs)
+            key = f"{counter}:{_user_key() if per_user else _client_key()}"
+            allowed, retry_after = limiter.hit(key, limit, window)
+            if not allowed:
+                response = jsonify({
+                    "error": "Too many requests",
+                    "message": f"Limit is {limit} requests per {window} seconds"
+                })
+                response.headers['Retry-After'] = str(retry_after)
+                return response, 429
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,74 @@
+import logging
+from flask import g, has_app_context, has_request_context
+from flask_login import current_user
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import joinedload
+from .extensions import db
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+class UserSnapshot:
+    """A user and all of their Credit rows, loaded together once per request."""
+
+    def __init__(self, user):
+        self.user = user
+        self.credits = {credit.credit_type: credit for credit in user.credits}
+
+    @property
+    def tier(self):
+        return self.user.tier
+
+    def credit(self, credit_type):
+        """The user's Credit row for credit_type, or None if they have none yet."""
+        return self.credits.get(credit_type)
+
+    def add_credit(self, credit):
+        self.credits[credit.credit_type] = credit
+
+
+def _load_snapshot(user_id):
+    user = db.session.execute(
+        select(User).options(joinedload(User.credits)).where(User.id == user_id)
+    ).unique().scalar_one_or_none()
+    return UserSnapshot(user) if user else None
+
+
+def user_snapshot(user_id=None):
+    """Return the UserSnapshot for user_id (default: the logged-in user), or None if there is no such user.
+
+    Inside a request the snapshot is built with one query and kept in flask.g, so
+    tier_required, the credit helpers and the views share it. Outside a request
+    (jobs, CLI) a fresh snapshot is loaded on every call.
+    """
+    if user_id is None:
+        if not current_user or not current_user.is_authenticated:
+            return None
+        user_id = current_user.id
+    if not has_request_context():
+        return _load_snapshot(user_id)
+    snapshots = g.setdefault('user_snapshots', {})
+    if user_id not in snapshots:
+        snapshots[user_id] = _load_snapshot(user_id)
+    return snapshots[user_id]
+
+
+def invalidate_user_snapshot(user_id=None):
+    if has_request_context():
+        if user_id is None:
+            g.pop('user_snapshots', None)
+        else:
+            g.get('user_snapshots', {}).pop(user_id, None)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+
+def query_count():
+    """SQL statements executed in the current app context (i.e. this request), for query-budget tests."""
+    return g.get('query_count', 0)
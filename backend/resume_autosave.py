@@ -0,0 +1,105 @@
+import json
+import logging
+from .extensions import db
+from .models import Resume
+from .json_patch import apply_json_patch, apply_merge_patch, JsonPatchError
+from .resume_revisions import record_revision, revision_content, serialize_content
+
+logger = logging.getLogger(__name__)
+
+FULL_SAVE_RETRIES = 3  # Attempts for unversioned full saves that keep losing the race to other saves
+
+PATCH_FORMATS = {
+    'json-patch': apply_json_patch,   # RFC 6902 list of operations
+    'merge-patch': apply_merge_patch,  # RFC 7396 partial document
+}
+
+
+class ResumeNotFound(LookupError):
+    pass
+
+
+class VersionConflict(Exception):
+    """The resume changed since base_version; the client must reload (or rebase) and retry."""
+
+    def __init__(self, current_version):
+        super().__init__(f"Resume is at version {current_version}")
+        self.current_version = current_version
+
+
+def _load(resume_id, user_id):
+    row = db.session.execute(
+        db.select(Resume.content, Resume.version).where(Resume.id == resume_id, Resume.user_id == user_id)
+    ).one_or_none()
+    if row is None:
+        raise ResumeNotFound(f"Resume {resume_id} not found")
+    return row
+
+
+def _write(resume_id, user_id, base_version, previous_content, content, title=None):
+    values = {'content': content, 'version': Resume.version + 1}
+    if title:
+        values['title'] = title
+    result = db.session.execute(
+        db.update(Resume)
+        .where(Resume.id == resume_id, Resume.user_id == user_id, Resume.version == base_version)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        # Another save committed between our read and our write
+        current = db.session.execute(db.select(Resume.version).where(Resume.id == resume_id)).scalar()
+        raise VersionConflict(current)
+    record_revision(resume_id, base_version + 1, content, previous_content=previous_content)
+    return base_version + 1
+
+
+def patch_resume(resume_id, user_id, base_version, patch, patch_format='json-patch', title=None):
+    """Apply a patch to a resume's content if it is still at base_version; returns the new version.
+
+    The write is a conditional UPDATE ... WHERE version = base_version, so of two
+    concurrent saves from the same base only one wins and the other gets
+    VersionConflict. Raises ResumeNotFound, VersionConflict or JsonPatchError.
+    Like credit_service.consume, the caller commits.
+    """
+    if patch_format not in PATCH_FORMATS:
+        raise JsonPatchError(f"Unknown patch format '{patch_format}' (expected one of {', '.join(PATCH_FORMATS)})")
+    row = _load(resume_id, user_id)
+    if row.version != base_version:
+        raise VersionConflict(row.version)
+    try:
+        doc = json.loads(row.content)
+    except json.JSONDecodeError:
+        raise JsonPatchError("Stored content is not JSON; send a full save instead")
+    content = serialize_content(PATCH_FORMATS[patch_format](doc, patch))
+    return _write(resume_id, user_id, base_version, row.content, content, title=title)
+
+
+def save_content(resume_id, user_id, content, title=None, base_version=None):
+    """Replace a resume's whole content; returns the new version.
+
+    With base_version this is the same conditional write as patch_resume, so a full
+    save can never overwrite a save it has not seen. Without one (older clients) it
+    overwrites whatever is current, re-reading and retrying if another save lands
+    between the read and the write. Raises ResumeNotFound or VersionConflict. The caller commits.
+    """
+    for _ in range(FULL_SAVE_RETRIES):
+        row = _load(resume_id, user_id)
+        if base_version is not None and row.version != base_version:
+            raise VersionConflict(row.version)
+        try:
+            return _write(resume_id, user_id, row.version, row.content, content, title=title)
+        except VersionConflict:
+            if base_version is not None:
+                raise
+    raise VersionConflict(_load(resume_id, user_id).version)
+
+
+def restore_revision(resume_id, user_id, version):
+    """Save the content of an earlier revision as a new version (undo); returns the new version.
+
+    Raises ResumeNotFound, resume_revisions.RevisionNotFound or VersionConflict. The caller commits.
+    """
+    row = _load(resume_id, user_id)
+    content = revision_content(resume_id, version)
+    return _write(resume_id, user_id, row.version, row.content, content)
@@ -2,8 +2,14 @@ import logging
 import json # For handling JSON data
 from flask import render_template, redirect, url_for, flash, request, jsonify # Added jsonify
 from flask_login import login_required, current_user
-from backend.models import Resume, Credit
+from backend.models import Resume
 from backend.extensions import db
+from backend.rate_limiter import rate_limit
+from backend import credit_service
+from backend.json_patch import JsonPatchError
+from backend.resume_autosave import patch_resume, save_content, restore_revision, ResumeNotFound, VersionConflict
+from backend.resume_revisions import record_revision, list_revisions, revision_content, schedule_compaction_if_due, RevisionNotFound
+from backend.request_context import user_snapshot
 from . import bp
 from .forms import ResumeForm
 
@@ -14,7 +20,7 @@ logger = logging.getLogger(__name__)
 @login_required
 def index():
     """Displays a list of the user's resumes."""
-    resumes = Resume.query.filter_by(user_id=current_user.id, is_archived=False).order_by(Resume.updated_at.desc()).all()
+    resumes = Resume.list_query(current_user.id).order_by(Resume.updated_at.desc()).all()
     return render_template('resume_builder/my_resumes.html', resumes=resumes)
 
 @bp.route('/create', methods=['GET', 'POST'])
@@ -23,14 +29,14 @@ def create():
     """DEPRECATED: Handles creation of a new resume via the old form.
     New resumes should be created via the formatter UI and /create_new_formatter route."""
     form = ResumeForm()
-    user_credit = Credit.query.filter_by(user_id=current_user.id, credit_type='legacy').first()
+    user_credit = user_snapshot().credit('legacy')
 
     if not user_credit or user_credit.amount <= 0:
         flash('You do not have enough credits to create a new resume. Please purchase more credits.', 'warning')
         return redirect(url_for('resume_builder.index'))
 
     if form.validate_on_submit():
-        if not user_credit or user_credit.amount <= 0: # Re-check credits
+        if not credit_service.consume(current_user.id, credit_service.CREDIT_TYPE_LEGACY, reason='resume_create'): # Re-check and spend atomically
              flash('Credit check failed upon submission. Please ensure you have enough credits.', 'warning')
              return redirect(url_for('resume_builder.index'))
 
@@ -51,9 +57,7 @@ def create():
             title=form.title.data,
             content=content_data # Save as JSON string
         )
-        user_credit.amount -= 1
         db.session.add(new_resume)
-        db.session.add(user_credit)
         try:
             db.session.commit()
             flash('Resume created successfully using the old form! Consider using the new editor for more features.', 'success')
@@ -73,7 +77,7 @@ def create():
 @login_required
 def create_new_formatter():
     """Renders the new AI resume formatter for creating a new resume."""
-    user_credit = Credit.query.filter_by(user_id=current_user.id, credit_type='legacy').first()
+    user_credit = user_snapshot().credit('legacy')
     if not user_credit or user_credit.amount <= 0:
         flash('You do not have enough credits to create a new resume. Please purchase more credits.', 'warning')
         return redirect(url_for('resume_builder.index'))
@@ -111,7 +115,7 @@ def create_new_formatter():
 @login_required
 def edit_formatter(resume_id):
     """Renders the new AI resume formatter for editing an existing resume."""
-    resume = Resume.query.filter_by(id=resume_id, user_id=current_user.id, is_archived=False).first()
+    resume = Resume.query.options(db.undefer_group('body')).filter_by(id=resume_id, user_id=current_user.id, is_archived=False).first()
     if not resume:
         flash('Resume not found or you do not have permission to edit it.', 'danger')
         return redirect(url_for('resume_builder.index'))
@@ -120,10 +124,12 @@ def edit_formatter(resume_id):
     return render_template('resume_builder/formatter.html',
                            resume_title=resume.title,
                            resume_content_json=resume.content, # Pass as JSON string
-                           resume_id=resume.id)
+                           resume_id=resume.id,
+                           resume_version=resume.version)
 
 @bp.route('/formatter/save_resume_data', methods=['POST'])
 @login_required
+@rate_limit(30, 60, per_user=True) # Autosave calls this often; this only stops runaway clients
 def save_resume_data():
     """API endpoint to save resume data from the new formatter."""
     data = request.get_json()
@@ -144,35 +150,129 @@ def save_resume_data():
         return jsonify({"success": False, "error": "Content is not valid JSON."}), 400
 
     if resume_id: # Editing an existing resume
-        resume = Resume.query.filter_by(id=resume_id, user_id=current_user.id).first()
-        if not resume:
+        # A full save may also name the version it started from; without one it overwrites as before
+        try:
+            version = save_content(resume_id, current_user.id, content_json_str, title, base_version=data.get('version'))
+            db.session.commit()
+        except ResumeNotFound:
             return jsonify({"success": False, "error": "Resume not found or permission denied."}), 404
-
-        resume.title = title
-        resume.content = content_json_str # Store as JSON string
-        message = "Resume updated successfully!"
+        except VersionConflict as e:
+            db.session.rollback()
+            return jsonify({"success": False, "error": "Resume was changed elsewhere. Reload to get the latest version.",
+                            "version": e.current_version}), 409
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error saving resume data: {str(e)}", exc_info=True)
+            return jsonify({"success": False, "error": f"Database error: {str(e)}"}), 500
+        schedule_compaction_if_due(current_user.id, resume_id, version)
+        return jsonify({"success": True, "resume_id": resume_id, "version": version,
+                        "message": "Resume updated successfully!"}), 200
     else: # Creating a new resume
-        user_credit = Credit.query.filter_by(user_id=current_user.id, credit_type='legacy').first()
-        if not user_credit or user_credit.amount <= 0:
+        # Check and spend in one UPDATE; committed below together with the new resume
+        if not credit_service.consume(current_user.id, credit_service.CREDIT_TYPE_LEGACY, reason='resume_create'):
             return jsonify({"success": False, "error": "Insufficient credits to create a new resume."}), 403
 
         resume = Resume(
             user_id=current_user.id,
             title=title,
-            content=content_json_str # Store as JSON string
+            content=content_json_str, # Store as JSON string
+            version=1
         )
         db.session.add(resume)
-        user_credit.amount -= 1
-        db.session.add(user_credit)
         message = "Resume created successfully!"
 
     try:
+        db.session.flush() # Assigns the id for the revision record
+        record_revision(resume.id, resume.version, content_json_str)
         db.session.commit()
-        return jsonify({"success": True, "resume_id": resume.id, "message": message}), 200
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error saving resume data: {str(e)}", exc_info=True)
         return jsonify({"success": False, "error": f"Database error: {str(e)}"}), 500
+    schedule_compaction_if_due(current_user.id, resume.id, resume.version)
+    return jsonify({"success": True, "resume_id": resume.id, "version": resume.version, "message": message}), 200
+
+@bp.route('/formatter/resume/<int:resume_id>/patch', methods=['POST', 'PATCH'])
+@login_required
+@rate_limit(30, 60, per_user=True)
+def patch_resume_data(resume_id):
+    """Incremental save: applies a JSON Patch (RFC 6902) or merge patch (RFC 7396) to the stored content.
+
+    Body: {"version": <base version>, "patch": ..., "format": "json-patch"|"merge-patch", "title": optional}.
+    Returns the new version, or 409 with the current one if the resume changed since the base version.
+    """
+    data = request.get_json(silent=True)
+    if not data or 'patch' not in data or not isinstance(data.get('version'), int):
+        return jsonify({"success": False, "error": "A patch and the base version are required."}), 400
+
+    try:
+        version = patch_resume(resume_id, current_user.id, data['version'], data['patch'],
+                               patch_format=data.get('format', 'json-patch'), title=data.get('title'))
+        db.session.commit()
+    except ResumeNotFound:
+        return jsonify({"success": False, "error": "Resume not found or permission denied."}), 404
+    except VersionConflict as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": "Resume was changed elsewhere. Reload to get the latest version.",
+                        "version": e.current_version}), 409
+    except JsonPatchError as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": f"Invalid patch: {e}"}), 400
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error patching resume {resume_id}: {str(e)}", exc_info=True)
+        return jsonify({"success": False, "error": f"Database error: {str(e)}"}), 500
+    schedule_compaction_if_due(current_user.id, resume_id, version)
+    return jsonify({"success": True, "resume_id": resume_id, "version": version}), 200
+
+@bp.route('/formatter/resume/<int:resume_id>/revisions', methods=['GET'])
+@login_required
+def resume_revisions(resume_id):
+    """Lists a resume's saved revisions (newest first) for the history/undo UI."""
+    if not Resume.query.filter_by(id=resume_id, user_id=current_user.id).first():
+        return jsonify({"success": False, "error": "Resume not found or permission denied."}), 404
+    revisions = [
+        {"version": r.version, "kind": r.kind, "size": r.content_size, "created_at": r.created_at.isoformat()}
+        for r in list_revisions(resume_id)
+    ]
+    return jsonify({"success": True, "revisions": revisions}), 200
+
+@bp.route('/formatter/resume/<int:resume_id>/revisions/<int:version>', methods=['GET'])
+@login_required
+def resume_revision(resume_id, version):
+    """Returns the content of one revision."""
+    if not Resume.query.filter_by(id=resume_id, user_id=current_user.id).first():
+        return jsonify({"success": False, "error": "Resume not found or permission denied."}), 404
+    try:
+        content = revision_content(resume_id, version)
+    except RevisionNotFound:
+        return jsonify({"success": False, "error": "Revision not found."}), 404
+    return jsonify({"success": True, "version": version, "content": content}), 200
+
+@bp.route('/formatter/resume/<int:resume_id>/revisions/<int:version>/restore', methods=['POST'])
+@login_required
+@rate_limit(30, 60, per_user=True)
+def restore_resume_revision(resume_id, version):
+    """Undo: saves an earlier revision's content as the newest version."""
+    try:
+        new_version = restore_revision(resume_id, current_user.id, version)
+        db.session.commit()
+    except ResumeNotFound:
+        return jsonify({"success": False, "error": "Resume not found or permission denied."}), 404
+    except RevisionNotFound:
+        db.session.rollback()
+        return jsonify({"success": False, "error": "Revision not found."}), 404
+    except VersionConflict as e:
+        db.session.rollback()
+        return jsonify({"success": False, "error": "Resume was changed elsewhere. Reload to get the latest version.",
+                        "version": e.current_version}), 409
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error restoring revision {version} of resume {resume_id}: {str(e)}", exc_info=True)
+        return jsonify({"success": False, "error": f"Database error: {str(e)}"}), 500
+    schedule_compaction_if_due(current_user.id, resume_id, new_version)
+    return jsonify({"success": True, "resume_id": resume_id, "version": new_version,
+                    "message": f"Restored version {version}."}), 200
 
 # Note on old routes like preview_resume, delete_resume, etc.
 # These were not in the provided simplified routes.py.
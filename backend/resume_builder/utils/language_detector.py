@@ -0,0 +1,101 @@
+import os
+import re
+import json
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Precomputed trigram log-probabilities for the Latin-script SUPPORTED_LANGUAGES.
+# Derived from the langdetect (Apache 2.0) Wikipedia profiles: trigram counts are
+# lower-cased and merged, the top N per language are kept and stored as
+# log(count / total_trigrams) rounded to 2 decimals.
+PROFILES_PATH = os.path.join(os.path.dirname(__file__), 'language_profiles.json')
+
+# Unicode script ranges used to pick non-Latin languages without any n-gram scoring
+_SCRIPTS = (
+    ('kana', re.compile(r'[\u3040-\u30ff\u31f0-\u31ff\uff66-\uff9f]')),
+    ('han', re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')),
+    ('cyrillic', re.compile(r'[\u0400-\u04ff]')),
+    ('arabic', re.compile(r'[\u0600-\u06ff\u0750-\u077f\ufb50-\ufdff\ufe70-\ufeff]')),
+    ('devanagari', re.compile(r'[\u0900-\u097f]')),
+    ('latin', re.compile(r'[a-zA-Z\u00c0-\u024f]')),
+)
+_SCRIPT_LANGUAGE = {'han': 'zh', 'cyrillic': 'ru', 'arabic': 'ar', 'devanagari': 'hi'}
+_NON_LETTERS = re.compile(r"[^a-z\u00c0-\u024f]+")
+MAX_DETECT_CHARS = 1000  # A prefix is plenty to identify the language and keeps detection O(1) for long resumes
+
+_languages = None
+_table = None
+_floors = None
+
+
+def _load_profiles():
+    """Load the table once and merge it into {trigram: (logprob per language)} for one lookup per trigram."""
+    global _languages, _table, _floors
+    if _table is None:
+        with open(PROFILES_PATH, encoding='utf-8') as f:
+            profiles = json.load(f)['profiles']
+        languages = sorted(profiles)
+        # Trigrams outside a language's top-N table get a probability just below its rarest entry
+        floors = tuple(min(profiles[lang].values()) - 1.0 for lang in languages)
+        grams = set().union(*(profiles[lang] for lang in languages))
+        _table = {gram: tuple(profiles[lang].get(gram, floors[i]) for i, lang in enumerate(languages)) for gram in grams}
+        _languages, _floors = languages, floors
+    return _table
+
+
+def _script_counts(text):
+    return {name: len(pattern.findall(text)) for name, pattern in _SCRIPTS}
+
+
+def _score_latin(text):
+    """Return {lang: probability} for the Latin-script languages using trigram log-likelihoods."""
+    table = _load_profiles()
+    words = _NON_LETTERS.sub(' ', text.lower()).split()
+    scores = [0.0] * len(_languages)
+    trigram_count = 0
+    for word in words:
+        padded = f' {word} '
+        for i in range(len(padded) - 2):
+            trigram_count += 1
+            for j, logprob in enumerate(table.get(padded[i:i + 3], _floors)):
+                scores[j] += logprob
+    if not trigram_count:
+        return {}
+    best = max(scores)
+    # Softmax over the log-likelihoods gives a posterior with a uniform prior
+    weights = [math.exp(score - best) for score in scores]
+    total = sum(weights)
+    return {lang: weight / total for lang, weight in zip(_languages, weights)}
+
+
+def detect(text):
+    """Return (language_code, confidence) for text, without any network call.
+
+    Non-Latin scripts map straight to zh/ja/ru/ar/hi; Latin text is scored
+    against en/es/fr/de/pt trigram profiles. Confidence is in [0, 1]; empty or
+    letterless input returns ('en', 0.0).
+    """
+    if not text or not text.strip():
+        return 'en', 0.0
+    text = text[:MAX_DETECT_CHARS]
+    counts = _script_counts(text)
+    letters = sum(counts.values())
+    if not letters:
+        return 'en', 0.0
+
+    # Japanese mixes kana and kanji; any meaningful kana share means ja, not zh
+    cjk = counts['kana'] + counts['han']
+    if cjk and counts['kana'] >= 0.1 * cjk and cjk >= counts['latin']:
+        return 'ja', round(cjk / letters, 3)
+
+    script = max((name for name in counts if name != 'kana'), key=lambda name: counts[name])
+    if script in _SCRIPT_LANGUAGE:
+        return _SCRIPT_LANGUAGE[script], round(counts[script] / letters, 3)
+
+    probabilities = _score_latin(text)
+    if not probabilities:
+        return 'en', 0.0
+    lang = max(probabilities, key=probabilities.get)
+    return lang, round(probabilities[lang] * counts['latin'] / letters, 3)
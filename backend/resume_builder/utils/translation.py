@@ -1,11 +1,22 @@
-import requests
-import json
 import os
+import re
+import copy
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from backend import llm_client
+from .translation_memory import translation_memory
+from . import language_detector
 
 logger = logging.getLogger(__name__)
-MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
-MISTRAL_API_URL = os.getenv("MISTRAL_API_URL", "https://api.mistral.ai/v1/chat/completions")
+
+# Document translation tuning
+TRANSLATION_MAX_WORKERS = int(os.getenv("TRANSLATION_MAX_WORKERS", 6))  # Concurrent Mistral calls per document
+SMALL_FIELD_CHARS = int(os.getenv("TRANSLATION_SMALL_FIELD_CHARS", 200))  # Shorter fields are batched into one prompt
+
+# Language detection runs locally; set LANGUAGE_DETECTION_LLM_FALLBACK=1 to ask Mistral when unsure
+LANGUAGE_DETECTION_LLM_FALLBACK = os.getenv("LANGUAGE_DETECTION_LLM_FALLBACK", "0") == "1"
+LANGUAGE_DETECTION_MIN_CONFIDENCE = float(os.getenv("LANGUAGE_DETECTION_MIN_CONFIDENCE", 0.8))
 
 SUPPORTED_LANGUAGES = {
     'en': 'English',
@@ -21,72 +32,163 @@ SUPPORTED_LANGUAGES = {
 }
 
 def detect_language(text):
-    """Detect language of input text using Mistral"""
-    if not MISTRAL_API_KEY:
-        logger.warning("Mistral API key not configured. Cannot detect language. Defaulting to 'en'.")
-        return 'en'
+    """Detect language of input text locally; Mistral is only asked for low-confidence input when enabled"""
     if not text.strip():
         return 'en'
+    lang_code, confidence = language_detector.detect(text)
+    if confidence < LANGUAGE_DETECTION_MIN_CONFIDENCE and LANGUAGE_DETECTION_LLM_FALLBACK and llm_client.is_configured():
+        logger.info(f"Local language detection unsure ({lang_code}, confidence {confidence}). Asking Mistral.")
+        return _detect_language_llm(text, default=lang_code)
+    return lang_code
+
+def _detect_language_llm(text, default='en'):
+    """Detect language of input text using Mistral"""
+    if not llm_client.is_configured():
+        logger.warning(f"Mistral API key not configured. Cannot detect language. Defaulting to '{default}'.")
+        return default
     
     prompt = f"Detect the language of this text: '{text}'. Return only the ISO 639-1 language code."
     
     try:
-        response = requests.post(
-            MISTRAL_API_URL,
-            headers={
-                "Authorization": f"Bearer {MISTRAL_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "mistral-large-latest",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.2,
-                "max_tokens": 10
-            },
-            timeout=15
-        )
-        response.raise_for_status()
-        lang_code = response.json()["choices"][0]["message"]["content"].strip().lower()
-        return lang_code if lang_code in SUPPORTED_LANGUAGES else 'en'
+        lang_code = llm_client.chat_completion(prompt, temperature=0.2, max_tokens=10, timeout=15).lower()
+        return lang_code if lang_code in SUPPORTED_LANGUAGES else default
     except Exception as e:
         logger.error(f"Language detection error: {str(e)}", exc_info=True)
-        return 'en' # Fallback to English
+        return default # Fallback to the local guess
 
 def translate_text(text, target_lang='en', source_lang=None):
     """Translate text to target language"""
-    if not MISTRAL_API_KEY:
-        logger.warning("Mistral API key not configured. Cannot translate text. Returning original text.")
-        return text
     if not text.strip():
         return text
         
     if source_lang and source_lang == target_lang:
         return text
+
+    # Fixed section headings are already translated, no lookup needed
+    heading = _section_title_translation(text, target_lang)
+    if heading:
+        return heading
+
+    cached = translation_memory.get(text, source_lang, target_lang)
+    if cached is not None:
+        return cached
+
+    if not llm_client.is_configured():
+        logger.warning("Mistral API key not configured. Cannot translate text. Returning original text.")
+        return text
         
     prompt = (f"Translate the following text to {SUPPORTED_LANGUAGES.get(target_lang, 'English')} "
               f"({target_lang}). Maintain professional tone suitable for a resume:\n\n{text}")
     
     try:
-        response = requests.post(
-            MISTRAL_API_URL,
-            headers={
-                "Authorization": f"Bearer {MISTRAL_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "mistral-large-latest",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.4,
-                "max_tokens": 2000
-            },
-            timeout=30
-        )
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"].strip()
+        translated = llm_client.chat_completion(prompt, temperature=0.4, max_tokens=2000, timeout=30)
+        translation_memory.put(text, source_lang, target_lang, translated)
+        return translated
     except Exception as e:
         logger.error(f"Translation error: {str(e)}")
         return text
 
+def _translate_batch(texts, target_lang, source_lang=None):
+    """Translate a list of short strings with a single Mistral call; falls back to one call per string"""
+    prompt = (f"Translate each string in the following JSON array to {SUPPORTED_LANGUAGES.get(target_lang, 'English')} "
+              f"({target_lang}). Maintain professional tone suitable for a resume. Return only a JSON array of the "
+              f"translated strings, in the same order and with the same length:\n\n{json.dumps(texts, ensure_ascii=False)}")
+    try:
+        reply = llm_client.chat_completion(prompt, temperature=0.2, max_tokens=min(4000, 200 + sum(len(t) for t in texts)), timeout=30)
+        reply = re.sub(r'^```(?:json)?\s*|\s*```$', '', reply.strip())
+        translated = json.loads(reply)
+        if isinstance(translated, list) and len(translated) == len(texts) and all(isinstance(t, str) for t in translated):
+            for text, result in zip(texts, translated):
+                translation_memory.put(text, source_lang, target_lang, result)
+            return translated
+        logger.warning(f"Batch translation returned {len(translated) if isinstance(translated, list) else type(translated).__name__} items for {len(texts)} inputs. Translating one by one.")
+    except Exception as e:
+        logger.error(f"Batch translation error: {str(e)}. Translating one by one.")
+    return [translate_text(text, target_lang, source_lang) for text in texts]
+
+def _collect_resume_fields(content):
+    """Return (path, text) pairs for the translatable fields of the formatter JSON structure.
+    Names, contact details, dates, institutions and technical skill names are left as is."""
+    fields = []
+    def add(path, value):
+        if isinstance(value, str) and value.strip():
+            fields.append((path, value))
+
+    personal = content.get('personal') or {}
+    for key in ('job_title', 'location'):
+        add(('personal', key), personal.get(key))
+    add(('summary',), content.get('summary'))
+    for i, exp in enumerate(content.get('experiences') or []):
+        for key in ('job_title', 'location'):
+            add(('experiences', i, key), exp.get(key))
+        achievements = exp.get('achievements')
+        if isinstance(achievements, list):
+            # One field per experience keeps related bullet points in the same prompt
+            add(('experiences', i, 'achievements'), '\n'.join(a for a in achievements if isinstance(a, str) and a.strip()))
+        else:
+            add(('experiences', i, 'achievements'), achievements)
+    for i, edu in enumerate(content.get('education') or []):
+        for key in ('degree', 'field_of_study'):
+            add(('education', i, key), edu.get(key))
+    for i, skill in enumerate((content.get('skills') or {}).get('soft_skills') or []):
+        add(('skills', 'soft_skills', i), skill)
+    additional = content.get('additional') or {}
+    for key in ('projects', 'languages', 'volunteer'):
+        add(('additional', key), additional.get(key))
+    return fields
+
+def _set_path(content, path, value):
+    target = content
+    for key in path[:-1]:
+        target = target[key]
+    if path[-1] == 'achievements' and isinstance(target.get('achievements'), list):
+        value = [line.strip() for line in value.split('\n') if line.strip()]
+    target[path[-1]] = value
+
+def translate_resume_document(content_json, target_lang, source_lang=None):
+    """Translate a formatter resume document (JSON string or dict) to target_lang.
+
+    Cached strings are filled in first. Remaining short fields are sent together
+    in one batched prompt while longer fields run concurrently on a bounded thread
+    pool, so a whole resume costs roughly one Mistral round trip. Returns the same
+    type that was passed in.
+    """
+    is_str = isinstance(content_json, str)
+    content = copy.deepcopy(json.loads(content_json) if is_str else content_json)
+    if target_lang not in SUPPORTED_LANGUAGES or (source_lang and source_lang == target_lang):
+        return content_json
+
+    fields = _collect_resume_fields(content)
+    pending = []
+    for path, text in fields:
+        cached = _section_title_translation(text, target_lang) or translation_memory.get(text, source_lang, target_lang)
+        if cached is not None:
+            _set_path(content, path, cached)
+        else:
+            pending.append((path, text))
+
+    cached_count = len(fields) - len(pending)
+    if pending and not llm_client.is_configured():
+        logger.warning("Mistral API key not configured. Untranslated resume fields are returned as is.")
+        pending = []
+
+    small = [(path, text) for path, text in pending if len(text) < SMALL_FIELD_CHARS]
+    large = [(path, text) for path, text in pending if len(text) >= SMALL_FIELD_CHARS]
+
+    if small or large:
+        with ThreadPoolExecutor(max_workers=max(1, min(TRANSLATION_MAX_WORKERS, len(large) + 1))) as pool:
+            batch_future = pool.submit(_translate_batch, [text for _, text in small], target_lang, source_lang) if small else None
+            large_futures = [(path, pool.submit(translate_text, text, target_lang, source_lang)) for path, text in large]
+            if batch_future:
+                for (path, _), translated in zip(small, batch_future.result()):
+                    _set_path(content, path, translated)
+            for path, future in large_futures:  # Reassembled in document order
+                _set_path(content, path, future.result())
+
+    logger.info(f"Translated resume document to {target_lang}: {len(small)} batched, {len(large)} parallel, "
+                f"{cached_count} from cache")
+    return json.dumps(content, ensure_ascii=False) if is_str else content
+
 SECTION_TITLES = {
     'en': {
         'summary': 'Professional Summary',
@@ -161,3 +263,12 @@ SECTION_TITLES = {
         'create_another': '別の履歴書を作成'
     }
 }
+
+def _section_title_translation(text, target_lang):
+    """Return the built-in translation if text is one of the English SECTION_TITLES"""
+    if target_lang not in SECTION_TITLES:
+        return None
+    for key, title in SECTION_TITLES['en'].items():
+        if text.strip() == title:
+            return SECTION_TITLES[target_lang][key]
+    return None
@@ -0,0 +1,146 @@
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+DEFAULT_TM_PATH = os.path.join(PROJECT_ROOT, 'instance', 'translation_memory.db')
+
+# Set TRANSLATION_MEMORY_PATH to an empty string to run with the in-process LRU only
+TRANSLATION_MEMORY_PATH = os.getenv('TRANSLATION_MEMORY_PATH', DEFAULT_TM_PATH)
+TRANSLATION_MEMORY_LRU_SIZE = int(os.getenv('TRANSLATION_MEMORY_LRU_SIZE', 2000))  # Entries kept in memory
+TRANSLATION_MEMORY_MAX_ROWS = int(os.getenv('TRANSLATION_MEMORY_MAX_ROWS', 100000))  # Rows kept on disk
+
+
+def make_key(text, source_lang, target_lang):
+    """Content hash plus language pair. source_lang None means 'auto-detected'."""
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return f"{digest}:{source_lang or 'auto'}:{target_lang}"
+
+
+class TranslationMemory:
+    """Two-tier translation cache: an in-process LRU in front of a SQLite table."""
+
+    def __init__(self, path=TRANSLATION_MEMORY_PATH, lru_size=TRANSLATION_MEMORY_LRU_SIZE,
+                 max_rows=TRANSLATION_MEMORY_MAX_ROWS):
+        self.path = path
+        self.lru_size = lru_size
+        self.max_rows = max_rows
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._writes_since_prune = 0
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+
+    # --- persistent tier ---
+
+    def _db(self):
+        if not self.path:
+            return None
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:  # Never reuse a connection across fork()
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                self._conn.execute('PRAGMA journal_mode=WAL')
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS translation_memory ('
+                    ' key TEXT PRIMARY KEY, translated TEXT NOT NULL, last_used REAL NOT NULL)'
+                )
+                self._conn.execute('CREATE INDEX IF NOT EXISTS ix_tm_last_used ON translation_memory (last_used)')
+                self._conn.commit()
+                self._conn_pid = pid
+            except sqlite3.Error as e:
+                logger.error(f"Translation memory disabled, cannot open {self.path}: {e}")
+                self.path = None
+                self._conn = None
+                return None
+        return self._conn
+
+    def _prune_disk(self, conn):
+        count = conn.execute('SELECT COUNT(*) FROM translation_memory').fetchone()[0]
+        excess = count - self.max_rows
+        if excess > 0:
+            conn.execute(
+                'DELETE FROM translation_memory WHERE key IN '
+                '(SELECT key FROM translation_memory ORDER BY last_used LIMIT ?)', (excess,)
+            )
+            self.stats['disk_evictions'] += excess
+
+    # --- in-process tier ---
+
+    def _remember(self, key, value):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    # --- public API ---
+
+    def get(self, text, source_lang, target_lang):
+        """Return the cached translation or None."""
+        key = make_key(text, source_lang, target_lang)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._lru[key]
+            conn = self._db()
+            if conn is not None:
+                try:
+                    row = conn.execute('SELECT translated FROM translation_memory WHERE key = ?', (key,)).fetchone()
+                    if row:
+                        conn.execute('UPDATE translation_memory SET last_used = ? WHERE key = ?', (time.time(), key))
+                        conn.commit()
+                        self._remember(key, row[0])
+                        self.stats['hits'] += 1
+                        self.stats['disk_hits'] += 1
+                        return row[0]
+                except sqlite3.Error as e:
+                    logger.error(f"Translation memory read error: {e}")
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, text, source_lang, target_lang, translated):
+        key = make_key(text, source_lang, target_lang)
+        with self._lock:
+            self._remember(key, translated)
+            conn = self._db()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO translation_memory (key, translated, last_used) VALUES (?, ?, ?)',
+                    (key, translated, time.time())
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= 100:  # Amortize the COUNT(*) over many writes
+                    self._prune_disk(conn)
+                    self._writes_since_prune = 0
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Translation memory write error: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            conn = self._db()
+            if conn is not None:
+                conn.execute('DELETE FROM translation_memory')
+                conn.commit()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(self.stats, lru_entries=len(self._lru),
+                        hit_rate=round(self.stats['hits'] / lookups, 3) if lookups else 0.0)
+
+
+translation_memory = TranslationMemory()
@@ -0,0 +1,224 @@
+import os
+import json
+import zlib
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from .extensions import db
+from .models import ResumeRevision
+from .json_patch import apply_json_patch, make_json_patch
+from .job_queue import job_queue
+
+logger = logging.getLogger(__name__)
+
+REVISION_SNAPSHOT_INTERVAL = int(os.getenv('REVISION_SNAPSHOT_INTERVAL', 20))  # Most deltas applied to rebuild any revision
+REVISION_KEEP_ALL_DAYS = int(os.getenv('REVISION_KEEP_ALL_DAYS', 7))  # Every revision is kept this long
+REVISION_RETENTION_DAYS = int(os.getenv('REVISION_RETENTION_DAYS', 90))  # Then the last one of each day until this age; 0 never drops those
+REVISION_COMPACT_EVERY = int(os.getenv('REVISION_COMPACT_EVERY', 100))  # Saves between background compactions of a resume; 0 disables
+
+SNAPSHOT = 'snapshot'
+DELTA = 'delta'
+JOB_TYPE = 'revision_compaction'
+
+
+class RevisionNotFound(LookupError):
+    pass
+
+
+def serialize_content(doc):
+    # Same compact form as JSON.stringify in formatter.js
+    return json.dumps(doc, separators=(',', ':'), ensure_ascii=False)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _pack(text):
+    return zlib.compress(text.encode('utf-8'))
+
+
+def _unpack(payload):
+    return zlib.decompress(payload).decode('utf-8')
+
+
+def _encode(previous_content, content, allow_delta=True):
+    """(kind, body) to store for content: a JSON Patch from previous_content when that is
+    smaller and reproduces content byte for byte, otherwise the full content."""
+    if allow_delta and previous_content is not None:
+        try:
+            before, after = json.loads(previous_content), json.loads(content)
+        except (TypeError, ValueError):
+            return SNAPSHOT, content  # Legacy plain-text resumes are always stored whole
+        patch = make_json_patch(before, after)
+        delta = serialize_content(patch)
+        if len(delta) * 2 <= len(content) and serialize_content(apply_json_patch(before, patch)) == content:
+            return DELTA, delta
+    return SNAPSHOT, content
+
+
+def record_revision(resume_id, version, content, previous_content=None):
+    """Store the content saved as `version`; call in the same transaction as the save.
+
+    previous_content is the resume's content before this save (version - 1). Only when
+    the stored revision version - 1 has exactly that content (checked by hash) and the
+    delta chain is shorter than REVISION_SNAPSHOT_INTERVAL is a compressed delta from
+    it written; otherwise the revision is a snapshot, so a save that raced another
+    can never chain a delta onto the wrong base.
+    """
+    recent = db.session.execute(
+        db.select(ResumeRevision.version, ResumeRevision.kind, ResumeRevision.content_hash)
+        .where(ResumeRevision.resume_id == resume_id)
+        .order_by(ResumeRevision.version.desc())
+        .limit(REVISION_SNAPSHOT_INTERVAL)
+    ).all()
+    if not recent and previous_content is not None and version > 1:
+        # First save since history started: keep what it replaces too, so it can be undone
+        db.session.add(ResumeRevision(resume_id=resume_id, version=version - 1, kind=SNAPSHOT,
+                                      payload=_pack(previous_content), content_size=len(previous_content),
+                                      content_hash=content_hash(previous_content)))
+        recent = [(version - 1, SNAPSHOT, content_hash(previous_content))]
+    chained = (
+        bool(recent) and previous_content is not None
+        and recent[0][0] == version - 1 and recent[0][2] == content_hash(previous_content)
+        and any(kind == SNAPSHOT for _, kind, _ in recent)
+    )
+    kind, body = _encode(previous_content, content, allow_delta=chained)
+    db.session.add(ResumeRevision(resume_id=resume_id, version=version, kind=kind,
+                                  payload=_pack(body), content_size=len(content), content_hash=content_hash(content)))
+
+
+def _replay(rows, wanted=None):
+    """Yield (version, content) for rows in version order, applying deltas forward from the snapshots."""
+    text, doc = None, None
+    for row in rows:
+        body = _unpack(row.payload)
+        if row.kind == SNAPSHOT:
+            text, doc = body, None
+        else:
+            if text is None and doc is None:
+                raise RevisionNotFound(f"Revision {row.version} has no snapshot before it")
+            doc = apply_json_patch(doc if doc is not None else json.loads(text), json.loads(body))
+            text = None
+        if wanted is None or row.version in wanted:
+            yield row.version, text if text is not None else serialize_content(doc)
+
+
+def revision_content(resume_id, version):
+    """Reconstruct the content of one revision: its nearest snapshot plus at most REVISION_SNAPSHOT_INTERVAL deltas."""
+    base = db.session.execute(
+        db.select(db.func.max(ResumeRevision.version))
+        .where(ResumeRevision.resume_id == resume_id, ResumeRevision.version <= version, ResumeRevision.kind == SNAPSHOT)
+    ).scalar()
+    if base is None:
+        raise RevisionNotFound(f"Resume {resume_id} has no revision {version}")
+    rows = db.session.execute(
+        db.select(ResumeRevision.version, ResumeRevision.kind, ResumeRevision.payload)
+        .where(ResumeRevision.resume_id == resume_id, ResumeRevision.version.between(base, version))
+        .order_by(ResumeRevision.version)
+    ).all()
+    if rows[-1].version != version:
+        raise RevisionNotFound(f"Resume {resume_id} has no revision {version}")
+    return next(_replay(rows, wanted={version}))[1]
+
+
+def list_revisions(resume_id):
+    """Metadata of a resume's stored revisions, newest first; payloads are not loaded."""
+    return db.session.execute(
+        db.select(ResumeRevision.version, ResumeRevision.kind, ResumeRevision.content_size, ResumeRevision.created_at)
+        .where(ResumeRevision.resume_id == resume_id)
+        .order_by(ResumeRevision.version.desc())
+    ).all()
+
+
+def revisions_to_keep(revisions, now=None, keep_all_days=REVISION_KEEP_ALL_DAYS, retention_days=REVISION_RETENTION_DAYS):
+    """The versions the retention policy keeps, from (version, created_at) pairs in version order.
+
+    Everything newer than keep_all_days, then the last revision of each day up to
+    retention_days old, and always the latest revision.
+    """
+    now = now or datetime.utcnow()
+    keep_all_after = now - timedelta(days=keep_all_days)
+    drop_before = now - timedelta(days=retention_days) if retention_days else None
+    keep, last_of_day = set(), {}
+    for version, created_at in revisions:
+        if created_at >= keep_all_after:
+            keep.add(version)
+        elif drop_before is None or created_at >= drop_before:
+            last_of_day[created_at.date()] = version
+    keep.update(last_of_day.values())
+    if revisions:
+        keep.add(revisions[-1][0])
+    return keep
+
+
+def compact_revisions(resume_id, now=None):
+    """Apply the retention policy to one resume and re-encode the kept revisions as a fresh delta chain.
+
+    Dropped revisions are deleted; each kept one is rewritten as a delta from the
+    previous kept one, with a snapshot at least every REVISION_SNAPSHOT_INTERVAL.
+    The caller commits.
+    """
+    rows = db.session.execute(
+        db.select(ResumeRevision).options(db.undefer(ResumeRevision.payload))
+        .where(ResumeRevision.resume_id == resume_id)
+        .order_by(ResumeRevision.version)
+    ).scalars().all()
+    stats = {'kept': 0, 'removed': 0, 'bytes_before': sum(len(row.payload) for row in rows), 'bytes_after': 0}
+    if not rows:
+        return stats
+    keep = revisions_to_keep([(row.version, row.created_at) for row in rows], now)
+    contents = dict(_replay(rows, wanted=keep))
+
+    previous, chain_length = None, 0
+    for row in rows:
+        if row.version not in keep:
+            db.session.delete(row)
+            stats['removed'] += 1
+            continue
+        content = contents[row.version]
+        kind, body = _encode(previous, content, allow_delta=chain_length < REVISION_SNAPSHOT_INTERVAL)
+        row.kind, row.payload = kind, _pack(body)  # Unchanged values are not written
+        row.content_hash = content_hash(content)
+        chain_length = 0 if kind == SNAPSHOT else chain_length + 1
+        previous = content
+        stats['kept'] += 1
+        stats['bytes_after'] += len(row.payload)
+    return stats
+
+
+def compact_all_revisions(now=None, progress=None):
+    """Compact every resume with stored revisions, one transaction per resume; returns the summed stats."""
+    resume_ids = db.session.execute(db.select(ResumeRevision.resume_id).distinct()).scalars().all()
+    totals = {'resumes': 0, 'kept': 0, 'removed': 0, 'bytes_before': 0, 'bytes_after': 0}
+    for resume_id in resume_ids:
+        try:
+            stats = compact_revisions(resume_id, now)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Compacting revisions of resume {resume_id} failed: {e}", exc_info=True)
+            continue
+        totals['resumes'] += 1
+        for key, value in stats.items():
+            totals[key] += value
+        if progress:
+            progress(totals['resumes'], len(resume_ids), totals)
+    return totals
+
+
+def run_compaction_job(job_id, resume_id):
+    stats = compact_revisions(resume_id)
+    db.session.commit()
+    return stats
+
+
+def schedule_compaction_if_due(user_id, resume_id, version):
+    """Queue a background compaction of this resume every REVISION_COMPACT_EVERY saves; call after committing."""
+    if REVISION_COMPACT_EVERY <= 0 or version % REVISION_COMPACT_EVERY:
+        return None
+    try:
+        return job_queue.enqueue(user_id, JOB_TYPE, run_compaction_job, resume_id)
+    except Exception as e:
+        logger.error(f"Could not queue revision compaction for resume {resume_id}: {e}")
+        return None
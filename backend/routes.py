@@ -2,10 +2,15 @@ import logging # Added for logging
 import os # Added for path manipulation
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from flask_login import login_required, current_user, login_user, logout_user
-from backend.models import User, Resume, CoverLetter, MockInterview, Credit, FeatureUsageLog
+from backend.models import User
 from backend.extensions import db, bcrypt
-from datetime import datetime
 from backend.forms import LoginForm, RegistrationForm # Added for auth forms
+from backend.rate_limiter import rate_limit
+from backend.request_context import user_snapshot
+from backend.identity_cache import identity_cache
+from backend.usage_log import usage_log
+from backend.dashboard_data import (list_documents, document_totals, InvalidCursor, DOCUMENT_KINDS,
+                                    DASHBOARD_PAGE_SIZE, MAX_PAGE_SIZE)
 
 # Configure logger for this blueprint
 logger = logging.getLogger(__name__) # Added for logging
@@ -24,53 +29,65 @@ def home():
         return redirect(url_for('main.dashboard'))
     return render_template('home.html')
 
-@main_bp.route('/dashboard')
-@login_required
-def dashboard():
-    # Tier limits
-    tier_limits = {
-        'free': {'resumes': 1, 'cover_letters': 1, 'interviews': 0},
-        'starter': {'resumes': 5, 'cover_letters': 3, 'interviews': 3},
-        'pro': {'resumes': float('inf'), 'cover_letters': float('inf'), 'interviews': float('inf')}
-    }
+# Tier limits: how many of each document kind the dashboard lists
+TIER_LIMITS = {
+    'free': {'resumes': 1, 'cover_letters': 1, 'interviews': 0},
+    'starter': {'resumes': 5, 'cover_letters': 3, 'interviews': 3},
+    'pro': {'resumes': float('inf'), 'cover_letters': float('inf'), 'interviews': float('inf')}
+}
+
 
+def _listing_cap(kind):
+    """The current user's tier limit for a document list, as list_documents' cap (None = unlimited)."""
     user_tier = current_user.tier if hasattr(current_user, 'tier') else 'free'
-    limits = tier_limits.get(user_tier, tier_limits['free'])
+    limit = TIER_LIMITS.get(user_tier, TIER_LIMITS['free'])[kind]
+    return None if limit == float('inf') else int(limit)
 
-    resumes = Resume.query.filter_by(user_id=current_user.id, is_archived=False).order_by(Resume.updated_at.desc()).all()
-    cover_letters = CoverLetter.query.filter_by(user_id=current_user.id, is_archived=False).order_by(CoverLetter.updated_at.desc()).all()
-    interviews = MockInterview.query.filter_by(user_id=current_user.id, is_archived=False).order_by(MockInterview.updated_at.desc()).all()
 
-    resumes_limited = resumes[:int(limits['resumes'])]
-    cover_letters_limited = cover_letters[:int(limits['cover_letters'])]
-    interviews_limited = interviews[:int(limits['interviews'])]
+@main_bp.route('/dashboard')
+@login_required
+def dashboard():
+    # Only the first page of id/title/updated_at rows per list, capped by the tier's limit.
+    # Tiers allowed more than a page (pro) get the rest through "load more" (/dashboard/<kind>).
+    def first_page(kind):
+        return list_documents(kind, current_user.id, cap=_listing_cap(kind))
+
+    resumes_page = first_page('resumes')
+    cover_letters_page = first_page('cover_letters')
+    interviews_page = first_page('interviews')
+    totals = document_totals(current_user.id)
 
-    credit = Credit.query.filter_by(user_id=current_user.id, credit_type='legacy').first()
+    credit = user_snapshot().credit('legacy')
     credit_amount = credit.amount if credit else 0
 
-    # Feature usage logging
-    try:
-        log = FeatureUsageLog(
-            user_id=current_user.id,
-            feature_name='dashboard_view',
-            usage_timestamp=datetime.utcnow()
-            # credits_used defaults to 0 as per model definition if not specified
-        )
-        db.session.add(log)
-        db.session.commit()
-    except Exception as e:
-        # Log or handle the exception if the database commit fails
-        # For now, let's assume it's important to still render the dashboard
-        logger.error(f"Error logging feature usage: {e}", exc_info=True)
-        db.session.rollback()
-
+    # Feature usage logging: buffered and bulk-written in the background, never on the request path
+    usage_log.record(current_user.id, 'dashboard_view')
 
     return render_template('dashboard.html',
-                         resumes=resumes_limited,
-                         cover_letters=cover_letters_limited,
-                         interviews=interviews_limited,
+                         resumes=resumes_page['items'],
+                         cover_letters=cover_letters_page['items'],
+                         interviews=interviews_page['items'],
+                         next_cursors={'resumes': resumes_page['next_cursor'],
+                                       'cover_letters': cover_letters_page['next_cursor'],
+                                       'interviews': interviews_page['next_cursor']},
+                         totals=totals,
                          credit_amount=credit_amount)
 
+@main_bp.route('/dashboard/<kind>')
+@login_required
+def dashboard_documents(kind):
+    """JSON pages of a document list for "load more": ?after=<next_cursor>&limit=<n>."""
+    if kind not in DOCUMENT_KINDS:
+        return jsonify({"success": False, "error": f"Unknown document type '{kind}'"}), 404
+    limit = max(1, min(request.args.get('limit', DASHBOARD_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+    try:
+        page = list_documents(kind, current_user.id, limit=limit, after=request.args.get('after'), cap=_listing_cap(kind))
+    except InvalidCursor as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    items = [{'id': row.id, 'title': row.title, 'updated_at': row.updated_at.isoformat()} for row in page['items']]
+    return jsonify({"success": True, "items": items, "next_cursor": page['next_cursor'],
+                    "total": document_totals(current_user.id)[kind]})
+
 @main_bp.route('/pricing')
 def pricing():
     return render_template('pricing.html')
@@ -84,6 +101,7 @@ def analyzer():
     return render_template('index.html')
 
 @main_bp.route('/login', methods=['GET', 'POST'])
+@rate_limit(10, 60, methods=('POST',)) # Slow down password guessing
 def login():
     if current_user.is_authenticated:
         return redirect(url_for('main.home'))
@@ -102,11 +120,13 @@ def login():
 @main_bp.route('/logout')
 @login_required
 def logout():
+    identity_cache.invalidate(current_user.id)
     logout_user()
     flash('You have been logged out.', 'success')
     return redirect(url_for('main.home'))
 
 @main_bp.route('/register', methods=['GET', 'POST'])
+@rate_limit(5, 60, methods=('POST',))
 def register():
     if current_user.is_authenticated:
         return redirect(url_for('main.home'))
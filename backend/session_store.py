@@ -0,0 +1,210 @@
+import os
+import time
+import secrets
+import sqlite3
+import logging
+import threading
+from flask.sessions import SessionInterface, SessionMixin
+from flask.json.tag import TaggedJSONSerializer
+from werkzeug.datastructures import CallbackDict
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_SESSION_PATH = os.path.join(PROJECT_ROOT, 'instance', 'sessions.db')
+
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'sqlite')  # 'sqlite' or 'redis'
+SESSION_SQLITE_PATH = os.getenv('SESSION_SQLITE_PATH', DEFAULT_SESSION_PATH)
+SESSION_REDIS_URL = os.getenv('SESSION_REDIS_URL', 'redis://localhost:6379/0')
+SESSION_GC_INTERVAL = int(os.getenv('SESSION_GC_INTERVAL', 300))  # Seconds between expired-session sweeps
+
+
+class SQLiteSessionStore:
+    """Sessions in a SQLite WAL table shared by every worker on the host, indexed by expiry."""
+
+    def __init__(self, path=SESSION_SQLITE_PATH):
+        self.path = path
+        self._conn = None
+        self._conn_pid = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:  # Never reuse a connection across fork()
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at)')
+            self._conn_pid = pid
+        return self._conn
+
+    def get(self, sid):
+        """Return (data, expires_at) for a live session, else None."""
+        with self._lock:
+            row = self._db().execute(
+                'SELECT data, expires_at FROM sessions WHERE sid = ? AND expires_at > ?', (sid, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, sid, data, expires_at):
+        with self._lock:
+            self._db().execute(
+                'INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)', (sid, data, expires_at)
+            )
+
+    def delete(self, sid):
+        with self._lock:
+            self._db().execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+    def gc(self):
+        """Delete expired sessions; returns how many were removed."""
+        with self._lock:
+            return self._db().execute('DELETE FROM sessions WHERE expires_at <= ?', (time.time(),)).rowcount
+
+
+class RedisSessionStore:
+    """Sessions in any Redis-protocol server (Redis, Valkey, KeyDB, a local stand-in); expiry is native.
+
+    `client` may be any object with Redis' get/set(ex=)/delete/ttl methods; by default
+    one is created from SESSION_REDIS_URL, which needs the optional `redis` package.
+    """
+
+    def __init__(self, url=SESSION_REDIS_URL, client=None, prefix='session:'):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("SESSION_BACKEND=redis requires the 'redis' package (pip install redis)")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, sid):
+        data = self.client.get(self.prefix + sid)
+        if data is None:
+            return None
+        ttl = self.client.ttl(self.prefix + sid)
+        return data, time.time() + max(ttl, 0)
+
+    def set(self, sid, data, expires_at):
+        self.client.set(self.prefix + sid, data, ex=max(int(expires_at - time.time()), 1))
+
+    def delete(self, sid):
+        self.client.delete(self.prefix + sid)
+
+    def gc(self):
+        return 0  # Redis expires keys itself
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False, expires_at=None):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.modified = False
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask session interface over a session store that only writes when something changed.
+
+    Read-only requests cost one indexed read and no write or Set-Cookie. The expiry
+    is slid forward (one write) once less than half of the lifetime remains. Expired
+    rows are swept by a background thread every gc_interval seconds.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store, gc_interval=SESSION_GC_INTERVAL):
+        self.store = store
+        self.gc_interval = gc_interval
+        self._gc_pid = None
+        self._gc_lock = threading.Lock()
+
+    def _start_gc(self):
+        if self.gc_interval <= 0 or self._gc_pid == os.getpid():
+            return
+        with self._gc_lock:
+            if self._gc_pid == os.getpid():
+                return
+            thread = threading.Thread(target=self._gc_loop, daemon=True, name='session-gc')
+            thread.start()
+            self._gc_pid = os.getpid()
+
+    def _gc_loop(self):
+        while True:
+            time.sleep(self.gc_interval)
+            try:
+                removed = self.store.gc()
+                if removed:
+                    logger.info(f"Session GC removed {removed} expired sessions")
+            except Exception as e:
+                logger.error(f"Session GC failed: {e}")
+
+    def _lifetime(self, app):
+        return app.permanent_session_lifetime.total_seconds()
+
+    def open_session(self, app, request):
+        self._start_gc()
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            try:
+                stored = self.store.get(sid)
+            except Exception as e:
+                logger.error(f"Session store read failed, starting a new session: {e}")
+                stored = None
+            if stored is not None:
+                data, expires_at = stored
+                try:
+                    return ServerSideSession(self.serializer.loads(data), sid=sid, expires_at=expires_at)
+                except ValueError:
+                    logger.warning("Discarding unreadable session data")
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session:
+            if not session.new and session.modified:
+                # Emptied (e.g. logout): drop the stored row and the cookie
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        lifetime = self._lifetime(app)
+        refresh = session.expires_at is not None and session.expires_at - now < lifetime / 2
+        if not (session.modified or session.new or refresh):
+            return  # Nothing changed: no store write, no Set-Cookie
+        session.expires_at = now + lifetime
+        self.store.set(session.sid, self.serializer.dumps(dict(session)), session.expires_at)
+        response.set_cookie(
+            name, session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def create_session_store(backend=SESSION_BACKEND):
+    if backend == 'redis':
+        return RedisSessionStore()
+    if backend == 'sqlite':
+        return SQLiteSessionStore()
+    raise ValueError(f"Unknown SESSION_BACKEND '{backend}' (expected 'sqlite' or 'redis')")
+
+
+def init_session(app, store=None):
+    """Install the server-side session interface on app."""
+    app.session_interface = ServerSideSessionInterface(store or create_session_store())
+    return app.session_interface
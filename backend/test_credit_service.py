@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from flask import Flask
+from backend.extensions import db
+from backend.models import User, Credit, CreditLedger, FeatureUsageLog
+from backend import credit_service
+from backend.commands import register_commands
+from backend.utils import (consume_credit, get_user_credits, reset_starter_credits, CREDIT_TYPE_RESUME_AI,
+                           STARTER_MONTHLY_RESUME_AI_CREDITS, STARTER_MONTHLY_QUOTAS)
+
+
+class CreditServiceTestCase(unittest.TestCase):
+    """Uses a file-backed SQLite database so concurrent threads really contend for the same row."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'credits.db')}"
+        self.app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 30}}
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.user = User(email='credits@example.com', username='credits', password_hash='x', tier='free')
+        db.session.add(self.user)
+        db.session.commit()
+        credit_service.grant(self.user.id, 'legacy', 5)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _amount(self, credit_type='legacy', user_id=None):
+        db.session.expire_all()
+        return Credit.query.filter_by(user_id=user_id or self.user.id, credit_type=credit_type).first().amount
+
+    def test_consume_and_insufficient(self):
+        self.assertTrue(credit_service.consume(self.user.id, 'legacy', 3))
+        db.session.commit()
+        self.assertEqual(self._amount(), 2)
+        self.assertFalse(credit_service.consume(self.user.id, 'legacy', 3))
+        self.assertFalse(credit_service.consume(self.user.id, 'missing_type'))
+        db.session.commit()
+        self.assertEqual(self._amount(), 2)
+
+    def test_concurrent_requests_cannot_double_spend(self):
+        successes = []
+        user_id = self.user.id
+
+        def spend():
+            with self.app.app_context():
+                if credit_service.consume(user_id, 'legacy'):
+                    db.session.commit()
+                    successes.append(1)
+                else:
+                    db.session.rollback()
+
+        threads = [threading.Thread(target=spend) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(successes), 5)
+        self.assertEqual(self._amount(), 0)
+        self.assertEqual(CreditLedger.query.filter_by(user_id=user_id, reason='consume').count(), 5)
+        self.assertEqual(credit_service.find_drift(), [])
+
+    def test_consume_credit_helper(self):
+        self.user.tier = 'starter'
+        db.session.commit()
+        # No resume_ai record yet: it is created with the starter quota, then consumed
+        self.assertTrue(consume_credit(self.user.id, CREDIT_TYPE_RESUME_AI))
+        self.assertEqual(self._amount(CREDIT_TYPE_RESUME_AI), STARTER_MONTHLY_RESUME_AI_CREDITS - 1)
+        self.assertFalse(consume_credit(self.user.id, CREDIT_TYPE_RESUME_AI, 100))
+        self.user.tier = 'pro'
+        db.session.commit()
+        self.assertTrue(consume_credit(self.user.id, 'legacy', 100))
+        self.assertEqual(self._amount(), 5)
+
+    def test_consume_appends_ledger_entry(self):
+        self.assertTrue(credit_service.consume(self.user.id, 'legacy', 2, reason='resume_create'))
+        db.session.commit()
+        entry = CreditLedger.query.filter_by(reason='resume_create').one()
+        self.assertEqual((entry.delta, entry.balance_after), (-2, 3))
+        self.assertEqual(credit_service.ledger_balance(self.user.id, 'legacy'), self._amount())
+        # A failed spend leaves no entry behind
+        self.assertFalse(credit_service.consume(self.user.id, 'legacy', 10))
+        db.session.commit()
+        self.assertEqual(CreditLedger.query.count(), 2)
+
+    def test_idempotency_key_spends_once(self):
+        self.assertTrue(credit_service.consume(self.user.id, 'legacy', idempotency_key='job:abc'))
+        db.session.commit()
+        self.assertTrue(credit_service.consume(self.user.id, 'legacy', idempotency_key='job:abc'))
+        db.session.commit()
+        self.assertEqual(self._amount(), 4)
+        self.assertFalse(credit_service.grant(self.user.id, 'legacy', 1, idempotency_key='job:abc'))
+
+    def test_concurrent_repeat_of_keyed_spend_is_absorbed(self):
+        self.assertTrue(credit_service.consume(self.user.id, 'legacy', idempotency_key='job:abc'))
+        db.session.commit()
+        # A concurrent retry that checked already_applied() before the first call committed
+        with patch.object(credit_service, 'already_applied', return_value=False):
+            self.assertTrue(credit_service.consume(self.user.id, 'legacy', idempotency_key='job:abc'))
+        db.session.commit()
+        self.assertEqual(self._amount(), 4)
+        self.assertEqual(CreditLedger.query.filter_by(idempotency_key='job:abc').count(), 1)
+
+    def test_concurrent_refunds_return_credits_once(self):
+        credit_service.consume(self.user.id, 'legacy', 2, idempotency_key='job:abc')
+        db.session.commit()
+        self.assertTrue(credit_service.refund('job:abc'))
+        db.session.commit()
+        with patch.object(credit_service, 'already_applied', return_value=False):
+            self.assertFalse(credit_service.refund('job:abc'))
+        db.session.commit()
+        self.assertEqual(self._amount(), 5)
+        self.assertEqual(CreditLedger.query.filter_by(reason=credit_service.REASON_REFUND).count(), 1)
+        self.assertEqual(credit_service.find_drift(), [])
+
+    def test_bulk_monthly_reset(self):
+        starters = [User(email=f's{i}@example.com', username=f's{i}', password_hash='x', tier='starter') for i in range(3)]
+        db.session.add_all(starters)
+        db.session.commit()
+        credit_service.grant(starters[0].id, CREDIT_TYPE_RESUME_AI, 2)
+        db.session.commit()
+        Credit.query.filter_by(user_id=starters[0].id).update({'last_reset': datetime.utcnow() - timedelta(days=40)})
+        db.session.commit()
+        calls = []
+        rows = reset_starter_credits(chunk_size=2, progress=lambda *args: calls.append(args))
+        self.assertEqual(rows, 3 * len(STARTER_MONTHLY_QUOTAS))
+        self.assertEqual(calls, [(2, 3, 6), (3, 3, 9)])
+        for user in starters:
+            for credit_type, quota in STARTER_MONTHLY_QUOTAS.items():
+                self.assertEqual(self._amount(credit_type, user.id), quota)
+        entry = CreditLedger.query.filter_by(user_id=starters[0].id, credit_type=CREDIT_TYPE_RESUME_AI,
+                                             reason=credit_service.REASON_MONTHLY_RESET).one()
+        self.assertEqual(entry.delta, STARTER_MONTHLY_RESUME_AI_CREDITS - 2)
+        self.assertEqual(entry.idempotency_key, f"monthly_reset:{starters[0].id}:{CREDIT_TYPE_RESUME_AI}:{datetime.utcnow():%Y-%m}")
+        self.assertEqual(credit_service.find_drift(), [])
+        # Free users are untouched and a second run for the same month does nothing
+        self.assertEqual(Credit.query.filter_by(user_id=self.user.id).count(), 1)
+        self.assertEqual(reset_starter_credits(), 0)
+
+    def test_lookups_no_longer_reset_lazily(self):
+        self.user.tier = 'starter'
+        credit_service.grant(self.user.id, CREDIT_TYPE_RESUME_AI, 2)
+        db.session.commit()
+        Credit.query.filter_by(user_id=self.user.id).update({'last_reset': datetime.utcnow() - timedelta(days=40)})
+        db.session.commit()
+        self.assertEqual(get_user_credits(self.user.id, CREDIT_TYPE_RESUME_AI), 2)
+
+    def test_reset_credits_command(self):
+        register_commands(self.app)
+        self.user.tier = 'starter'
+        db.session.commit()
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(args=['reset-credits', '--month', '2026-01', '--chunk-size', '1'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('1/1 users processed', result.output)
+        self.assertIn('Done: 3 balances reset.', result.output)
+        self.assertEqual(runner.invoke(args=['reset-credits', '--month', 'January']).exit_code, 2)
+
+    def test_find_drift_and_reconcile_usage(self):
+        start = datetime.utcnow() - timedelta(minutes=1)
+        credit_service.consume(self.user.id, 'legacy', 2)
+        db.session.add(FeatureUsageLog(user_id=self.user.id, feature_name='resume_create', credits_used=1))
+        db.session.commit()
+        usage = credit_service.reconcile_usage(self.user.id, start, datetime.utcnow() + timedelta(minutes=1))
+        self.assertEqual(usage, {'ledger_spent': 2, 'usage_logged': 1, 'difference': 1})
+        # An update that bypasses the service shows up as drift
+        Credit.query.filter_by(user_id=self.user.id, credit_type='legacy').update({'amount': 50})
+        db.session.commit()
+        self.assertEqual(credit_service.find_drift(), [(self.user.id, 'legacy', 50, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import event
+from backend.extensions import db
+from backend.models import User, Resume, CoverLetter, MockInterview
+from backend.dashboard_data import list_documents, document_totals, decode_cursor, InvalidCursor
+
+
+class DashboardDataTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'dashboard.db')}"
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        user = User(email='d@example.com', username='d', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        base = datetime(2026, 1, 1)
+        for i in range(23):
+            # Pairs share a timestamp so the id tie-breaker is exercised
+            db.session.add(Resume(user_id=user.id, title=f'R{i}', content='x' * 1000, updated_at=base + timedelta(hours=i // 2)))
+        db.session.add(Resume(user_id=user.id, title='archived', content='x', is_archived=True))
+        db.session.add(CoverLetter(user_id=user.id, title='CL', content='x'))
+        db.session.add(MockInterview(user_id=user.id, job_description='Senior Python developer for data platform', questions='[]'))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_keyset_pages_cover_every_document_once(self):
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = list_documents('resumes', self.user_id, limit=10, after=cursor)
+            seen.extend(row.title for row in page['items'])
+            pages += 1
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(sorted(seen), sorted(f'R{i}' for i in range(23)))
+        # Newest first, ids breaking ties between equal timestamps
+        self.assertEqual(seen[:3], ['R22', 'R21', 'R20'])
+
+    def test_cap_stops_paging_at_the_tier_limit(self):
+        first = list_documents('resumes', self.user_id, limit=10, cap=5)
+        self.assertEqual(len(first['items']), 5)
+        self.assertIsNone(first['next_cursor'])
+
+        # A cursor from an uncapped page cannot be used to read past the cap
+        page = list_documents('resumes', self.user_id, limit=3, cap=12)
+        seen = [row.title for row in page['items']]
+        while page['next_cursor']:
+            page = list_documents('resumes', self.user_id, limit=5, after=page['next_cursor'], cap=12)
+            seen.extend(row.title for row in page['items'])
+        self.assertEqual(len(seen), 12)
+        cursor = list_documents('resumes', self.user_id, limit=15)['next_cursor']
+        self.assertEqual(list_documents('resumes', self.user_id, after=cursor, cap=12)['items'], [])
+
+    def test_only_list_columns_are_selected(self):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            page = list_documents('resumes', self.user_id, limit=5)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn('content', statements[0])
+        self.assertIn('LIMIT', statements[0])
+        self.assertEqual(set(page['items'][0]._mapping), {'id', 'title', 'updated_at'})
+
+    def test_totals_and_interview_titles(self):
+        self.assertEqual(document_totals(self.user_id), {'resumes': 23, 'cover_letters': 1, 'interviews': 1})
+        interview = list_documents('interviews', self.user_id)['items'][0]
+        self.assertEqual(interview.title, 'Senior Python developer f')
+        self.assertEqual(list_documents('interviews', self.user_id, limit=0)['items'], [])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('not-a-cursor')
+
+
+if __name__ == '__main__':
+    unittest.main()
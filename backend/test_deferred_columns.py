@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+from flask import Flask
+from sqlalchemy import event
+from backend.extensions import db
+from backend.models import User, Resume, CoverLetter, MockInterview, PREVIEW_CHARS
+
+
+class DeferredColumnsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'deferred.db')}"
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        user = User(email='d@example.com', username='d', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        self.body = '{"summary": "' + 'x' * 5000 + '"}'
+        db.session.add(Resume(user_id=user.id, title='R', content=self.body))
+        db.session.add(Resume(user_id=user.id, title='archived', content='x', is_archived=True))
+        db.session.add(CoverLetter(user_id=user.id, title='CL', content='Dear hiring manager, ' + 'y' * 5000))
+        db.session.add(MockInterview(user_id=user.id, job_description='Data engineer ' * 100, questions='["q"]' * 500))
+        db.session.commit()
+        db.session.expunge_all()
+
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._record)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_list_query_selects_previews_not_bodies(self):
+        resumes = Resume.list_query(self.user_id).all()
+        self.assertEqual([r.title for r in resumes], ['R'])
+        self.assertEqual(resumes[0].content_preview, self.body[:PREVIEW_CHARS])
+        self.assertEqual(len(self.statements), 1)
+        sql = self.statements[0]
+        self.assertIn('substr(resumes.content', sql)
+        self.assertNotIn('resumes.content AS', sql)
+
+    def test_interview_list_skips_transcript(self):
+        interview = MockInterview.list_query(self.user_id).one()
+        self.assertTrue(interview.job_description_preview.startswith('Data engineer'))
+        sql = self.statements[0]
+        for column in ('questions', 'answers', 'scores', 'feedback', 'pronunciation_feedback'):
+            self.assertNotIn(f'mock_interview.{column}', sql)
+
+    def test_deferred_column_loads_on_access(self):
+        letter = CoverLetter.list_query(self.user_id).one()
+        self.assertEqual(len(self.statements), 1)
+        self.assertTrue(letter.content.startswith('Dear hiring manager'))
+        self.assertEqual(len(self.statements), 2)
+
+    def test_undefer_group_loads_body_in_one_query(self):
+        resume = Resume.query.options(db.undefer_group('body')).filter_by(title='R').one()
+        self.assertEqual(resume.content, self.body)
+        self.assertEqual(len(self.statements), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import os
+import hashlib
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from werkzeug.datastructures import FileStorage
+from backend.cover_letter_app.utils import file_utils
+from backend.cover_letter_app.utils.extraction_cache import ExtractionCache
+
+
+class TestExtractionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = ExtractionCache(path=os.path.join(self.tmpdir, 'cache.db'), ttl=60, max_bytes=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_hit_miss_and_stats(self):
+        self.assertIsNone(self.cache.get('abc'))
+        self.cache.put('abc', 'resume text')
+        self.assertEqual(self.cache.get('abc'), 'resume text')
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stores'], stats['entries']), (1, 1, 1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_stats_are_shared_between_instances(self):
+        other = ExtractionCache(path=self.cache.path)
+        self.cache.put('abc', 'resume text')
+        other.get('abc')
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+
+    def test_expired_entries_are_misses(self):
+        self.cache.put('abc', 'resume text')
+        with patch('backend.cover_letter_app.utils.extraction_cache.time.time', return_value=10**12):
+            self.assertIsNone(self.cache.get('abc'))
+        self.assertEqual(self.cache.get_stats()['expired'], 1)
+
+    def test_size_cap_evicts_least_recently_used(self):
+        self.cache.put('old', 'a' * 40)
+        self.cache.put('mid', 'b' * 40)
+        self.cache.get('old')  # 'mid' is now the least recently used
+        self.cache.put('new', 'c' * 40)
+        self.assertIsNone(self.cache.get('mid'))
+        self.assertIsNotNone(self.cache.get('old'))
+        self.assertEqual(self.cache.get_stats()['bytes'], 80)
+        self.cache.put('huge', 'd' * 101)  # Larger than the whole cache: not stored
+        self.assertIsNone(self.cache.get('huge'))
+
+    def test_repeat_upload_skips_parser(self):
+        data = b'Senior engineer. Built Kafka pipelines.'
+        path = os.path.join(self.tmpdir, 'resume.txt')
+        with open(path, 'wb') as f:
+            digest = file_utils.save_upload(FileStorage(stream=io.BytesIO(data), filename='resume.txt'), f)
+        self.assertEqual(digest, hashlib.sha256(data).hexdigest())
+
+        with patch.object(file_utils, 'extraction_cache', self.cache), \
+                patch.object(file_utils, '_extract', wraps=file_utils._extract) as parser:
+            first = file_utils.extract_text_cached(path, digest)
+            second = file_utils.extract_text_cached(path, digest)
+        self.assertEqual(first, second)
+        self.assertEqual(parser.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
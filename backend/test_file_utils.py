@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+from itertools import count
+from unittest.mock import patch
+from backend.cover_letter_app.utils import file_utils
+from backend.cover_letter_app.utils.parser_pool import ParserPool
+from backend.cover_letter_app.utils.extraction_cache import ExtractionCache
+
+
+class FakePage:
+    def __init__(self, reader, text):
+        self.reader = reader
+        self.text = text
+
+    def extract_text(self):
+        self.reader.extracted += 1
+        return self.text
+
+
+class FakeReader:
+    """Stands in for PyPDF2.PdfReader and counts how many pages were actually extracted."""
+    page_count = 10
+    page_chars = 1000
+    instances = []
+
+    def __init__(self, f):
+        self.extracted = 0
+        self.pages = [FakePage(self, str(i) * self.page_chars) for i in range(self.page_count)]
+        FakeReader.instances.append(self)
+
+
+class TestStreamingExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.pdf = os.path.join(self.tmpdir, 'resume.pdf')
+        with open(self.pdf, 'wb') as f:
+            f.write(b'%PDF-1.4')
+        FakeReader.instances = []
+        # Parse inline so the fake reader patched into this process is the one used
+        self.patchers = [patch.object(file_utils, 'PdfReader', FakeReader),
+                         patch.object(file_utils, 'parser_pool', ParserPool(size=0))]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_character_budget_stops_after_needed_pages(self):
+        text = file_utils.extract_text_from_file(self.pdf, max_chars=1800)
+        self.assertEqual(len(text), 1800)
+        self.assertTrue(text.startswith('0' * 1000 + '\n\n1'))
+        self.assertEqual(FakeReader.instances[0].extracted, 2)
+
+    def test_without_budget_matches_full_join(self):
+        text = file_utils.extract_text_from_file(self.pdf)
+        self.assertEqual(text, '\n\n'.join(str(i) * 1000 for i in range(10)))
+
+    def test_page_limit(self):
+        file_utils.extract_text_from_file(self.pdf, max_pages=3)
+        self.assertEqual(FakeReader.instances[0].extracted, 3)
+
+    def test_time_limit(self):
+        ticks = count(step=4)  # Every check sees 4 more seconds pass
+        with patch.object(file_utils.time, 'monotonic', side_effect=lambda: next(ticks)):
+            file_utils.extract_text_from_file(self.pdf, time_limit=10)
+        self.assertLess(FakeReader.instances[0].extracted, 10)
+
+    def test_only_complete_extractions_are_cached(self):
+        cache = ExtractionCache(path=os.path.join(self.tmpdir, 'cache.db'))
+        ticks = count(step=4)
+        with patch.object(file_utils, 'extraction_cache', cache):
+            with patch.object(FakeReader, 'page_count', file_utils.EXTRACT_MAX_PAGES + 5):
+                file_utils.extract_text_cached(self.pdf, 'long')
+            with patch.object(file_utils.time, 'monotonic', side_effect=lambda: next(ticks)):
+                file_utils.extract_text_cached(self.pdf, 'slow')
+            full = file_utils.extract_text_cached(self.pdf, 'full')
+        self.assertIsNone(cache.get('long'))  # Cut off by the page limit
+        self.assertIsNone(cache.get('slow'))  # Cut off by the time limit
+        self.assertEqual(cache.get('full'), full)
+
+    def test_txt_budget(self):
+        path = os.path.join(self.tmpdir, 'resume.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('x' * 200000)
+        self.assertEqual(len(file_utils.extract_text_from_file(path, max_chars=1800)), 1800)
+        self.assertEqual(len(file_utils.extract_text_from_file(path)), 200000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from flask import Flask
+from backend.extensions import db
+from backend.models import User
+from backend.identity_cache import IdentityCache, CachedUser, identity_cache
+from backend.request_context import query_count
+
+
+class IdentityCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'identity.db')}"
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        user = User(email='id@example.com', username='ident', password_hash='x', tier='free', contact_phone='555')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        db.session.remove()
+        identity_cache.clear()
+
+    def tearDown(self):
+        identity_cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_hit_skips_database(self):
+        first = identity_cache.load(self.user_id)
+        self.assertEqual((first.id, first.email, first.tier, first.username), (self.user_id, 'id@example.com', 'free', 'ident'))
+        before = query_count()
+        self.assertIs(identity_cache.load(self.user_id), first)
+        self.assertEqual(query_count(), before)
+        self.assertIsNone(identity_cache.load(9999))
+
+    def test_snapshot_is_read_only_with_lazy_extra_fields(self):
+        cached = identity_cache.load(self.user_id)
+        with self.assertRaises(AttributeError):
+            cached.tier = 'pro'
+        self.assertTrue(cached.is_authenticated)
+        self.assertEqual(cached.get_id(), str(self.user_id))
+        self.assertEqual(cached.contact_phone, '555')  # Not cached; loads the full row
+
+    def test_tier_change_invalidates(self):
+        identity_cache.load(self.user_id)
+        user = db.session.get(User, self.user_id)
+        user.tier = 'pro'
+        db.session.commit()
+        self.assertEqual(identity_cache.load(self.user_id).tier, 'pro')
+
+    def test_ttl_and_size_limits(self):
+        cache = IdentityCache(ttl=10, max_size=1)
+        user = db.session.get(User, self.user_id)
+        cache.put(CachedUser(user))
+        with patch('backend.identity_cache.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(cache.get(self.user_id))
+        cache.put(CachedUser(user))
+        other = User(email='b@example.com', username='b', password_hash='x')
+        db.session.add(other)
+        db.session.commit()
+        cache.put(CachedUser(other))
+        self.assertIsNone(cache.get(self.user_id))
+        self.assertEqual(cache.get_stats()['entries'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import unittest
+import importlib.util
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import select, func, event
+from backend.extensions import db
+from backend.models import Resume, CoverLetter, MockInterview, Credit, FeatureUsageLog
+from backend.dashboard_data import list_documents, document_totals, encode_cursor
+
+MIGRATION_PATH = os.path.join(os.path.dirname(__file__), 'migrations', 'versions', '0008_add_listing_composite_indexes.py')
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location('migration_0008', MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class IndexUsageTestCase(unittest.TestCase):
+    """EXPLAIN QUERY PLAN checks that the hot per-user queries are index searches, not table scans."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _plan(self, query):
+        statement = getattr(query, 'statement', query)
+        sql = str(statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+        return ' | '.join(row[-1] for row in db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')))
+
+    def test_listing_pages_search_and_order_by_index(self):
+        cases = [
+            (Resume.list_query(1).order_by(Resume.updated_at.desc()), 'ix_resumes_user_archived_updated'),
+            (CoverLetter.list_query(1).order_by(CoverLetter.updated_at.desc()), 'ix_cover_letters_user_archived_updated'),
+            (MockInterview.list_query(1).order_by(MockInterview.created_at.desc()), 'ix_mock_interview_user_archived_created'),
+        ]
+        for query, index in cases:
+            plan = self._plan(query)
+            self.assertIn(f'USING INDEX {index} (user_id=? AND is_archived=?)', plan)
+            self.assertNotIn('TEMP B-TREE', plan)  # Rows come back already ordered
+
+    def test_dashboard_queries_search_by_index(self):
+        indexes = {'resumes': 'ix_resumes_user_archived_updated', 'cover_letters': 'ix_cover_letters_user_archived_updated',
+                   'interviews': 'ix_mock_interview_user_archived_updated'}
+        cursor = encode_cursor(datetime(2026, 1, 1), 5)
+        for kind, index in indexes.items():
+            statements = []
+            listener = lambda conn, c, statement, parameters, *args: statements.append((statement, parameters))
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            try:
+                list_documents(kind, 1, after=cursor)
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', listener)
+            statement, parameters = statements[0]
+            plan = ' | '.join(row[-1] for row in db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters))
+            self.assertIn(f'USING INDEX {index} (user_id=? AND is_archived=?', plan)
+            self.assertNotIn('TEMP B-TREE', plan)  # Pages are read in index order, not sorted
+        plan = self._plan(select(func.count()).where(MockInterview.user_id == 1, MockInterview.is_archived.is_(False)))
+        self.assertIn('USING COVERING INDEX ix_mock_interview_user_archived_', plan)  # Either (user_id, is_archived, ...) index
+        # Both still run end to end against the indexed schema
+        self.assertEqual(list_documents('resumes', 1)['items'], [])
+        self.assertEqual(document_totals(1), {'resumes': 0, 'cover_letters': 0, 'interviews': 0})
+
+    def test_credit_lookup_uses_unique_index(self):
+        plan = self._plan(Credit.query.filter_by(user_id=1, credit_type='resume'))
+        self.assertIn('(user_id=? AND credit_type=?)', plan)
+        self.assertNotIn('SCAN', plan)
+
+    def test_usage_analytics_covered_by_index(self):
+        plan = self._plan(
+            select(func.count()).where(FeatureUsageLog.user_id == 1, FeatureUsageLog.feature_name == 'dashboard_view',
+                                       FeatureUsageLog.timestamp >= datetime(2026, 1, 1))
+        )
+        self.assertIn('COVERING INDEX ix_feature_usage_logs_user_feature_ts (user_id=? AND feature_name=? AND timestamp>?)', plan)
+
+    def test_migration_matches_model_indexes(self):
+        migration = _load_migration()
+        declared = {index.name: (index.table.name, [c.name for c in index.columns])
+                    for table in db.metadata.tables.values() for index in table.indexes}
+        for name, table, columns in migration.INDEXES:
+            self.assertEqual(declared[name], (table, columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
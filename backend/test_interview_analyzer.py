@@ -0,0 +1,103 @@
+import unittest
+import warnings
+import numpy as np
+import spacy
+from unittest.mock import patch
+from backend import nlp_provider
+from backend.mock_interview_app.utils import interview_analyzer, resume_cache
+
+
+class CountingNLP(nlp_provider.DummySpacyNLP):
+    """Dummy pipeline that records every text it is asked to parse."""
+
+    def __init__(self):
+        self.calls = []
+        self.pipe_calls = 0
+
+    def __call__(self, text, disable=()):
+        self.calls.append(text)
+        return super().__call__(text, disable)
+
+    def pipe(self, texts, disable=(), **kwargs):
+        self.pipe_calls += 1
+        texts = list(texts)
+        self.calls.extend(texts)
+        return super().pipe(texts, disable)
+
+
+RESUME = "Senior engineer at Acme Corp in Berlin. Built Kafka pipelines."
+QUESTIONS = ["Tell me about your experience with Kafka.", "Describe a project where you utilized Python.", "How do you handle feedback?"]
+ANSWERS = ["I built Kafka pipelines at Acme that processed 2 million events per day with great results.",
+           "I wrote Python tooling.",
+           "I welcome feedback and use it to improve my work every single day, which is great for the team."]
+
+
+class TestScoreInterview(unittest.TestCase):
+
+    def setUp(self):
+        self.nlp = CountingNLP()
+        self.patcher = patch.object(nlp_provider, '_nlp', self.nlp)
+        self.patcher.start()
+        self.cache_patcher = patch.object(resume_cache, 'resume_cache', resume_cache.ResumeArtifactCache())
+        self.cache_patcher.start()
+
+    def tearDown(self):
+        self.cache_patcher.stop()
+        self.patcher.stop()
+
+    def test_resume_is_parsed_once_per_session(self):
+        result = interview_analyzer.score_interview(QUESTIONS, ANSWERS, RESUME)
+        self.assertEqual(self.nlp.calls.count(RESUME), 1)
+        self.assertEqual(self.nlp.pipe_calls, 1)
+        self.assertEqual(len(self.nlp.calls), len(QUESTIONS) + len(ANSWERS) + 1)
+        self.assertEqual(len(result['results']), len(QUESTIONS))
+
+    def test_per_answer_api_parses_resume_once(self):
+        for question, answer in zip(QUESTIONS, ANSWERS):
+            scores = interview_analyzer.score_answer(question, answer, RESUME)
+            interview_analyzer.generate_feedback(scores, question, answer, RESUME)
+        self.assertEqual(self.nlp.calls.count(RESUME), 1)
+
+    def test_session_matches_per_answer_scores(self):
+        result = interview_analyzer.score_interview(QUESTIONS, ANSWERS, RESUME)
+        for item, question, answer in zip(result['results'], QUESTIONS, ANSWERS):
+            self.assertEqual(item['scores'], interview_analyzer.score_answer(question, answer, RESUME))
+            self.assertTrue(item['feedback'])
+        expected = round(sum(r['scores']['overall'] for r in result['results']) / len(QUESTIONS), 1)
+        self.assertEqual(result['overall_score'], expected)
+
+    def test_missing_answers_are_scored_as_empty(self):
+        result = interview_analyzer.score_interview(QUESTIONS, ANSWERS[:1])
+        self.assertEqual([r['answer'] for r in result['results']][1:], ["", ""])
+        self.assertEqual(result['results'][2]['scores']['clarity'], 1)
+
+    def test_empty_session(self):
+        self.assertEqual(interview_analyzer.score_interview([], []), {'results': [], 'overall_score': None})
+
+
+class TestVectorizedSimilarity(unittest.TestCase):
+
+    def setUp(self):
+        self.nlp = spacy.blank('en')
+        rng = np.random.default_rng(0)
+        for word in ("built", "kafka", "pipelines", "streaming", "python", "zero"):
+            self.nlp.vocab.set_vector(word, rng.standard_normal(16).astype(np.float32))
+        self.nlp.vocab.set_vector("zero", np.zeros(16, dtype=np.float32))
+
+    def test_matches_token_similarity(self):
+        answer_doc = self.nlp("I built kafka pipelines with zero downtime")
+        skill_doc = self.nlp("streaming python")
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # spaCy warns about zero vectors in the reference loop
+            expected = max(token.similarity(skill_doc) for token in answer_doc if token.has_vector)
+        self.assertAlmostEqual(interview_analyzer._max_token_similarity(answer_doc, skill_doc), expected, places=5)
+
+    def test_no_vectors_scores_zero(self):
+        self.assertEqual(interview_analyzer._max_token_similarity(self.nlp("nothing known here"), self.nlp("kafka")), 0.0)
+        self.assertEqual(interview_analyzer._max_token_similarity(self.nlp("built kafka"), self.nlp("unknown")), 0.0)
+        dummy = nlp_provider.DummySpacyNLP()
+        self.assertEqual(interview_analyzer._max_token_similarity(dummy("answer"), dummy("skill")), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
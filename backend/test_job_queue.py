@@ -0,0 +1,138 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from flask import Flask
+from backend.extensions import db
+from backend.models import User, Credit, CreditLedger, CoverLetter, BackgroundJob
+from backend import credit_service
+from backend.job_queue import JobQueue, JobFailed, report_progress, new_job_id, reservation_key, reap_stale_jobs
+from backend.cover_letter_app.utils.generation_job import run_cover_letter_job
+
+
+class JobQueueTestCase(unittest.TestCase):
+    """Runs jobs against a file-backed SQLite database so worker threads share it."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'jobs.db')}"
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        user = User(email='jobs@example.com', username='jobs', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        db.session.add(Credit(user_id=self.user_id, credit_type='legacy', amount=1))
+        db.session.commit()
+        self.queue = JobQueue(max_workers=2)
+
+    def tearDown(self):
+        self.queue.shutdown()
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _job(self, job_id):
+        db.session.expire_all()
+        return db.session.get(BackgroundJob, job_id)
+
+    def test_enqueue_returns_before_job_runs(self):
+        release = threading.Event()
+
+        def slow_job(job_id):
+            report_progress(job_id, 50, 'halfway')
+            release.wait(5)
+            return {'done': True}
+
+        job_id = self.queue.enqueue(self.user_id, 'test', slow_job)
+        self.assertIn(self._job(job_id).status, ('queued', 'running'))
+        release.set()
+        self.queue.join(timeout=5)
+        job = self._job(job_id)
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.to_dict()['result'], {'done': True})
+        self.assertEqual(job.progress, 100)
+
+    def test_failures_are_recorded(self):
+        def failing_job(job_id):
+            raise JobFailed('Nope')
+
+        def crashing_job(job_id):
+            raise RuntimeError('internal detail')
+
+        failed = self.queue.enqueue(self.user_id, 'test', failing_job)
+        crashed = self.queue.enqueue(self.user_id, 'test', crashing_job)
+        self.queue.join(timeout=5)
+        self.assertEqual((self._job(failed).status, self._job(failed).error), ('failed', 'Nope'))
+        self.assertEqual(self._job(crashed).status, 'failed')
+        self.assertNotIn('internal detail', self._job(crashed).error)
+
+    def _balance(self):
+        db.session.expire_all()
+        return Credit.query.filter_by(user_id=self.user_id, credit_type='legacy').first().amount
+
+    def test_credit_reserved_at_enqueue_is_refunded_when_the_job_fails(self):
+        def failing_job(job_id):
+            raise JobFailed('Nope')
+
+        job_id = new_job_id()
+        self.assertTrue(credit_service.consume(self.user_id, 'legacy', idempotency_key=reservation_key(job_id)))
+        self.queue.enqueue(self.user_id, 'test', failing_job, job_id=job_id)
+        self.assertFalse(credit_service.consume(self.user_id, 'legacy'))  # Reserved, so not spendable twice
+        db.session.rollback()
+        self.queue.join(timeout=5)
+        self.assertEqual(self._job(job_id).status, 'failed')
+        self.assertEqual(self._balance(), 1)
+        self.assertEqual(CreditLedger.query.filter_by(reason=credit_service.REASON_REFUND).count(), 1)
+
+    def test_stale_jobs_are_failed_and_refunded(self):
+        job_id = new_job_id()
+        credit_service.consume(self.user_id, 'legacy', idempotency_key=reservation_key(job_id))
+        db.session.add(BackgroundJob(id=job_id, user_id=self.user_id, job_type='test', status='running'))
+        db.session.commit()
+
+        self.assertEqual(reap_stale_jobs(max_age=60), 0)  # Still fresh
+        later = datetime.utcnow() + timedelta(seconds=120)
+        self.assertEqual(reap_stale_jobs(max_age=60, now=later), 1)
+        self.assertEqual(self._job(job_id).status, 'failed')
+        self.assertEqual(self._balance(), 1)
+        self.assertEqual(reap_stale_jobs(max_age=60, now=later), 0)  # Refunded once only
+        self.assertEqual(self._balance(), 1)
+
+    def test_cover_letter_job_extracts_generates_and_charges(self):
+        upload = os.path.join(self.tmpdir, 'resume.txt')
+        with open(upload, 'w', encoding='utf-8') as f:
+            f.write('Built Kafka pipelines at Acme.')
+        form_data = {
+            'your_name': 'Jo', 'your_email': 'jo@example.com', 'job_title': 'Engineer',
+            'company_name': 'Acme', 'job_description': 'Build data pipelines.', 'resume_text': '',
+            'refinement_type': 'new', 'existing_cover_text': '', 'key_points': '', 'tone': 'professional',
+        }
+        job_id = self.queue.enqueue(self.user_id, 'cover_letter_generate', run_cover_letter_job,
+                                    self.user_id, form_data, upload, None, 'AI Gen: Engineer', 'legacy')
+        self.queue.join(timeout=10)
+
+        job = self._job(job_id)
+        self.assertEqual(job.status, 'succeeded', job.error)
+        letter = db.session.get(CoverLetter, json.loads(job.result)['cover_letter_id'])
+        self.assertIn('Built Kafka pipelines', letter.content)
+        self.assertEqual(Credit.query.filter_by(user_id=self.user_id).first().amount, 0)
+        self.assertFalse(os.path.exists(upload))
+
+        # The credit is gone now, so a second job fails without saving anything
+        second = self.queue.enqueue(self.user_id, 'cover_letter_generate', run_cover_letter_job,
+                                    self.user_id, dict(form_data, resume_text='Pasted'), None, None, 'Again', 'legacy')
+        self.queue.join(timeout=10)
+        self.assertEqual(self._job(second).status, 'failed')
+        self.assertEqual(CoverLetter.query.count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from backend.json_patch import apply_json_patch, apply_merge_patch, make_json_patch, JsonPatchError
+
+
+class JsonPatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.doc = {'summary': 'old', 'experiences': [{'id': 'a'}, {'id': 'b'}], 'skills': {'technical_skills': ['python']}}
+
+    def test_operations(self):
+        patched = apply_json_patch(self.doc, [
+            {'op': 'replace', 'path': '/summary', 'value': 'new'},
+            {'op': 'add', 'path': '/experiences/-', 'value': {'id': 'c'}},
+            {'op': 'remove', 'path': '/experiences/0'},
+            {'op': 'add', 'path': '/skills/technical_skills/0', 'value': 'sql'},
+            {'op': 'copy', 'from': '/summary', 'path': '/headline'},
+            {'op': 'move', 'from': '/headline', 'path': '/tagline'},
+            {'op': 'test', 'path': '/tagline', 'value': 'new'},
+        ])
+        self.assertEqual(patched, {'summary': 'new', 'experiences': [{'id': 'b'}, {'id': 'c'}],
+                                   'skills': {'technical_skills': ['sql', 'python']}, 'tagline': 'new'})
+        self.assertEqual(self.doc['summary'], 'old')  # Input is never modified
+
+    def test_replace_keeps_key_order(self):
+        patched = apply_json_patch(self.doc, [{'op': 'replace', 'path': '/summary', 'value': 'new'}])
+        self.assertEqual(list(patched), list(self.doc))
+
+    def test_make_json_patch_round_trips(self):
+        target = {'summary': 'new', 'experiences': [{'id': 'a', 'title': 'x'}, {'id': 'b'}, {'id': 'c'}],
+                  'skills': {'soft/skills': ['~tilde']}}
+        patch = make_json_patch(self.doc, target)
+        self.assertEqual(apply_json_patch(self.doc, patch), target)
+        self.assertIn({'op': 'add', 'path': '/experiences/-', 'value': {'id': 'c'}}, patch)
+        self.assertEqual(apply_json_patch(target, make_json_patch(target, self.doc)), self.doc)
+        self.assertEqual(make_json_patch(self.doc, self.doc), [])
+
+    def test_pointer_escapes(self):
+        self.assertEqual(apply_json_patch({'a/b': {'c~d': 1}}, [{'op': 'replace', 'path': '/a~1b/c~0d', 'value': 2}]),
+                         {'a/b': {'c~d': 2}})
+
+    def test_failures_apply_nothing(self):
+        for patch in (
+            [{'op': 'replace', 'path': '/missing', 'value': 1}],
+            [{'op': 'remove', 'path': '/experiences/5'}],
+            [{'op': 'add', 'path': '/experiences/01', 'value': 1}],
+            [{'op': 'replace', 'path': '/summary', 'value': 'x'}, {'op': 'test', 'path': '/summary', 'value': 'old'}],
+            [{'op': 'move', 'from': '/skills', 'path': '/skills/inner'}],
+            [{'op': 'frobnicate', 'path': '/summary'}],
+            {'op': 'add'},
+        ):
+            with self.assertRaises(JsonPatchError):
+                apply_json_patch(self.doc, patch)
+        self.assertEqual(self.doc['summary'], 'old')
+
+    def test_merge_patch(self):
+        patched = apply_merge_patch(self.doc, {'summary': 'new', 'skills': {'soft_skills': ['teamwork']},
+                                               'experiences': [], 'extra': None})
+        self.assertEqual(patched, {'summary': 'new', 'experiences': [],
+                                   'skills': {'technical_skills': ['python'], 'soft_skills': ['teamwork']}})
+        self.assertNotIn('skills', apply_merge_patch(self.doc, {'skills': None}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+from backend import llm_client
+from backend.resume_builder.utils import translation, language_detector
+
+
+class TestLanguageDetector(unittest.TestCase):
+
+    def test_latin_languages(self):
+        samples = {
+            'en': "Managed a team of five developers and delivered the project on time.",
+            'es': "Gestioné un equipo de cinco desarrolladores y entregué el proyecto a tiempo.",
+            'fr': "J'ai dirigé une équipe de cinq développeurs et livré le projet dans les délais.",
+            'de': "Ich habe ein Team von fünf Entwicklern geleitet und das Projekt pünktlich abgeschlossen.",
+            'pt': "Gerenciei uma equipe de cinco desenvolvedores e entreguei o projeto no prazo.",
+        }
+        for expected, text in samples.items():
+            lang, confidence = language_detector.detect(text)
+            self.assertEqual(lang, expected, msg=text)
+            self.assertGreater(confidence, 0.8)
+
+    def test_script_languages(self):
+        self.assertEqual(language_detector.detect("经验丰富的软件工程师")[0], 'zh')
+        self.assertEqual(language_detector.detect("経験豊富なソフトウェアエンジニアです")[0], 'ja')
+        self.assertEqual(language_detector.detect("Опытный инженер-программист")[0], 'ru')
+        self.assertEqual(language_detector.detect("مهندس برمجيات ذو خبرة")[0], 'ar')
+        self.assertEqual(language_detector.detect("अनुभवी सॉफ्टवेयर इंजीनियर")[0], 'hi')
+
+    def test_empty_or_letterless_text(self):
+        self.assertEqual(language_detector.detect(""), ('en', 0.0))
+        self.assertEqual(language_detector.detect("2019 - 2023 / +49 123"), ('en', 0.0))
+
+    def test_detect_language_makes_no_api_call(self):
+        with patch.object(llm_client, 'chat_completion') as mock_call:
+            self.assertEqual(translation.detect_language("Habilidades de comunicación y liderazgo"), 'es')
+            mock_call.assert_not_called()
+
+    def test_llm_fallback_only_when_enabled_and_unsure(self):
+        with patch.object(translation, 'LANGUAGE_DETECTION_LLM_FALLBACK', True), \
+             patch.object(llm_client, 'is_configured', return_value=True), \
+             patch.object(llm_client, 'chat_completion', return_value='pt') as mock_call:
+            translation.detect_language("Managed a team of five developers and delivered the project on time.")
+            mock_call.assert_not_called()
+            self.assertEqual(translation.detect_language("2019"), 'pt')
+            self.assertEqual(mock_call.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
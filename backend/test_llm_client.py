@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import patch
+from backend import llm_client
+from backend.resume_builder.utils import translation
+from backend.resume_builder.utils.translation_memory import TranslationMemory
+
+
+class TestLLMClient(unittest.TestCase):
+
+    def setUp(self):
+        self.stub_url = llm_client.start_stub_server(responder=lambda prompt: "fr" if "Detect" in prompt else "Bonjour")
+        self.tm_patcher = patch.object(translation, 'translation_memory', TranslationMemory(path=''))
+        self.tm_patcher.start()
+
+    def tearDown(self):
+        self.tm_patcher.stop()
+        llm_client.stop_stub_server()
+
+    def test_chat_completion_uses_stub(self):
+        self.assertEqual(llm_client.chat_completion("Say hello"), "Bonjour")
+
+    def test_session_is_reused_across_calls(self):
+        session = llm_client.get_session()
+        llm_client.chat_completion("one")
+        llm_client.chat_completion("two")
+        self.assertIs(llm_client.get_session(), session)
+
+    def test_translation_goes_through_client(self):
+        self.assertEqual(translation.translate_text("Hello", target_lang='fr'), "Bonjour")
+        self.assertEqual(translation._detect_language_llm("Bonjour tout le monde"), "fr")
+
+    def test_translation_falls_back_on_client_error(self):
+        with patch.object(llm_client, 'chat_completion', side_effect=llm_client.LLMClientError("boom")):
+            self.assertEqual(translation.translate_text("Hello", target_lang='fr'), "Hello")
+
+    def test_not_configured_without_key_or_stub(self):
+        llm_client.stop_stub_server()
+        with patch.object(llm_client, 'MISTRAL_API_KEY', None), patch.object(llm_client, 'LLM_STUB_MODE', False):
+            self.assertFalse(llm_client.is_configured())
+            self.assertEqual(translation.translate_text("Hello", target_lang='fr'), "Hello")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import unittest
+import importlib.util
+from datetime import datetime
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from backend.extensions import db
+from backend import models  # noqa: F401  (registers the tables on db.metadata)
+
+VERSIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations', 'versions')
+
+
+def _load_chain():
+    """Every migration module, ordered by following down_revision from the base."""
+    modules = {}
+    for filename in os.listdir(VERSIONS_DIR):
+        if filename.endswith('.py'):
+            spec = importlib.util.spec_from_file_location(f'migration_{filename[:-3]}', os.path.join(VERSIONS_DIR, filename))
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            modules[module.down_revision] = module
+    chain, revision = [], None
+    while revision in modules:
+        chain.append(modules.pop(revision))
+        revision = chain[-1].revision
+    return chain, modules
+
+
+class MigrationChainTestCase(unittest.TestCase):
+    """Runs every migration in order on an empty SQLite database, as a fresh deploy would."""
+
+    def setUp(self):
+        self.engine = sa.create_engine('sqlite://')
+        self.chain, self.orphans = _load_chain()
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def _upgrade(self, conn, migrations):
+        with Operations.context(MigrationContext.configure(conn)):
+            for migration in migrations:
+                migration.upgrade()
+
+    def test_chain_is_linear(self):
+        self.assertEqual(self.orphans, {})
+        self.assertEqual([m.revision for m in self.chain], [f'{n:04d}' for n in range(1, len(self.chain) + 1)])
+
+    def test_upgrade_from_empty_database_builds_the_model_tables(self):
+        with self.engine.begin() as conn:
+            self._upgrade(conn, self.chain[:-1])
+            conn.execute(sa.text("INSERT INTO mock_interview (user_id, job_description, questions, created_at) "
+                                 "VALUES (1, 'Engineer', '[]', '2026-01-02 03:04:05')"))
+            self._upgrade(conn, self.chain[-1:])
+            inspector = sa.inspect(conn)
+            for table in ('resumes', 'cover_letters', 'mock_interview'):
+                columns = {c['name']: c for c in inspector.get_columns(table)}
+                self.assertTrue(set(db.metadata.tables[table].columns.keys()) <= set(columns), table)
+                self.assertFalse(columns['updated_at']['nullable'], table)
+                declared = {index.name for index in db.metadata.tables[table].indexes}
+                self.assertTrue(declared <= {index['name'] for index in inspector.get_indexes(table)}, table)
+            updated_at = conn.execute(sa.text("SELECT updated_at FROM mock_interview")).scalar()
+        self.assertEqual(str(updated_at), str(datetime(2026, 1, 2, 3, 4, 5)))  # Backfilled from created_at
+
+
+if __name__ == '__main__':
+    unittest.main()
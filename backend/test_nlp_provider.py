@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch
+import spacy
+from backend import nlp_provider
+from backend.mock_interview_app.utils import interview_analyzer, question_generator
+
+
+class TestNLPProvider(unittest.TestCase):
+
+    def setUp(self):
+        nlp_provider._nlp = None
+
+    def tearDown(self):
+        nlp_provider._nlp = None
+
+    def test_model_is_loaded_once(self):
+        with patch('spacy.load', return_value=spacy.blank('en')) as mock_load:
+            first = nlp_provider.get_nlp()
+            nlp_provider.process("Tell me about yourself.")
+            nlp_provider.process_many(["one", "two"], disable=nlp_provider.NER_ONLY)
+            self.assertIs(nlp_provider.get_nlp(), first)
+            self.assertEqual(mock_load.call_count, 1)
+
+    def test_disable_only_applies_to_present_components(self):
+        nlp = spacy.blank('en')
+        nlp.add_pipe('sentencizer')
+        with patch('spacy.load', return_value=nlp):
+            doc = nlp_provider.process("First sentence. Second one.", disable=('sentencizer', 'parser'))
+            self.assertFalse(doc.has_annotation('SENT_START'))
+            self.assertEqual(len(nlp_provider.process_many(["a", "b", "c"], disable=('sentencizer',))), 3)
+            self.assertEqual(nlp.pipe_names, ['sentencizer'])  # select_pipes restores the pipeline
+
+    def test_missing_model_falls_back_to_dummy(self):
+        with patch('spacy.load', side_effect=OSError("not found")):
+            self.assertIsInstance(nlp_provider.get_nlp(), nlp_provider.DummySpacyNLP)
+            scores = interview_analyzer.score_answer("Tell me about your experience with Python.", "I used Python for five years.", "Worked at Acme")
+            self.assertIn('overall', scores)
+            self.assertTrue(question_generator.generate_questions("We need a Python developer."))
+
+    def test_analyzers_share_the_provider(self):
+        with patch('spacy.load', side_effect=OSError("not found")) as mock_load:
+            interview_analyzer.extract_skill_from_question("Describe your experience with Docker.")
+            question_generator.generate_questions("Docker and Kubernetes experience required.", num_skill_questions=0)
+            self.assertEqual(mock_load.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
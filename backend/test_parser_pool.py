@@ -0,0 +1,108 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from backend.cover_letter_app.utils import file_utils
+from backend.cover_letter_app.utils.parser_pool import ParserPool, ParserPoolError
+
+
+def _pid():
+    return os.getpid()
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _crash():
+    os._exit(1)
+
+
+def _fail():
+    raise ValueError('bad file')
+
+
+class TestParserPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ParserPool(size=2, timeout=2)
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_runs_in_worker_processes(self):
+        self.assertNotEqual(self.pool.run(_pid), os.getpid())
+
+    def test_jobs_run_in_parallel(self):
+        from concurrent.futures import ThreadPoolExecutor
+        self.pool.run(_pid)  # Make sure both workers are warm
+        self.pool.run(_pid)
+        start = time.monotonic()
+        with ThreadPoolExecutor(2) as executor:
+            list(executor.map(lambda _: self.pool.run(_sleep, 0.5), range(2)))
+        self.assertLess(time.monotonic() - start, 0.9)
+
+    def test_timeout_kills_and_replaces_worker(self):
+        with self.assertRaises(ParserPoolError):
+            self.pool.run(_sleep, 10)
+        self.assertEqual(self.pool.run(_sleep, 0), 0)
+        self.assertGreaterEqual(self.pool.stats['timeouts'], 1)
+
+    def test_crash_is_isolated(self):
+        with self.assertRaises(ParserPoolError):
+            self.pool.run(_crash)
+        with self.assertRaises(ParserPoolError):
+            self.pool.run(_fail)
+        self.assertIsInstance(self.pool.run(_pid), int)
+
+    def test_worker_killed_while_idle_is_replaced(self):
+        pool = ParserPool(size=1, timeout=5)
+        pool.start()
+        try:
+            self.assertIsInstance(pool.run(_pid), int)
+            dead = pool._workers[0]
+            dead.process.kill()
+            dead.process.join(5)
+            with self.assertRaises(ParserPoolError):
+                pool.run(_pid)
+            self.assertIsNot(pool._workers[0], dead)
+            self.assertIsInstance(pool.run(_pid), int)  # The replacement takes the next job
+        finally:
+            pool.shutdown()
+
+    def test_worker_dying_at_startup_is_replaced(self):
+        pool = ParserPool(size=1, timeout=5)
+        pool.start()
+        try:
+            pool._workers[0].process.kill()  # Before it reports ready
+            with self.assertRaises(ParserPoolError):
+                pool.run(_pid)
+            self.assertIsInstance(pool.run(_pid), int)
+        finally:
+            pool.shutdown()
+
+    def test_extract_text_dispatches_to_pool(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'resume.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('Built Kafka pipelines.')
+            original = file_utils.parser_pool
+            file_utils.parser_pool = self.pool
+            try:
+                jobs = self.pool.stats['jobs']
+                self.assertEqual(file_utils.extract_text_from_file(path), 'Built Kafka pipelines.')
+                self.assertEqual(self.pool.stats['jobs'], jobs + 1)
+            finally:
+                file_utils.parser_pool = original
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
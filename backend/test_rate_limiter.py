@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from flask import Flask
+from backend import rate_limiter
+from backend.rate_limiter import RateLimiter, SQLiteRateLimitStore, rate_limit
+
+
+class TestRateLimitStores(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'limits.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_limit_is_shared_between_workers(self):
+        # Two stores on one file stand in for two gunicorn workers
+        worker_a, worker_b = SQLiteRateLimitStore(self.path), SQLiteRateLimitStore(self.path)
+        results = [store.hit('ip', 5, 60, 1000.0)[0] for store in (worker_a, worker_b) * 3]
+        self.assertEqual(results, [True] * 5 + [False])
+
+    def test_sliding_window_weights_previous_window(self):
+        for store in (SQLiteRateLimitStore(self.path), rate_limiter.MemoryRateLimitStore()):
+            for _ in range(5):
+                self.assertTrue(store.hit('ip', 5, 60, 1200.0)[0])
+            # A quarter into the next window 75% of the previous count still applies: 3.75, then 4.75
+            self.assertTrue(store.hit('ip', 5, 60, 1275.0)[0])
+            self.assertTrue(store.hit('ip', 5, 60, 1275.0)[0])
+            self.assertFalse(store.hit('ip', 5, 60, 1275.0)[0])
+            # Two windows later the old counts are gone
+            self.assertTrue(store.hit('ip', 5, 60, 1400.0)[0])
+
+    def test_expired_keys_are_evicted(self):
+        store = SQLiteRateLimitStore(self.path)
+        with patch.object(rate_limiter, 'RATE_LIMIT_PRUNE_EVERY', 2):
+            store.hit('old', 5, 60, 0.0)
+            store.hit('new', 5, 60, 10000.0)
+        keys = [row[0] for row in store._db().execute('SELECT key FROM rate_limits')]
+        self.assertEqual(keys, ['new'])
+
+
+class TestRateLimitDecorator(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['RATELIMIT_ENABLED'] = True
+
+        @self.app.route('/limited', methods=['GET', 'POST'])
+        @rate_limit(2, 60, methods=('POST',))
+        def limited():
+            return 'ok'
+
+        self.client = self.app.test_client()
+        self.patcher = patch.object(rate_limiter, 'limiter', RateLimiter(path=''))
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_returns_429_with_retry_after(self):
+        self.assertEqual(self.client.post('/limited').status_code, 200)
+        self.assertEqual(self.client.post('/limited').status_code, 200)
+        response = self.client.post('/limited')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.get_json()['error'], 'Too many requests')
+        self.assertGreater(int(response.headers['Retry-After']), 0)
+        self.assertEqual(self.client.get('/limited').status_code, 200)  # GET is not counted
+
+    def test_disabled_under_testing_by_default(self):
+        del self.app.config['RATELIMIT_ENABLED']
+        self.app.testing = True
+        for _ in range(5):
+            self.assertEqual(self.client.post('/limited').status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
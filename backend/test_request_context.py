@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from flask import Flask
+from flask_login import login_user
+from backend.extensions import db, login_manager
+from backend.models import User
+from backend import credit_service
+from backend.request_context import user_snapshot, invalidate_user_snapshot, query_count
+from backend.utils import tier_required, consume_credit, get_user_credits, CREDIT_TYPE_RESUME_AI
+
+
+class RequestContextTestCase(unittest.TestCase):
+    """Query budgets for the request-scoped user/credit snapshot."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SECRET_KEY'] = 'test'
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'snapshot.db')}"
+        db.init_app(self.app)
+        login_manager.init_app(self.app)
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='snap@example.com', username='snap', password_hash='x', tier='starter')
+            db.session.add(user)
+            db.session.commit()
+            credit_service.grant(user.id, 'legacy', 5)
+            credit_service.grant(user.id, CREDIT_TYPE_RESUME_AI, 3)
+            db.session.commit()
+            self.user_id = user.id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_snapshot_is_one_query_per_request(self):
+        with self.app.test_request_context():
+            before = query_count()
+            snapshot = user_snapshot(self.user_id)
+            self.assertEqual(snapshot.tier, 'starter')
+            self.assertEqual(snapshot.credit('legacy').amount, 5)
+            self.assertEqual(snapshot.credit(CREDIT_TYPE_RESUME_AI).amount, 3)
+            self.assertIsNone(snapshot.credit('deep_dive'))
+            self.assertIs(user_snapshot(self.user_id), snapshot)
+            self.assertEqual(query_count() - before, 1)
+            invalidate_user_snapshot(self.user_id)
+            self.assertIsNot(user_snapshot(self.user_id), snapshot)
+        # Each request starts with an empty snapshot cache and counter
+        with self.app.test_request_context():
+            self.assertEqual(query_count(), 0)
+
+    def test_credit_spending_request_budget(self):
+        @tier_required('starter')
+        def spend():
+            balance = get_user_credits(self.user_id, CREDIT_TYPE_RESUME_AI)
+            return balance, consume_credit(self.user_id, CREDIT_TYPE_RESUME_AI)
+
+        with self.app.test_request_context():
+            login_user(db.session.get(User, self.user_id))
+            before = query_count()
+            self.assertEqual(spend(), (3, True))
+            # Snapshot, conditional UPDATE, balance read and ledger INSERT; no repeated user lookups
+            self.assertLessEqual(query_count() - before, 4)
+
+    def test_missing_user(self):
+        with self.app.test_request_context():
+            self.assertIsNone(user_snapshot(9999))
+            self.assertFalse(consume_credit(9999, 'legacy'))
+
+
+if __name__ == '__main__':
+    unittest.main()
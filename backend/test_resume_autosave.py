@@ -0,0 +1,121 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from flask import Flask
+from backend.extensions import db
+from backend.models import User, Resume
+from backend.json_patch import JsonPatchError
+from backend.resume_autosave import patch_resume, save_content, ResumeNotFound, VersionConflict
+
+
+class ResumeAutosaveTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'autosave.db')}"
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        user = User(email='a@example.com', username='a', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        resume = Resume(user_id=user.id, title='R', content=json.dumps({'summary': 'old', 'experiences': []}))
+        db.session.add(resume)
+        db.session.commit()
+        self.resume_id = resume.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _content(self):
+        return json.loads(db.session.get(Resume, self.resume_id).content)
+
+    def test_patches_advance_the_version(self):
+        self.assertEqual(db.session.get(Resume, self.resume_id).version, 1)
+        version = patch_resume(self.resume_id, self.user_id, 1, [{'op': 'replace', 'path': '/summary', 'value': 'new'}])
+        db.session.commit()
+        self.assertEqual(version, 2)
+        version = patch_resume(self.resume_id, self.user_id, 2, {'experiences': [{'id': 'x'}]},
+                               patch_format='merge-patch', title='Renamed')
+        db.session.commit()
+        self.assertEqual(version, 3)
+        db.session.expire_all()
+        resume = db.session.get(Resume, self.resume_id)
+        self.assertEqual((resume.version, resume.title), (3, 'Renamed'))
+        self.assertEqual(self._content(), {'summary': 'new', 'experiences': [{'id': 'x'}]})
+
+    def test_stale_base_version_conflicts(self):
+        patch_resume(self.resume_id, self.user_id, 1, {'summary': 'first'}, patch_format='merge-patch')
+        db.session.commit()
+        with self.assertRaises(VersionConflict) as ctx:
+            patch_resume(self.resume_id, self.user_id, 1, {'summary': 'second'}, patch_format='merge-patch')
+        self.assertEqual(ctx.exception.current_version, 2)
+        db.session.rollback()
+        self.assertEqual(self._content()['summary'], 'first')
+
+    def test_lost_race_is_detected_by_the_conditional_update(self):
+        # Simulate a concurrent save landing between the read and the write
+        original_execute = db.session.execute
+        calls = []
+
+        def execute(statement, *args, **kwargs):
+            calls.append(statement)
+            if len(calls) == 2:
+                original_execute(db.update(Resume).where(Resume.id == self.resume_id).values(version=Resume.version + 1))
+            return original_execute(statement, *args, **kwargs)
+
+        db.session.execute = execute
+        try:
+            with self.assertRaises(VersionConflict) as ctx:
+                patch_resume(self.resume_id, self.user_id, 1, {'summary': 'lost'}, patch_format='merge-patch')
+        finally:
+            del db.session.execute
+        self.assertEqual(ctx.exception.current_version, 2)
+
+    def test_full_save_from_a_stale_base_does_not_overwrite_a_patch(self):
+        patch_resume(self.resume_id, self.user_id, 1, {'summary': 'patched'}, patch_format='merge-patch')
+        db.session.commit()
+        with self.assertRaises(VersionConflict) as ctx:
+            save_content(self.resume_id, self.user_id, json.dumps({'summary': 'full'}), 'R', base_version=1)
+        self.assertEqual(ctx.exception.current_version, 2)
+        db.session.rollback()
+        self.assertEqual(self._content()['summary'], 'patched')
+        self.assertEqual(save_content(self.resume_id, self.user_id, json.dumps({'summary': 'full'}), 'R', base_version=2), 3)
+
+    def test_unversioned_full_save_retries_after_losing_the_race(self):
+        original_execute = db.session.execute
+        calls = []
+
+        def execute(statement, *args, **kwargs):
+            calls.append(statement)
+            if len(calls) == 2:  # A concurrent save lands between the first read and write
+                original_execute(db.update(Resume).where(Resume.id == self.resume_id).values(version=Resume.version + 1))
+            return original_execute(statement, *args, **kwargs)
+
+        db.session.execute = execute
+        try:
+            version = save_content(self.resume_id, self.user_id, json.dumps({'summary': 'full'}), 'R')
+        finally:
+            del db.session.execute
+        self.assertEqual(version, 3)
+        self.assertEqual(self._content(), {'summary': 'full'})
+
+    def test_errors(self):
+        with self.assertRaises(ResumeNotFound):
+            patch_resume(self.resume_id, self.user_id + 1, 1, [])
+        with self.assertRaises(JsonPatchError):
+            patch_resume(self.resume_id, self.user_id, 1, [{'op': 'remove', 'path': '/nope'}])
+        with self.assertRaises(JsonPatchError):
+            patch_resume(self.resume_id, self.user_id, 1, {}, patch_format='diff')
+        self.assertEqual(db.session.get(Resume, self.resume_id).version, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
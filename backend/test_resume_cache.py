@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+from backend import nlp_provider
+from backend.mock_interview_app.utils import resume_cache, question_generator
+from backend.test_interview_analyzer import CountingNLP
+
+
+class Ent:
+    def __init__(self, text, label):
+        self.text = text
+        self.label_ = label
+
+
+class EntityNLP(CountingNLP):
+    """Counting dummy pipeline whose docs carry a fixed set of entities."""
+
+    def __call__(self, text, disable=()):
+        doc = super().__call__(text, disable)
+        doc.ents = [Ent('Acme Corp', 'ORG'), Ent('Berlin', 'GPE'), Ent('Kafka', 'PRODUCT'), Ent('PyCon', 'EVENT')]
+        return doc
+
+
+RESUME = "Senior engineer at Acme Corp in Berlin. Built Kafka pipelines and spoke at PyCon."
+
+
+class TestResumeArtifactCache(unittest.TestCase):
+
+    def setUp(self):
+        self.nlp = EntityNLP()
+        self.cache = resume_cache.ResumeArtifactCache(max_size=2)
+        self.patchers = [patch.object(nlp_provider, '_nlp', self.nlp),
+                         patch.object(resume_cache, 'resume_cache', self.cache)]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_artifacts_cover_every_consumer(self):
+        artifacts = resume_cache.get_resume_artifacts(RESUME)
+        self.assertEqual(artifacts['keywords'], ['acme corp', 'berlin', 'kafka'])
+        self.assertEqual(artifacts['entity_labels']['pycon'], 'EVENT')
+        self.assertEqual(artifacts['skill_keywords'], ['acme corp', 'kafka'])
+        self.assertEqual(artifacts['hash'], resume_cache.content_hash(RESUME))
+
+    def test_resume_is_parsed_once_per_content_version(self):
+        resume_cache.get_resume_artifacts(RESUME)
+        resume_cache.get_resume_artifacts(RESUME)
+        question_generator.generate_questions("We need Python experience.", RESUME)
+        self.assertEqual(self.nlp.calls.count(RESUME), 1)
+        resume_cache.get_resume_artifacts(RESUME + " Now also Go.")
+        self.assertEqual(len([c for c in self.nlp.calls if c.startswith("Senior")]), 2)
+        self.assertEqual(self.cache.get_stats()['hits'], 2)
+
+    def test_lru_eviction(self):
+        for text in ("one", "two", "three"):
+            resume_cache.get_resume_artifacts(text)
+        self.assertIsNone(self.cache.get(resume_cache.content_hash("one")))
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import os
+import json
+import hashlib
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from flask import Flask
+from backend.extensions import db
+from backend.models import User, Resume, ResumeRevision
+from backend import resume_revisions
+from backend.resume_autosave import patch_resume, save_content, restore_revision
+from backend.resume_revisions import (
+    record_revision, revision_content, list_revisions, revisions_to_keep, compact_revisions,
+    serialize_content, RevisionNotFound, SNAPSHOT, DELTA,
+)
+
+
+def _doc(i):
+    # Hashes keep the text from compressing away, like real prose
+    experiences = [{'id': n, 'achievements': [hashlib.sha256(f'{n}'.encode()).hexdigest() * 3]} for n in range(i % 4 + 1)]
+    skills = [hashlib.md5(f'skill{k}'.encode()).hexdigest() for k in range(30)]
+    return {'summary': f'Summary revision {i}', 'experiences': experiences, 'skills': {'technical_skills': skills}}
+
+
+class ResumeRevisionsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'revisions.db')}"
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.interval = resume_revisions.REVISION_SNAPSHOT_INTERVAL
+        resume_revisions.REVISION_SNAPSHOT_INTERVAL = 4
+        user = User(email='r@example.com', username='r', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        resume = Resume(user_id=user.id, title='R', content=serialize_content(_doc(1)), version=1)
+        db.session.add(resume)
+        db.session.flush()
+        record_revision(resume.id, 1, resume.content)
+        db.session.commit()
+        self.resume_id = resume.id
+
+    def tearDown(self):
+        resume_revisions.REVISION_SNAPSHOT_INTERVAL = self.interval
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _save_versions(self, last):
+        version = db.session.get(Resume, self.resume_id).version
+        for i in range(version + 1, last + 1):
+            patch_resume(self.resume_id, self.user_id, i - 1, _doc(i), patch_format='merge-patch')
+            db.session.commit()
+
+    def _kinds(self):
+        return [kind for _, kind, _, _ in reversed(list_revisions(self.resume_id))]
+
+    def test_saves_store_deltas_between_periodic_snapshots(self):
+        self._save_versions(10)
+        self.assertEqual(self._kinds(), [SNAPSHOT, DELTA, DELTA, DELTA, DELTA, SNAPSHOT, DELTA, DELTA, DELTA, DELTA])
+        for version in range(1, 11):
+            self.assertEqual(revision_content(self.resume_id, version), serialize_content(_doc(version)))
+        sizes = {row.version: len(row.payload) for row in ResumeRevision.query.options(db.undefer(ResumeRevision.payload))}
+        self.assertLess(sizes[2], sizes[1] / 2)  # A delta is a fraction of a snapshot
+        with self.assertRaises(RevisionNotFound):
+            revision_content(self.resume_id, 11)
+
+    def test_first_save_keeps_the_replaced_content(self):
+        resume = Resume(user_id=self.user_id, title='Legacy', content='{"summary":"before history"}', version=3)
+        db.session.add(resume)
+        db.session.commit()
+        patch_resume(resume.id, self.user_id, 3, {'summary': 'after'}, patch_format='merge-patch')
+        db.session.commit()
+        self.assertEqual(revision_content(resume.id, 3), '{"summary":"before history"}')
+        self.assertEqual(revision_content(resume.id, 4), '{"summary":"after"}')
+
+    def test_content_that_a_delta_cannot_reproduce_is_snapshotted(self):
+        record_revision(self.resume_id, 2, json.dumps(_doc(2), indent=2), previous_content=serialize_content(_doc(1)))
+        record_revision(self.resume_id, 3, 'plain text resume', previous_content=json.dumps(_doc(2), indent=2))
+        db.session.commit()
+        self.assertEqual(self._kinds(), [SNAPSHOT, SNAPSHOT, SNAPSHOT])
+        self.assertEqual(revision_content(self.resume_id, 2), json.dumps(_doc(2), indent=2))
+
+    def test_previous_content_from_another_version_is_snapshotted(self):
+        self._save_versions(2)
+        # A caller whose 'previous' content is not what revision 2 holds must not get a delta chained onto it
+        record_revision(self.resume_id, 3, serialize_content(_doc(3)), previous_content=serialize_content(_doc(1)))
+        db.session.commit()
+        self.assertEqual(self._kinds(), [SNAPSHOT, DELTA, SNAPSHOT])
+        self.assertEqual(revision_content(self.resume_id, 3), serialize_content(_doc(3)))
+
+    def test_history_matches_the_row_when_saves_race(self):
+        original_execute = db.session.execute
+        calls = []
+
+        def execute(statement, *args, **kwargs):
+            calls.append(statement)
+            if len(calls) == 2:  # A patch commits between the full save's read and its write
+                db.session.execute = original_execute
+                patch_resume(self.resume_id, self.user_id, 1, {'summary': 'concurrent'}, patch_format='merge-patch')
+            return original_execute(statement, *args, **kwargs)
+
+        db.session.execute = execute
+        try:
+            version = save_content(self.resume_id, self.user_id, serialize_content(_doc(3)), 'Full save')
+        finally:
+            del db.session.execute
+        db.session.commit()
+        self.assertEqual(version, 3)
+        resume = db.session.get(Resume, self.resume_id)
+        self.assertEqual(revision_content(self.resume_id, 3), resume.content)
+        self.assertEqual(json.loads(revision_content(self.resume_id, 2))['summary'], 'concurrent')
+
+    def test_restore_saves_old_content_as_new_version(self):
+        self._save_versions(3)
+        version = restore_revision(self.resume_id, self.user_id, 1)
+        db.session.commit()
+        self.assertEqual(version, 4)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Resume, self.resume_id).content, serialize_content(_doc(1)))
+        self.assertEqual(revision_content(self.resume_id, 4), serialize_content(_doc(1)))
+
+    def test_retention_policy(self):
+        now = datetime(2026, 6, 30, 12)
+        revisions = [
+            (1, now - timedelta(days=200)),                 # Past retention: dropped
+            (2, now - timedelta(days=30, hours=3)),         # Same day as 3: superseded
+            (3, now - timedelta(days=30, hours=1)),
+            (4, now - timedelta(days=10)),
+            (5, now - timedelta(days=2)),                   # Recent: all kept
+            (6, now - timedelta(hours=1)),
+        ]
+        self.assertEqual(revisions_to_keep(revisions, now, keep_all_days=7, retention_days=90), {3, 4, 5, 6})
+        self.assertEqual(revisions_to_keep(revisions[:1], now, keep_all_days=7, retention_days=90), {1})  # Latest always stays
+        self.assertEqual(revisions_to_keep(revisions, now, keep_all_days=7, retention_days=0), {1, 3, 4, 5, 6})
+
+    def test_compaction_drops_old_revisions_and_rechains_the_rest(self):
+        self._save_versions(12)
+        now = datetime.utcnow()
+        # Versions 1-8 were saved on one day long ago, 9-12 are recent
+        db.session.execute(db.update(ResumeRevision).where(ResumeRevision.version <= 8)
+                           .values(created_at=now - timedelta(days=20)))
+        db.session.commit()
+        expected = {v: revision_content(self.resume_id, v) for v in range(8, 13)}
+
+        stats = compact_revisions(self.resume_id, now)
+        db.session.commit()
+        self.assertEqual((stats['kept'], stats['removed']), (5, 7))
+        self.assertLess(stats['bytes_after'], stats['bytes_before'])
+        self.assertEqual([row.version for row in reversed(list_revisions(self.resume_id))], [8, 9, 10, 11, 12])
+        self.assertEqual(self._kinds(), [SNAPSHOT, DELTA, DELTA, DELTA, DELTA])
+        for version, content in expected.items():
+            self.assertEqual(revision_content(self.resume_id, version), content)
+        with self.assertRaises(RevisionNotFound):
+            revision_content(self.resume_id, 3)
+
+        # Saving after a compaction continues the chain
+        self._save_versions(13)
+        self.assertEqual(revision_content(self.resume_id, 13), serialize_content(_doc(13)))
+
+
+if __name__ == '__main__':
+    unittest.main()
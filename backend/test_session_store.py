@@ -0,0 +1,119 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from flask import Flask, session
+from backend.session_store import SQLiteSessionStore, RedisSessionStore, ServerSideSessionInterface
+
+
+class FakeRedis:
+    """Minimal in-process stand-in speaking the subset of the Redis API the store uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value if isinstance(value, bytes) else value.encode(), time.time() + ex)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def ttl(self, key):
+        return int(self.data[key][1] - time.time()) if key in self.data else -2
+
+
+class SessionStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.store = SQLiteSessionStore(os.path.join(self.tmpdir, 'sessions.db'))
+        self.app = self._make_app(self.store)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_app(self, store):
+        app = Flask(__name__)
+        app.secret_key = 'test'
+        app.session_interface = ServerSideSessionInterface(store, gc_interval=0)
+
+        @app.route('/set')
+        def set_value():
+            session['x'] = 1
+            session['flashes'] = [('info', 'hi')]
+            return 'ok'
+
+        @app.route('/read')
+        def read_value():
+            return str(session.get('x'))
+
+        @app.route('/clear')
+        def clear():
+            session.clear()
+            return 'ok'
+        return app
+
+    def _sid(self):
+        return self.client.get_cookie('session').value
+
+    def test_roundtrip_and_write_on_change_only(self):
+        response = self.client.get('/set')
+        self.assertIn('Set-Cookie', response.headers)
+        data, _ = self.store.get(self._sid())
+        self.assertIn('"x":1', data)
+        with patch.object(self.store, 'set', wraps=self.store.set) as spy:
+            response = self.client.get('/read')
+            self.assertEqual(response.data, b'1')
+            self.assertNotIn('Set-Cookie', response.headers)
+            spy.assert_not_called()
+
+    def test_anonymous_read_stores_nothing(self):
+        response = self.client.get('/read')
+        self.assertEqual(response.data, b'None')
+        self.assertNotIn('Set-Cookie', response.headers)
+        self.assertEqual(self.store._db().execute('SELECT COUNT(*) FROM sessions').fetchone()[0], 0)
+
+    def test_clear_deletes_row_and_cookie(self):
+        self.client.get('/set')
+        sid = self._sid()
+        response = self.client.get('/clear')
+        self.assertIn('session=;', response.headers['Set-Cookie'])
+        self.assertIsNone(self.store.get(sid))
+
+    def test_expiry_is_refreshed_when_half_used(self):
+        self.client.get('/set')
+        sid = self._sid()
+        data, _ = self.store.get(sid)
+        self.store.set(sid, data, time.time() + 60)  # Far less than half of the 31-day lifetime left
+        response = self.client.get('/read')
+        self.assertIn('Set-Cookie', response.headers)
+        self.assertGreater(self.store.get(sid)[1], time.time() + 24 * 3600)
+
+    def test_gc_removes_expired_sessions(self):
+        self.store.set('old', '{}', time.time() - 1)
+        self.store.set('live', '{}', time.time() + 60)
+        self.assertIsNone(self.store.get('old'))
+        self.assertEqual(self.store.gc(), 1)
+        self.assertIsNotNone(self.store.get('live'))
+
+    def test_redis_backend(self):
+        fake = FakeRedis()
+        client = self._make_app(RedisSessionStore(client=fake)).test_client()
+        client.get('/set')
+        sid = client.get_cookie('session').value
+        self.assertIn(f'session:{sid}', fake.data)
+        self.assertEqual(client.get('/read').data, b'1')
+        client.get('/clear')
+        self.assertEqual(fake.data, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
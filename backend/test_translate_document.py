@@ -0,0 +1,83 @@
+import json
+import re
+import time
+import unittest
+from unittest.mock import patch
+from backend import llm_client
+from backend.resume_builder.utils import translation
+from backend.resume_builder.utils.translation_memory import TranslationMemory
+
+STUB_DELAY = 0.3
+
+
+def stub_responder(prompt):
+    """Upper-cases the text to translate; JSON array prompts get a JSON array back."""
+    time.sleep(STUB_DELAY)
+    if 'JSON array' in prompt:
+        items = json.loads(prompt[prompt.index('\n\n[') + 2:])
+        return json.dumps([item.upper() for item in items])
+    return prompt.split('\n\n', 1)[1].upper()
+
+
+def sample_resume(num_experiences=6):
+    long_text = "Led a team of engineers delivering a payments platform used by millions of customers. " * 3
+    return {
+        "personal": {"full_name": "Jane Doe", "job_title": "Engineer", "email": "jane@example.com",
+                     "phone": "", "location": "Berlin", "linkedin": "", "portfolio": ""},
+        "summary": long_text,
+        "experiences": [{"id": str(i), "job_title": f"Developer {i}", "company": "Acme", "location": "Remote",
+                         "start_date": "2020", "end_date": "2021",
+                         "achievements": [f"Shipped feature {i} " * 8, f"Reduced costs by {i}0% " * 8]}
+                        for i in range(num_experiences)],
+        "education": [{"id": "e1", "degree": "BSc", "institution": "TU Berlin", "field_of_study": "Computer Science",
+                       "graduation_year": "2019", "gpa": ""}],
+        "skills": {"technical_skills": ["Python"], "soft_skills": ["Teamwork", "Leadership"], "certifications": []},
+        "additional": {"projects": "Open source maintainer", "languages": "", "volunteer": ""},
+        "template_settings": {"name": "professional"}
+    }
+
+
+class TestTranslateResumeDocument(unittest.TestCase):
+
+    def setUp(self):
+        llm_client.start_stub_server(responder=stub_responder)
+        self.tm_patcher = patch.object(translation, 'translation_memory', TranslationMemory(path=''))
+        self.tm_patcher.start()
+
+    def tearDown(self):
+        self.tm_patcher.stop()
+        llm_client.stop_stub_server()
+
+    def test_translates_fields_and_keeps_structure(self):
+        result = json.loads(translation.translate_resume_document(json.dumps(sample_resume()), 'de'))
+        self.assertEqual(result['personal']['job_title'], 'ENGINEER')
+        self.assertEqual(result['personal']['full_name'], 'Jane Doe')  # Names are not translated
+        self.assertEqual(result['experiences'][2]['job_title'], 'DEVELOPER 2')
+        self.assertEqual(result['experiences'][2]['company'], 'Acme')
+        self.assertEqual(len(result['experiences'][2]['achievements']), 2)
+        self.assertTrue(result['experiences'][2]['achievements'][0].startswith('SHIPPED FEATURE 2'))
+        self.assertEqual(result['skills']['soft_skills'], ['TEAMWORK', 'LEADERSHIP'])
+        self.assertEqual(result['skills']['technical_skills'], ['Python'])
+        self.assertEqual(result['template_settings'], {'name': 'professional'})
+
+    def test_latency_is_about_one_round_trip(self):
+        start = time.perf_counter()
+        translation.translate_resume_document(sample_resume(), 'fr')
+        elapsed = time.perf_counter() - start
+        # 6 experiences + summary = 7 large fields and one batch, TRANSLATION_MAX_WORKERS=6 -> two waves at most
+        self.assertLess(elapsed, STUB_DELAY * 3)
+
+    def test_second_translation_is_served_from_memory(self):
+        translation.translate_resume_document(sample_resume(), 'es')
+        with patch.object(llm_client, 'chat_completion') as mock_call:
+            translation.translate_resume_document(sample_resume(), 'es')
+            mock_call.assert_not_called()
+
+    def test_bad_batch_reply_falls_back_to_single_calls(self):
+        llm_client.start_stub_server(responder=lambda prompt: 'not json' if 'JSON array' in prompt else prompt.split('\n\n', 1)[1].upper())
+        result = translation.translate_resume_document(sample_resume(1), 'fr')
+        self.assertEqual(result['personal']['location'], 'BERLIN')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from backend import llm_client
+from backend.resume_builder.utils import translation
+from backend.resume_builder.utils.translation_memory import TranslationMemory
+
+
+class TestTranslationMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'tm.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_hit_and_miss_counters(self):
+        tm = TranslationMemory(path=self.db_path)
+        self.assertIsNone(tm.get('Hello', 'en', 'fr'))
+        tm.put('Hello', 'en', 'fr', 'Bonjour')
+        self.assertEqual(tm.get('Hello', 'en', 'fr'), 'Bonjour')
+        stats = tm.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_key_includes_language_pair(self):
+        tm = TranslationMemory(path='')
+        tm.put('Hello', 'en', 'fr', 'Bonjour')
+        self.assertIsNone(tm.get('Hello', 'en', 'es'))
+        self.assertIsNone(tm.get('Hello', None, 'fr'))
+
+    def test_lru_eviction_falls_back_to_disk(self):
+        tm = TranslationMemory(path=self.db_path, lru_size=2)
+        for word in ['one', 'two', 'three']:
+            tm.put(word, 'en', 'fr', word.upper())
+        self.assertEqual(tm.get_stats()['evictions'], 1)
+        self.assertEqual(tm.get('one', 'en', 'fr'), 'ONE')
+        self.assertEqual(tm.get_stats()['disk_hits'], 1)
+
+    def test_persists_across_instances(self):
+        TranslationMemory(path=self.db_path).put('Skills', 'en', 'de', 'Kenntnisse')
+        self.assertEqual(TranslationMemory(path=self.db_path).get('Skills', 'en', 'de'), 'Kenntnisse')
+
+    def test_disk_tier_is_size_bounded(self):
+        tm = TranslationMemory(path=self.db_path, lru_size=10, max_rows=50)
+        for i in range(150):
+            tm.put(f'text {i}', 'en', 'fr', f'texte {i}')
+        count = tm._db().execute('SELECT COUNT(*) FROM translation_memory').fetchone()[0]
+        self.assertLessEqual(count, 100)  # Pruned every 100 writes down to max_rows
+        self.assertGreater(tm.get_stats()['disk_evictions'], 0)
+
+    def test_translate_text_calls_api_once_for_repeated_text(self):
+        with patch.object(translation, 'translation_memory', TranslationMemory(path='')), \
+             patch.object(llm_client, 'is_configured', return_value=True), \
+             patch.object(llm_client, 'chat_completion', return_value='Ingeniero') as mock_call:
+            self.assertEqual(translation.translate_text('Engineer', target_lang='es'), 'Ingeniero')
+            self.assertEqual(translation.translate_text('Engineer', target_lang='es'), 'Ingeniero')
+            self.assertEqual(mock_call.call_count, 1)
+
+    def test_section_titles_need_no_api_call(self):
+        with patch.object(llm_client, 'chat_completion') as mock_call:
+            self.assertEqual(translation.translate_text('Work Experience', target_lang='fr'), 'Expérience Professionnelle')
+            mock_call.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
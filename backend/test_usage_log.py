@@ -0,0 +1,83 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from flask import Flask
+from backend.extensions import db
+from backend.models import User, FeatureUsageLog
+from backend.usage_log import UsageLogWriter
+from backend.request_context import query_count
+
+
+class UsageLogWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(self.tmpdir, 'usage.db')}"
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        user = User(email='u@example.com', username='u', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        self.writers = []
+
+    def tearDown(self):
+        for writer in self.writers:
+            writer.shutdown()
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _writer(self, **kwargs):
+        writer = UsageLogWriter(**kwargs)
+        writer.app = self.app
+        self.writers.append(writer)
+        return writer
+
+    def _rows(self):
+        db.session.expire_all()
+        return FeatureUsageLog.query.count()
+
+    def test_record_does_not_touch_database(self):
+        writer = self._writer(flush_interval_ms=60000)
+        before = query_count()
+        self.assertTrue(writer.record(self.user_id, 'dashboard_view'))
+        self.assertEqual(query_count(), before)
+        self.assertEqual(writer.get_stats()['pending'], 1)
+
+    def test_shutdown_flushes_in_batches(self):
+        writer = self._writer(flush_interval_ms=60000, batch_size=3)
+        for _ in range(7):
+            writer.record(self.user_id, 'dashboard_view', credits_used=1)
+        writer.shutdown()
+        self.assertEqual(self._rows(), 7)
+        stats = writer.get_stats()
+        self.assertEqual((stats['written'], stats['failed'], stats['pending']), (7, 0, 0))
+        self.assertGreaterEqual(stats['batches'], 3)
+
+    def test_full_buffer_drops_instead_of_blocking(self):
+        writer = self._writer(queue_size=2, flush_interval_ms=60000, batch_size=100)
+        results = [writer.record(self.user_id, 'dashboard_view') for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(writer.get_stats()['dropped'], 1)
+        writer.flush()
+        self.assertEqual(self._rows(), 2)
+
+    def test_background_flush_after_interval(self):
+        writer = self._writer(flush_interval_ms=50)
+        writer.record(self.user_id, 'dashboard_view')
+        deadline = time.time() + 5
+        while writer.get_stats()['written'] < 1 and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self._rows(), 1)
+        row = FeatureUsageLog.query.one()
+        self.assertEqual((row.user_id, row.feature_name, row.credits_used), (self.user_id, 'dashboard_view', 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import insert
+from .extensions import db
+from .models import FeatureUsageLog
+
+logger = logging.getLogger(__name__)
+
+USAGE_LOG_QUEUE_SIZE = int(os.getenv('USAGE_LOG_QUEUE_SIZE', 10000))  # Events buffered before new ones are dropped
+USAGE_LOG_FLUSH_INTERVAL_MS = int(os.getenv('USAGE_LOG_FLUSH_INTERVAL_MS', 1000))
+USAGE_LOG_BATCH_SIZE = int(os.getenv('USAGE_LOG_BATCH_SIZE', 500))  # A batch is written early once this many arrive
+
+
+class UsageLogWriter:
+    """Buffers FeatureUsageLog events in memory and bulk-inserts them from a background thread.
+
+    record() never blocks or touches the database: when the queue is full the
+    event is dropped and counted. The flusher writes one executemany INSERT per
+    batch, every flush_interval_ms or as soon as batch_size events are waiting.
+    Pending events are flushed at interpreter exit and on gunicorn worker exit.
+    """
+
+    def __init__(self, queue_size=USAGE_LOG_QUEUE_SIZE, flush_interval_ms=USAGE_LOG_FLUSH_INTERVAL_MS,
+                 batch_size=USAGE_LOG_BATCH_SIZE):
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.app = None
+        self._queue = None
+        self._pid = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.stats = {'recorded': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+
+    def init_app(self, app):
+        self.app = app
+        atexit.register(self.shutdown)
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # The flusher thread does not survive fork; each worker starts its own with an empty queue
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._stop.clear()
+            self._wakeup.clear()
+            if self.app is None:
+                self.app = current_app._get_current_object()
+            self._thread = threading.Thread(target=self._run, daemon=True, name='usage-log-flusher')
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def record(self, user_id, feature_name, credits_used=0, timestamp=None):
+        """Queue one usage event; returns False if it was dropped because the buffer is full."""
+        self._ensure_started()
+        event = {'user_id': user_id, 'feature_name': feature_name, 'credits_used': credits_used,
+                 'timestamp': timestamp or datetime.utcnow()}
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.stats['dropped'] += 1
+            if self.stats['dropped'] % 1000 == 1:
+                logger.warning(f"Usage log buffer full, {self.stats['dropped']} events dropped so far")
+            return False
+        self.stats['recorded'] += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _take_batch(self):
+        batch = []
+        try:
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)  # Set early by record() once a full batch is waiting
+            self._wakeup.clear()
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                self._write(batch)
+
+    def _write(self, batch):
+        with self._write_lock, self.app.app_context():
+            try:
+                db.session.execute(insert(FeatureUsageLog), batch)  # A list of rows runs as executemany
+                db.session.commit()
+                self.stats['written'] += len(batch)
+                self.stats['batches'] += 1
+            except Exception as e:
+                db.session.rollback()
+                self.stats['failed'] += len(batch)
+                logger.error(f"Failed to write {len(batch)} usage log events: {e}")
+            finally:
+                db.session.remove()
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        if self._pid != os.getpid():
+            return
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            self._write(batch)
+
+    def shutdown(self):
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(self.flush_interval + 5)
+        self.flush()
+        self._pid = None
+
+    def get_stats(self):
+        pending = self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0
+        return dict(self.stats, pending=pending)
+
+
+usage_log = UsageLogWriter()
@@ -5,13 +5,14 @@ from flask_login import login_required, current_user
 import logging # ADDED
 from datetime import datetime # ADDED
 from .extensions import db # ADDED for credit helpers
-from .models import User, Credit # ADDED for credit helpers
+from .models import User # ADDED for credit helpers
+from . import credit_service
+from .request_context import user_snapshot
 
 logger = logging.getLogger(__name__) # ENSURED logger is initialized
 
-# Constants
-MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
-MISTRAL_API_URL = os.getenv("MISTRAL_API_URL", "https://api.mistral.ai/v1/chat/completions")
+# Constants (Mistral settings live in llm_client; re-exported here for existing importers)
+from .llm_client import MISTRAL_API_KEY, MISTRAL_API_URL
 
 # Credit Type Constants (uncommented as they are used by routes)
 CREDIT_TYPE_RESUME_AI = 'resume_ai'
@@ -23,6 +24,12 @@ STARTER_MONTHLY_RESUME_AI_CREDITS = 10
 STARTER_MONTHLY_COVER_LETTER_AI_CREDITS = 5
 STARTER_MONTHLY_DEEP_DIVE_CREDITS = 1
 PRO_UNLIMITED_CREDITS = 99999 # Represents a large number for "unlimited"
+STARTER_MONTHLY_QUOTAS = {
+    CREDIT_TYPE_RESUME_AI: STARTER_MONTHLY_RESUME_AI_CREDITS,
+    CREDIT_TYPE_COVER_LETTER_AI: STARTER_MONTHLY_COVER_LETTER_AI_CREDITS,
+    CREDIT_TYPE_DEEP_DIVE: STARTER_MONTHLY_DEEP_DIVE_CREDITS,
+}
+CREDIT_RESET_CHUNK_SIZE = int(os.getenv('CREDIT_RESET_CHUNK_SIZE', 1000)) # Users per transaction in `flask reset-credits`
 
 
 def tier_required(required_tiers):
@@ -35,8 +42,9 @@ def tier_required(required_tiers):
             # Ensure current_user is loaded, might need g.user assignment if not automatically handled
             # In typical Flask-Login setup, current_user should be available.
             # If g.user is specifically needed by the decorator logic elsewhere, ensure it's set.
-            # For now, assume current_user is sufficient.
-            user_tier = current_user.tier
+            # The request snapshot also holds the user's credits, so credit checks after this are free.
+            snapshot = user_snapshot()
+            user_tier = snapshot.tier if snapshot else current_user.tier
 
             allowed = False
             if 'pro' in required_tiers and user_tier == 'pro':
@@ -71,11 +79,12 @@ def tier_required(required_tiers):
 
 def get_or_create_credit_record(user_id, credit_type):
     # Imports are now at the top of utils.py
-    credit_record = Credit.query.filter_by(user_id=user_id, credit_type=credit_type).first()
+    snapshot = user_snapshot(user_id) # User and all credit rows in one query, shared for the request
+    credit_record = snapshot.credit(credit_type) if snapshot else None
     if not credit_record:
         logger.info(f"Creating new credit record for user {user_id}, type {credit_type}")
         # Determine initial amount based on user's tier and credit type (example logic)
-        user = User.query.get(user_id)
+        user = snapshot.user if snapshot else None
         initial_amount = 0
         if user: # Check if user exists
             if user.tier == 'starter':
@@ -88,8 +97,11 @@ def get_or_create_credit_record(user_id, credit_type):
             elif user.tier == 'pro':
                 initial_amount = PRO_UNLIMITED_CREDITS
 
-        credit_record = Credit(user_id=user_id, credit_type=credit_type, amount=initial_amount, last_reset=datetime.utcnow())
-        db.session.add(credit_record)
+        # Opening the balance through the ledger keeps Credit.amount equal to the sum of its entries
+        credit_record = credit_service.set_balance(user_id, credit_type, initial_amount, reason=credit_service.REASON_OPENING)
+        credit_record.last_reset = datetime.utcnow()
+        if snapshot:
+            snapshot.add_credit(credit_record)
         try:
             db.session.commit()
         except Exception as e:
@@ -99,35 +111,14 @@ def get_or_create_credit_record(user_id, credit_type):
     return credit_record
 
 def get_user_credits(user_id, credit_type):
-    # Imports are at the top
+    # Monthly resets are applied in bulk by `flask reset-credits` (reset_starter_credits), not per request
     credit_record = get_or_create_credit_record(user_id, credit_type)
-    user = User.query.get(user_id)
-    if not user:
-        logger.error(f"User not found for ID {user_id} in get_user_credits.")
-        return 0 # Or raise error
-
-    if user.tier == 'starter' and credit_record:
-        today = datetime.utcnow()
-        if credit_record.last_reset and (today.year > credit_record.last_reset.year or today.month > credit_record.last_reset.month):
-            # Reset credits for the new month
-            if credit_type == CREDIT_TYPE_RESUME_AI:
-                credit_record.amount = STARTER_MONTHLY_RESUME_AI_CREDITS
-            elif credit_type == CREDIT_TYPE_COVER_LETTER_AI:
-                credit_record.amount = STARTER_MONTHLY_COVER_LETTER_AI_CREDITS
-            elif credit_type == CREDIT_TYPE_DEEP_DIVE:
-                credit_record.amount = STARTER_MONTHLY_DEEP_DIVE_CREDITS
-            credit_record.last_reset = today
-            try:
-                db.session.commit()
-            except Exception as e:
-                db.session.rollback()
-                logger.error(f"Error committing credit reset for user {user_id}, type {credit_type}: {e}")
-                # Potentially re-raise or handle gracefully
     return credit_record.amount if credit_record else 0
 
 def consume_credit(user_id, credit_type, amount_to_consume=1):
     # Imports are at the top
-    user = User.query.get(user_id)
+    snapshot = user_snapshot(user_id)
+    user = snapshot.user if snapshot else None
     if not user:
         logger.error(f"User not found for ID {user_id} during credit consumption.")
         return False
@@ -136,30 +127,16 @@ def consume_credit(user_id, credit_type, amount_to_consume=1):
         return True
 
     try:
-        credit_record = get_or_create_credit_record(user_id, credit_type)
-        if credit_record.last_reset is None: # Ensure last_reset is set if it's a new record from get_or_create
-            get_user_credits(user_id, credit_type) # This will set and commit last_reset if needed
-            credit_record = Credit.query.filter_by(user_id=user_id, credit_type=credit_type).first() # Re-fetch
-
-        # Check for monthly reset if needed (copied from get_user_credits)
-        if user.tier == 'starter':
-            today = datetime.utcnow()
-            if credit_record.last_reset and (today.year > credit_record.last_reset.year or today.month > credit_record.last_reset.month):
-                if credit_type == CREDIT_TYPE_RESUME_AI: credit_record.amount = STARTER_MONTHLY_RESUME_AI_CREDITS
-                elif credit_type == CREDIT_TYPE_COVER_LETTER_AI: credit_record.amount = STARTER_MONTHLY_COVER_LETTER_AI_CREDITS
-                elif credit_type == CREDIT_TYPE_DEEP_DIVE: credit_record.amount = STARTER_MONTHLY_DEEP_DIVE_CREDITS
-                credit_record.last_reset = today
-                # Commit is handled below or by get_or_create_credit_record
-
-        if credit_record and credit_record.amount >= amount_to_consume:
-            credit_record.amount -= amount_to_consume
-            db.session.commit()
-            logger.info(f"Consumed {amount_to_consume} credit(s) for user {user_id}, type {credit_type}. Remaining: {credit_record.amount}")
-            return True
-        else:
-            current_amount = credit_record.amount if credit_record else 0
-            logger.warning(f"Insufficient credits for user {user_id}, type {credit_type}. Has: {current_amount}, Needs: {amount_to_consume}")
-            return False
+        if not credit_service.consume(user_id, credit_type, amount_to_consume):
+            # Rare path: the record may not exist yet.
+            # get_user_credits creates (and commits) it, then the atomic consume is retried once.
+            if get_user_credits(user_id, credit_type) < amount_to_consume or \
+                    not credit_service.consume(user_id, credit_type, amount_to_consume):
+                db.session.rollback()
+                return False
+        db.session.commit()
+        logger.info(f"Consumed {amount_to_consume} credit(s) for user {user_id}, type {credit_type}.")
+        return True
     except Exception as e:
         logger.error(f"Error in consume_credit for user {user_id}, type {credit_type}: {e}")
         db.session.rollback() # Rollback on error
@@ -180,19 +157,11 @@ def reset_monthly_credits_for_user(user_id_or_obj):
     changes_made = False
     current_time = datetime.utcnow()
 
-    credit_configs = {
-        CREDIT_TYPE_RESUME_AI: STARTER_MONTHLY_RESUME_AI_CREDITS,
-        CREDIT_TYPE_COVER_LETTER_AI: STARTER_MONTHLY_COVER_LETTER_AI_CREDITS,
-        CREDIT_TYPE_DEEP_DIVE: STARTER_MONTHLY_DEEP_DIVE_CREDITS,
-    }
-
-    for credit_type, monthly_amount in credit_configs.items():
+    for credit_type, monthly_amount in STARTER_MONTHLY_QUOTAS.items():
         try:
-            credit_record = get_or_create_credit_record(user.id, credit_type)
             # No need to check last_reset here, as this function is for explicit reset (e.g. on subscription renewal)
-            credit_record.amount = monthly_amount
+            credit_record = credit_service.set_balance(user.id, credit_type, monthly_amount)
             credit_record.last_reset = current_time
-            db.session.add(credit_record)
             changes_made = True
             logger.info(f"Reset credits for user {user.id}, type {credit_type} to {monthly_amount}.")
         except Exception as e:
@@ -210,3 +179,34 @@ def reset_monthly_credits_for_user(user_id_or_obj):
             logger.error(f"Error committing all credit resets for user {user.id}: {e}")
             return False
     return False
+
+def reset_starter_credits(month_start=None, chunk_size=CREDIT_RESET_CHUNK_SIZE, progress=None):
+    """Reset every Starter user's monthly credits for the month beginning at month_start (default: this month).
+
+    Users are processed in id order, chunk_size per transaction, with a handful of set-based
+    statements per chunk. Balances already reset this month are skipped, so the job can be
+    re-run or resumed safely. progress(users_done, users_total, rows_reset) is called per chunk.
+    Returns the number of credit rows reset.
+    """
+    if month_start is None:
+        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    users_total = User.query.filter_by(tier='starter').count()
+    users_done, rows_reset, last_id = 0, 0, 0
+    while True:
+        user_ids = [row.id for row in db.session.query(User.id).filter(User.tier == 'starter', User.id > last_id)
+                    .order_by(User.id).limit(chunk_size)]
+        if not user_ids:
+            break
+        try:
+            rows_reset += credit_service.reset_monthly_balances(STARTER_MONTHLY_QUOTAS, month_start, user_ids)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Monthly credit reset failed after user {last_id}: {e}")
+            raise
+        last_id = user_ids[-1]
+        users_done += len(user_ids)
+        if progress:
+            progress(users_done, users_total, rows_reset)
+    logger.info(f"Monthly credit reset for {month_start:%Y-%m}: {rows_reset} balances reset for {users_done} users.")
+    return rows_reset
@@ -2,6 +2,8 @@
 
 // --- Global State ---
 let globalResumeId = null; // Set from Flask data via inline script
+let globalResumeVersion = null; // Server version the last save was based on
+let lastSavedResumeData = null; // Content as stored on the server, diffed against to build patches
 let currentResumeData = {}; // Main data object
 let defaultResumeStructure = {
     personal: { full_name: "", job_title: "", email: "", phone: "", location: "", linkedin: "", portfolio: "" },
@@ -29,6 +31,29 @@ function isObject(item) {
     return (item && typeof item === 'object' && !Array.isArray(item));
 }
 
+// RFC 7396 merge patch turning `saved` into `current`: changed keys only, arrays replaced whole,
+// null for removed keys. Returns null if the change sets an object member to null, which a merge patch can't express.
+function buildMergePatch(saved, current) {
+    const patch = {};
+    for (const key of Object.keys(saved)) {
+        if (current[key] === undefined) patch[key] = null;
+    }
+    for (const key of Object.keys(current)) {
+        const value = current[key];
+        if (value === undefined) continue;
+        if (value === null) {
+            if (saved[key] !== null) return null;
+        } else if (isObject(value)) {
+            const nested = buildMergePatch(isObject(saved[key]) ? saved[key] : {}, value);
+            if (nested === null) return null;
+            if (Object.keys(nested).length || !isObject(saved[key])) patch[key] = nested;
+        } else if (JSON.stringify(value) !== JSON.stringify(saved[key])) {
+            patch[key] = value;
+        }
+    }
+    return patch;
+}
+
 function deepMerge(target, ...sources) {
     if (!sources.length) return target;
     const source = sources.shift();
@@ -192,6 +217,7 @@ function processSectionContent(parsedData, sectionName, content) {
 // --- Initialization ---
 document.addEventListener('DOMContentLoaded', function() {
     globalResumeId = currentResumeId;
+    globalResumeVersion = currentResumeVersion;
     currentResumeData = JSON.parse(JSON.stringify(defaultResumeStructure));
 
     const titleInput = document.getElementById('resumeTitleInput');
@@ -202,6 +228,7 @@ document.addEventListener('DOMContentLoaded', function() {
     if (initialResumeContentJsonString) {
         try {
             const parsedContent = JSON.parse(initialResumeContentJsonString);
+            if (isObject(parsedContent)) lastSavedResumeData = JSON.parse(initialResumeContentJsonString);
             deepMerge(currentResumeData, parsedContent);
             ['experiences', 'education'].forEach(key => {
                 if (!Array.isArray(currentResumeData[key])) currentResumeData[key] = [];
@@ -945,10 +972,18 @@ async function saveResumeDataToServer() {
     }
 
     const contentToSaveStr = JSON.stringify(currentResumeData);
-    const payload = { title: titleToSave, content: contentToSaveStr, resume_id: globalResumeId };
+    // Existing resumes send only what changed since the last save; the full document is the fallback
+    const mergePatch = (globalResumeId && globalResumeVersion !== null && lastSavedResumeData)
+        ? buildMergePatch(lastSavedResumeData, JSON.parse(contentToSaveStr)) : null;
+    let url = '/resume-builder/formatter/save_resume_data';
+    let payload = { title: titleToSave, content: contentToSaveStr, resume_id: globalResumeId, version: globalResumeVersion };
+    if (mergePatch !== null) {
+        url = `/resume-builder/formatter/resume/${globalResumeId}/patch`;
+        payload = { title: titleToSave, version: globalResumeVersion, format: 'merge-patch', patch: mergePatch };
+    }
 
     try {
-        const response = await fetch('/resume_builder/formatter/save_resume_data', {
+        const response = await fetch(url, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify(payload)
@@ -957,8 +992,10 @@ async function saveResumeDataToServer() {
         if (result.success) {
             if (result.resume_id && (globalResumeId === null || globalResumeId === undefined)) {
                 globalResumeId = result.resume_id;
-                history.pushState({resumeId: globalResumeId}, "", `/resume_builder/formatter/edit/${globalResumeId}`);
+                history.pushState({resumeId: globalResumeId}, "", `/resume-builder/formatter/edit/${globalResumeId}`);
             }
+            globalResumeVersion = result.version;
+            lastSavedResumeData = JSON.parse(contentToSaveStr);
             showToast(result.message || 'Resume saved successfully!', 'success');
             updateLastUpdatedTimestamp();
         } else {
@@ -0,0 +1,23 @@
+# gunicorn.conf.py
+# Picked up automatically by gunicorn when started from the project root (see Procfile).
+import os
+
+
+def on_starting(server):
+    """Load the spaCy model once in the master so forked workers share it copy-on-write."""
+    if os.getenv('SPACY_PRELOAD', '1') == '1':
+        from backend.nlp_provider import preload
+        preload()
+
+
+def post_fork(server, worker):
+    """Start each worker's document parser processes before it takes requests, so the first upload isn't slowed by their startup."""
+    from backend.cover_letter_app.utils.parser_pool import parser_pool
+    if parser_pool.size > 0:
+        parser_pool.start()
+
+
+def worker_exit(server, worker):
+    """Write buffered feature usage events before the worker goes away."""
+    from backend.usage_log import usage_log
+    usage_log.shutdown()
@@ -25,6 +25,14 @@ EXPECTED_CHECKSUMS = {
     "0002_add_username_fields.py": "507e373c95c57382f7e96915d60153a0e28d980a7a4407f1991950fcf988769d",
     "0003_create_mock_interview_table.py": "2a0052ba6713d19597595b997f99990711a8367355b497a2cb177f96209a3e24",
     "0004_implement_new_credit_system.py": "0bf8d0a77d99878390bf48728380353126905f070ac580ac8f81be7b52e9663c",
+    "0005_create_background_jobs_table.py": "ef8d1c6979bf8f187414e25084fc345670d6b6e52e7b5a00704d6ea2a8ce8a60",
+    "0006_create_credit_ledger_table.py": "30e0ea1354a46ef699ecdd498a751a0f59ba68273ab3de4ef1d41875d8d80ecb",
+    "0007_add_mock_interview_archive_columns.py": "26e9213f4b1a1fe6ddac7c24188921e8f7f8592d9e6c499c3dbef9d5e04d9838",
+    "0008_add_listing_composite_indexes.py": "7c47a6382f99e3995ad106544d44da42e76bb54de448827887c3d156e34e87b2",
+    "0009_add_resume_version.py": "a9d4a9d265b6e29d860bfd46c1c45507ed0446470ace6880bc724054020786a9",
+    "0010_create_resume_revisions_table.py": "6564d10ce960f5442fedcefbd8b836e2862d78cea935f83faec8fdcd037565a4",
+    "0011_add_resume_revision_content_hash.py": "0f0dd84f0772212c424f3adcb037bb716f9b0d9d5c50466119ede3d2225aff1f",
+    "0012_make_document_updated_at_not_null.py": "047eca70446aa4d8401ee1d5292f7cbd9d4961bf3cca36a0f5da07cdf1d88234",
 }
 
 # Placeholder for MIGRATIONS_TO_APPLY - to be populated later
@@ -245,6 +253,303 @@ def downgrade():
     )
     # Drop credits table
     op.drop_table('credits')
+"""
+    },
+    {
+        'filename': '0005_create_background_jobs_table.py',
+        'content': """\"\"\"create_background_jobs_table
+
+Revision ID: '0005'
+Revises: '0004'
+Create Date: '2026-10-18 10:00:00.000000'
+
+\"\"\"
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'background_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('message', sa.String(length=255), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+def downgrade():
+    op.drop_table('background_jobs')
+"""
+    },
+    {
+        'filename': '0006_create_credit_ledger_table.py',
+        'content': """\"\"\"create_credit_ledger_table
+
+Revision ID: '0006'
+Revises: '0005'
+Create Date: '2026-10-18 14:00:00.000000'
+
+\"\"\"
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'credit_ledger',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('credit_type', sa.String(length=50), nullable=False),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.Column('balance_after', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(length=100), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=128), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index('ix_credit_ledger_user_type_created', 'credit_ledger', ['user_id', 'credit_type', 'created_at'])
+    op.create_index('ix_credit_ledger_user_created', 'credit_ledger', ['user_id', 'created_at'])
+    # Existing balances become opening entries so every balance equals the sum of its ledger
+    op.execute(
+        "INSERT INTO credit_ledger (user_id, credit_type, delta, balance_after, reason, created_at) "
+        "SELECT user_id, credit_type, amount, amount, 'opening_balance', CURRENT_TIMESTAMP FROM credits"
+    )
+
+def downgrade():
+    op.drop_index('ix_credit_ledger_user_created', table_name='credit_ledger')
+    op.drop_index('ix_credit_ledger_user_type_created', table_name='credit_ledger')
+    op.drop_table('credit_ledger')
+"""
+    },
+    {
+        'filename': '0007_add_mock_interview_archive_columns.py',
+        'content': """\"\"\"add_mock_interview_archive_columns
+
+Revision ID: '0007'
+Revises: '0006'
+Create Date: '2026-10-18 15:30:00.000000'
+
+\"\"\"
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 0003 created mock_interview before the model gained these columns; the listing index in 0008 needs is_archived
+    with op.batch_alter_table('mock_interview') as batch_op:
+        batch_op.add_column(sa.Column('is_archived', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column('language', sa.String(length=50), nullable=False, server_default='English'))
+        batch_op.add_column(sa.Column('pronunciation_feedback', sa.Text(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table('mock_interview') as batch_op:
+        batch_op.drop_column('pronunciation_feedback')
+        batch_op.drop_column('language')
+        batch_op.drop_column('is_archived')
+"""
+    },
+    {
+        'filename': '0008_add_listing_composite_indexes.py',
+        'content': """\"\"\"add_listing_composite_indexes
+
+Revision ID: '0008'
+Revises: '0007'
+Create Date: '2026-10-18 16:00:00.000000'
+
+\"\"\"
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Listings filter on (user_id, is_archived) and order by a timestamp; usage analytics
+# filter on (user_id, feature_name) over a time range. Credit lookups by
+# (user_id, credit_type) are already served by the uq_user_credit_type index.
+INDEXES = [
+    ('ix_resumes_user_archived_updated', 'resumes', ['user_id', 'is_archived', 'updated_at']),
+    ('ix_cover_letters_user_archived_updated', 'cover_letters', ['user_id', 'is_archived', 'updated_at']),
+    ('ix_mock_interview_user_archived_created', 'mock_interview', ['user_id', 'is_archived', 'created_at']),
+    ('ix_feature_usage_logs_user_feature_ts', 'feature_usage_logs', ['user_id', 'feature_name', 'timestamp']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+"""
+    },
+    {
+        'filename': '0009_add_resume_version.py',
+        'content': """\"\"\"add_resume_version
+
+Revision ID: '0009'
+Revises: '0008'
+Create Date: '2026-10-18 17:00:00.000000'
+
+\"\"\"
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Optimistic-concurrency counter for incremental saves (see backend/resume_autosave.py)
+    op.add_column('resumes', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+def downgrade():
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_column('version')
+"""
+    },
+    {
+        'filename': '0010_create_resume_revisions_table.py',
+        'content': """\"\"\"create_resume_revisions_table
+
+Revision ID: '0010'
+Revises: '0009'
+Create Date: '2026-10-18 18:00:00.000000'
+
+\"\"\"
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'resume_revisions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('resume_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('content_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('resume_id', 'version', name='uq_resume_revision_version')
+    )
+
+def downgrade():
+    op.drop_table('resume_revisions')
+"""
+    },
+    {
+        'filename': '0011_add_resume_revision_content_hash.py',
+        'content': """\"\"\"add_resume_revision_content_hash
+
+Revision ID: '0011'
+Revises: '0010'
+Create Date: '2026-10-19 10:00:00.000000'
+
+\"\"\"
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Deltas are only chained onto a revision whose content hash matches the save's previous content.
+    # Existing rows have none, so the next save of each resume stores a snapshot.
+    op.add_column('resume_revisions', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table('resume_revisions') as batch_op:
+        batch_op.drop_column('content_hash')
+"""
+    },
+    {
+        'filename': '0012_make_document_updated_at_not_null.py',
+        'content': """\"\"\"make_document_updated_at_not_null
+
+Revision ID: '0012'
+Revises: '0011'
+Create Date: '2026-10-19 12:00:00.000000'
+
+\"\"\"
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+# The dashboard pages each list by (updated_at, id) straight from these indexes,
+# which only works when updated_at is never NULL
+TABLES = ['resumes', 'cover_letters', 'mock_interview']
+
+
+def upgrade():
+    # 0003 created mock_interview without updated_at; start it at created_at like the others
+    with op.batch_alter_table('mock_interview', recreate='always') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.current_timestamp()))
+    op.execute("UPDATE mock_interview SET updated_at = created_at")
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_mock_interview_user_archived_updated', 'mock_interview', ['user_id', 'is_archived', 'updated_at'])
+
+def downgrade():
+    op.drop_index('ix_mock_interview_user_archived_updated', table_name='mock_interview')
+    with op.batch_alter_table('mock_interview') as batch_op:
+        batch_op.drop_column('updated_at')
+    for table in reversed(TABLES[:-1]):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=True)
 """
     },
 ]